@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Corpus discovery benchmark
+
+Builds a scratch MkDocs site of --chapters chapter directories with
+--pages pages each (empty files; only discovery is timed) and a nav
+listing most of them, then times discover_corpus() reading the nav
+and walking the docs directory once, against expanding the equivalent
+shell glob and checking each path exists, as a command line of files
+costs. The run fails if discovery takes more than --max-ms.
+
+Usage:
+    python benchmarks/corpus_discovery.py
+    python benchmarks/corpus_discovery.py --chapters 200 --pages 50
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from chapter_validator import discover_corpus, read_mkdocs_config  # noqa: E402
+
+
+def build_site(site: Path, chapters: int, pages: int) -> Path:
+    """mkdocs.yml and docs/; every fifth page is left out of the nav"""
+    lines = ['site_name: Bench', 'nav:', '  - index.md']
+    (site / 'docs').mkdir(parents=True)
+    (site / 'docs' / 'index.md').touch()
+    for chapter in range(1, chapters + 1):
+        directory = site / 'docs' / f'chapter-{chapter:02d}'
+        directory.mkdir()
+        lines.append(f'  - Chapter {chapter} - Bench:')
+        for page in range(pages):
+            name = 'index.md' if page == 0 else f'page-{page:03d}.md'
+            (directory / name).touch()
+            if page % 5 != 4:
+                lines.append(f'    - Page {page}: chapter-{chapter:02d}/{name}')
+    config = site / 'mkdocs.yml'
+    config.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return config
+
+
+def best_of(func, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark corpus discovery')
+    parser.add_argument('--chapters', type=int, default=100)
+    parser.add_argument('--pages', type=int, default=30, help='Pages per chapter')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per variant (best is reported)')
+    parser.add_argument('--max-ms', type=float, default=100.0,
+                        help='Fail if discovery is slower than this')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = build_site(Path(tmp), args.chapters, args.pages)
+        docs = config.parent / 'docs'
+
+        def discover():
+            return discover_corpus(*read_mkdocs_config(config))
+
+        def expand():
+            paths = [Path(p) for p in sorted(glob.glob(os.path.join(docs, '**', '*.md'),
+                                                        recursive=True))]
+            return [p for p in paths if p.exists()]
+
+        found = len(discover())
+        assert found == len(expand())
+        discovery = best_of(discover, args.repeat)
+        globbing = best_of(expand, args.repeat)
+
+    print(f"{found} pages in {args.chapters} chapters")
+    print(f"discover_corpus (nav order)   {discovery * 1000:8.2f} ms")
+    print(f"glob + exists (path order)    {globbing * 1000:8.2f} ms")
+    sys.exit(0 if discovery * 1000 <= args.max_ms else 1)
+
+
+if __name__ == '__main__':
+    main()
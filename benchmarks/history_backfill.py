@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+History backfill benchmark
+
+Builds a scratch git repository from the corpus and commits a series of
+small edits, one chapter per commit. It then times backfill_history over
+every commit and compares that with validating just the distinct file
+versions. The two should cost about the same; the run fails if backfill
+takes more than --max-ratio times as long.
+
+Usage:
+    python benchmarks/history_backfill.py
+    python benchmarks/history_backfill.py --commits 500 --max-ratio 1.5
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from chapter_validator import (ChapterValidator, HistoryStore, backfill_history,  # noqa: E402
+                               CHANGED_SINCE_DIRS)
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(['git', '-c', 'user.name=bench', '-c', 'user.email=bench@localhost',
+                           *args], cwd=repo, check=True, capture_output=True,
+                          text=True).stdout
+
+
+def build_repository(repo: Path, commits: int, seed: int = 0) -> int:
+    """Corpus plus one edited chapter per commit; returns distinct file versions"""
+    for directory in CHANGED_SINCE_DIRS:
+        shutil.copytree(ROOT / directory, repo / directory)
+    git(repo, 'init', '-q')
+    git(repo, 'add', '.')
+    git(repo, 'commit', '-q', '-m', 'corpus')
+    paths = sorted(p for d in CHANGED_SINCE_DIRS for p in (repo / d).rglob('*.md'))
+    rng = random.Random(seed)
+    for i in range(commits):
+        path = rng.choice(paths)
+        with open(path, 'a', encoding='utf-8') as handle:
+            handle.write(f'\nRevision {i}: Floor mode entry trigger, as we saw in Chapter 2.\n')
+        git(repo, 'commit', '-q', '-am', f'edit {i}')
+    return len(paths) + commits
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark history backfill')
+    parser.add_argument('--commits', type=int, default=200,
+                        help='Edit commits on top of the corpus commit')
+    parser.add_argument('--max-ratio', type=float, default=1.5,
+                        help='Fail if backfill takes this many times the distinct-version cost')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(tmp) / 'repo'
+        repo.mkdir()
+        print(f'Building a repository with {args.commits + 1} commits...')
+        versions = build_repository(repo, args.commits)
+
+        cwd = os.getcwd()
+        os.chdir(repo)
+        try:
+            store = HistoryStore(Path(tmp) / 'history.sqlite')
+            start = time.perf_counter()
+            counts = backfill_history(ChapterValidator(), store, ['HEAD'])
+            backfill = time.perf_counter() - start
+
+            # The same distinct contents, read from the store's blob list
+            blobs = [row[0] for row in store.connection.execute(
+                'SELECT DISTINCT blob FROM files')]
+            contents = [git(repo, 'cat-file', 'blob', blob) for blob in blobs]
+            validator = ChapterValidator()
+            start = time.perf_counter()
+            for content in contents:
+                validator.validate_text(content)
+            distinct = time.perf_counter() - start
+
+            path = min(p for p, in store.connection.execute('SELECT path FROM files'))
+            start = time.perf_counter()
+            trend = store.trend(path, validator.cache_version)
+            query = time.perf_counter() - start
+            store.close()
+        finally:
+            os.chdir(cwd)
+
+    print(f"{counts['commits']} commits, {counts['files']} file versions, "
+          f"{counts['validated']} distinct (expected {versions})")
+    print(f'backfill                {backfill:8.3f} s')
+    print(f'distinct versions only  {distinct:8.3f} s')
+    print(f'trend query ({len(trend)} rows)  {query * 1000:8.3f} ms')
+    ratio = backfill / distinct
+    print(f'\nBackfill / distinct-version cost: {ratio:.2f}')
+    sys.exit(0 if ratio <= args.max_ratio else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Read/validate/emit pipeline benchmark
+
+Validates the corpus (site/docs and expanded-toc-chapters) in a single
+process twice: with the plain loop that reads, validates and formats
+each file in turn, and with the pipeline iter_validations() and
+OutputStage use, where a thread pool reads files ahead and output is
+formatted and written on its own thread. Console output goes to
+/dev/null.
+
+Before each run the files are evicted from the page cache with
+posix_fadvise, where the platform allows it, so the reads are cold.
+Reported are wall time, and CPU time as a share of wall time: the
+pipeline should keep the one validating core busier.
+
+Usage:
+    python benchmarks/pipeline.py
+    python benchmarks/pipeline.py --copies 4 --repeat 5 --warm
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from chapter_validator import (ChapterValidator, OutputStage, format_console_output,  # noqa: E402
+                               iter_validations)
+
+CORPUS_GLOBS = ['site/docs/**/*.md', 'expanded-toc-chapters/*.md']
+
+
+def evict(paths) -> bool:
+    """Drop the files from the page cache; False if the platform cannot"""
+    if not hasattr(os, 'posix_fadvise'):
+        return False
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    return True
+
+
+def sequential(validator, paths, sink):
+    for path in paths:
+        validation = validator.validate_chapter(path)
+        print(format_console_output(validation), file=sink)
+
+
+def pipelined(validator, paths, sink):
+    output = OutputStage()
+    try:
+        for validation in iter_validations(validator, paths, jobs=1):
+            output.submit(lambda v: print(format_console_output(v), file=sink), validation)
+    finally:
+        output.close()
+
+
+def run(func, paths, repeat: int, cold: bool):
+    """Best wall time over repeat runs, with the CPU share of that run"""
+    best = None
+    with open(os.devnull, 'w', encoding='utf-8') as sink:
+        for _ in range(repeat):
+            if cold:
+                evict(paths)
+            validator = ChapterValidator()
+            wall, cpu = time.perf_counter(), time.process_time()
+            func(validator, paths, sink)
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            if best is None or wall < best[0]:
+                best = (wall, cpu)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the single-process pipeline')
+    parser.add_argument('--copies', type=int, default=2,
+                        help='Copies of the corpus to validate (more files, colder cache)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per variant (best is reported)')
+    parser.add_argument('--warm', action='store_true',
+                        help='Leave the page cache alone')
+    args = parser.parse_args()
+
+    sources = sorted(p for pattern in CORPUS_GLOBS for p in ROOT.glob(pattern))
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for copy in range(args.copies):
+            for i, source in enumerate(sources):
+                path = Path(tmp) / f'{copy}-{i}-{source.name}'
+                shutil.copyfile(source, path)
+                paths.append(path)
+        cold = not args.warm and evict(paths)
+        size = sum(p.stat().st_size for p in paths) / 2 ** 20
+
+        print(f"{len(paths)} files, {size:.1f} MB, {'cold' if cold else 'warm'} page cache\n")
+        print(f"{'variant':<12} {'seconds':>9} {'CPU share':>10}")
+        results = {}
+        for name, func in (('sequential', sequential), ('pipelined', pipelined)):
+            wall, cpu = run(func, paths, args.repeat, cold)
+            results[name] = wall
+            print(f"{name:<12} {wall:>9.3f} {cpu / wall:>10.0%}")
+
+    print(f"\nSpeedup: {results['sequential'] / results['pipelined']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
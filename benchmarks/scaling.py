@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Per-KB scaling benchmarks
+
+Each suite times one function on inputs of doubling size and reports the
+cost per KB. A linear pass keeps that cost flat as documents grow; a
+quadratic one shows up as a per-KB cost that doubles with each step.
+
+    line-index  Validates chapters dense in exactly the hits that used to
+                trigger a line-number rescan per match.
+    capsules    Parses inputs that each defeat a regex-based capsule
+                matcher in their own way: braces that never close, deep
+                nesting, long runs of colons or open strings, and YAML
+                mappings that keep changing indentation.
+    markdown    Tokenizes the constructs the tokenizer has to pair up or
+                look past: backtick runs that never close, fences left
+                open, long tables (with and without a leading |),
+                headings dense with inline code, admonitions that run to
+                the end, and indented blocks in and out of a list.
+
+The run fails if any input's per-KB cost grows by more than --max-ratio
+from the smallest size to the largest.
+
+Usage:
+    python benchmarks/scaling.py
+    python benchmarks/scaling.py capsules --steps 6 --max-ratio 2.0
+    python benchmarks/scaling.py markdown --steps 5
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chapter_validator import ChapterValidator, parse_capsules, tokenize_markdown  # noqa: E402
+
+BLOCK = """## Evidence Flow
+G = ⟨Range, Causal, SI, BS(5s), Idem(key), Auth(mTLS)⟩ ▷ G = ⟨Object, SS, SER, Fresh(φ), None, Unauth⟩
+Scope: range. Lifetime: lease. Binding: epoch. Transitivity: none. Revocation: expiry.
+Conservation || Uniqueness || Integrity ↑ Freshness ⤓ Bounded staleness || Convergence
+Floor mode entry trigger, Target mode, Degraded mode, Recovery mode, as we saw in Chapter 2.
+{invariant: Order, evidence: lease, boundary: shard, mode: Target, fallback: Degraded}
+"""
+
+
+class Suite(NamedTuple):
+    """A function to time and the inputs to time it on
+
+    Each input builds a document of roughly n * 32 bytes; base_units is n
+    for the smallest size.
+    """
+    function: Callable[[str], object]
+    inputs: Dict[str, Callable[[int], str]]
+    base_units: int
+    steps: int
+
+
+SUITES = {
+    'line-index': Suite(
+        ChapterValidator().validate_text,
+        {'evidence-flow': lambda n: BLOCK * (n * 32 // len(BLOCK.encode('utf-8')))},
+        base_units=3000, steps=5),
+    'capsules': Suite(
+        parse_capsules,
+        {
+            'unclosed': lambda n: '{invariant: x, evidence: y ' * (n * 32 // 27),
+            'nested': lambda n: '{invariant: {' * (n * 32 // 14) + '}' * (n * 32 // 14),
+            'open-braces': lambda n: '{' * (n * 32),
+            'colons': lambda n: '{invariant' + ':' * (n * 32),
+            'open-strings': lambda n: '{"invariant' + '\\"' * (n * 16),
+            'yaml-indents': lambda n: '```\n' + ''.join(
+                f'{" " * (i % 8)}invariant: x\n{" " * (i % 8)}evidence: y\n' for i in range(n)),
+            'capsules': lambda n: '{invariant: Order, evidence: lease}\n' * (n * 32 // 36),
+        },
+        base_units=1000, steps=5),
+    'markdown': Suite(
+        tokenize_markdown,
+        {
+            'open-ticks': lambda n: ''.join(
+                '`' * (i % 40 + 1) + (' x\n' if i % 80 == 79 else ' x ')
+                for i in range(n * 32 // 24)),
+            'open-fence': lambda n: '````\n' + '```\nOrder || x\n' * (n * 32 // 17),
+            'fences': lambda n: '```\nOrder\n```\nprose ↑ text\n' * (n * 32 // 29),
+            'table': lambda n: '| Order | `x` | y |\n' * (n * 32 // 20),
+            'headings': lambda n: '## `a` Order `b` `c\n' * (n * 32 // 20),
+            'admonition': lambda n: '!!! note\n' + '    Order `x` || y\n' * (n * 32 // 19),
+            'indented': lambda n: 'Order\n\n' + '    x || y\n\n' * (n * 32 // 12),
+            'list-indents': lambda n: '- Order\n' + '\n    Order || y\n' * (n * 32 // 16),
+            'bare-table': lambda n: 'a | b\n--|--\n' + 'Order | `x`\n' * (n * 32 // 12),
+            'prose': lambda n: 'Order || Uniqueness, as we saw in Chapter 2.\n' * (n * 32 // 45),
+        },
+        base_units=4000, steps=4),
+}
+
+
+def best_time(function: Callable[[str], object], content: str, repeat: int) -> float:
+    """Best-of-N wall time for function(content)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def sweep(name: str, suite: Suite, steps: int, base_units: int, repeat: int) -> float:
+    """Print the per-KB cost of every input and size; return the worst growth"""
+    worst = 0.0
+    for label, build in suite.inputs.items():
+        per_kb = []
+        for step in range(steps):
+            content = build(base_units * (2 ** step))
+            kb = len(content.encode('utf-8')) / 1024
+            seconds = best_time(suite.function, content, repeat)
+            per_kb.append(seconds / kb * 1e6)
+            print(f"{name:<11} {label:<14} {kb:>10.1f} {seconds:>10.4f} {per_kb[-1]:>10.1f}")
+        worst = max(worst, per_kb[-1] / per_kb[0])
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-KB scaling')
+    parser.add_argument('suites', nargs='*', metavar='SUITE',
+                        help=f"Suites to run (default all: {', '.join(SUITES)})")
+    parser.add_argument('--base-units', type=int,
+                        help="Size of the smallest document, in units of 32 bytes "
+                             "(default: the suite's own)")
+    parser.add_argument('--steps', type=int,
+                        help="Number of doublings (default: the suite's own)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per size (best is reported)')
+    parser.add_argument('--max-ratio', type=float, default=2.0,
+                        help='Fail if per-KB cost grows more than this factor')
+    args = parser.parse_args()
+    unknown = [name for name in args.suites if name not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite {unknown[0]!r} (choose from {', '.join(SUITES)})")
+
+    worst = 0.0
+    print(f"{'suite':<11} {'input':<14} {'KB':>10} {'seconds':>10} {'us/KB':>10}")
+    for name in args.suites or SUITES:
+        suite = SUITES[name]
+        worst = max(worst, sweep(name, suite, args.steps or suite.steps,
+                                 args.base_units or suite.base_units, args.repeat))
+
+    print(f"\nWorst per-KB cost ratio (largest/smallest): {worst:.2f}")
+    sys.exit(0 if worst <= args.max_ratio else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Validation daemon round-trip benchmark
+
+Starts `chapter_validator.py --serve` on a temporary socket and times
+requests the way an editor makes them: validating each corpus chapter
+from disk, asking again for an unchanged file, and re-sending a chapter's
+text after a one-line edit. Each round trip opens a new connection, as a
+save or pre-commit hook would. The run fails if the median round trip of
+the edit case exceeds --max-ms.
+
+Usage:
+    python benchmarks/serve_latency.py
+    python benchmarks/serve_latency.py --max-ms 20 --edits 50
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from chapter_validator import request_daemon  # noqa: E402
+
+CORPUS_GLOBS = ['site/docs/**/*.md', 'expanded-toc-chapters/*.md']
+
+
+def round_trip(socket_path: Path, request: dict) -> float:
+    """Seconds for one request and its reply"""
+    start = time.perf_counter()
+    reply = request_daemon(socket_path, request)
+    seconds = time.perf_counter() - start
+    if not reply.get('ok'):
+        raise RuntimeError(reply.get('error'))
+    return seconds
+
+
+def report(label: str, samples) -> float:
+    ms = sorted(s * 1000 for s in samples)
+    median = statistics.median(ms)
+    p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+    print(f"{label:<22} {len(ms):>6} {median:>10.2f} {p95:>10.2f} {ms[-1]:>10.2f}")
+    return median
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark validation daemon latency')
+    parser.add_argument('--edits', type=int, default=30,
+                        help='Edited text buffers to send')
+    parser.add_argument('--max-ms', type=float, default=20.0,
+                        help='Fail if the median edit round trip is slower than this')
+    args = parser.parse_args()
+
+    paths = sorted(p for pattern in CORPUS_GLOBS for p in ROOT.glob(pattern))
+    if not paths:
+        sys.exit('No corpus chapters found')
+    sizes = sorted(p.stat().st_size for p in paths)
+    typical = min(paths, key=lambda p: abs(p.stat().st_size - sizes[len(sizes) // 2]))
+    text = typical.read_text(encoding='utf-8')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = Path(tmp) / 'validator.sock'
+        daemon = subprocess.Popen(
+            [sys.executable, str(ROOT / 'chapter_validator.py'), '--no-cache',
+             '--serve', str(socket_path)], stdout=subprocess.PIPE, text=True)
+        try:
+            daemon.stdout.readline()
+            print(f"{'request':<22} {'count':>6} {'median ms':>10} {'p95 ms':>10} {'max ms':>10}")
+            report('validate (cold)', [round_trip(socket_path, {'op': 'validate', 'path': str(p)})
+                                       for p in paths])
+            report('validate (unchanged)', [round_trip(socket_path,
+                                                       {'op': 'validate', 'path': str(p)})
+                                            for p in paths])
+            lines = text.split('\n')
+            edits = []
+            for i in range(args.edits):
+                line = i * len(lines) // args.edits
+                edited = '\n'.join(lines[:line] + [f'Edit {i} to the Order section.'] +
+                                   lines[line:])
+                edits.append(round_trip(socket_path, {'op': 'validate_text',
+                                                      'path': str(typical), 'text': edited}))
+            median = report(f'edit ({len(text) // 1024} KB)', edits)
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    print(f"\nMedian edit round trip: {median:.2f} ms (limit {args.max_ms:.0f} ms)")
+    sys.exit(0 if median <= args.max_ms else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+In-memory validation API benchmark
+
+Generates --drafts chapter drafts in memory from the corpus (each a
+corpus chapter with a numbered paragraph appended, so no two are the
+same) and validates them three ways: writing each to a temporary file
+for validate_chapter(), as tooling had to before, and through
+validate_many() in one process and across --jobs workers. Drafts are
+produced by a generator, so validate_many() never holds the batch.
+
+Reported are wall time, and the peak traced memory of each run, which
+for validate_many() should stay flat as --drafts grows.
+
+Usage:
+    python benchmarks/text_api.py
+    python benchmarks/text_api.py --drafts 2000 --jobs 4
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from chapter_validator import ChapterValidator, validate_many  # noqa: E402
+
+CORPUS_GLOBS = ['site/docs/**/*.md', 'expanded-toc-chapters/*.md']
+
+
+def drafts(sources, count: int):
+    """(name, text) pairs made on demand"""
+    for i in range(count):
+        path, text = sources[i % len(sources)]
+        yield f'draft-{i}/{path.name}', f'{text}\nDraft paragraph {i}.\n'
+
+
+def via_temp_files(sources, count: int, jobs: int):
+    validator = ChapterValidator()
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (name, text) in enumerate(drafts(sources, count)):
+            path = Path(tmp) / f'{i}.md'
+            path.write_text(text, encoding='utf-8')
+            validator.validate_chapter(path)
+            os.unlink(path)
+
+
+def via_validate_many(sources, count: int, jobs: int):
+    for _ in validate_many(drafts(sources, count), jobs=jobs, validator=ChapterValidator()):
+        pass
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the in-memory validation API')
+    parser.add_argument('--drafts', type=int, default=300, help='Drafts to validate')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes for the parallel run')
+    args = parser.parse_args()
+
+    paths = sorted(p for pattern in CORPUS_GLOBS for p in ROOT.glob(pattern))
+    sources = [(p, p.read_text(encoding='utf-8')) for p in paths]
+
+    print(f"{args.drafts} drafts\n")
+    print(f"{'variant':<28} {'seconds':>9} {'peak MB':>9}")
+    for label, func, jobs in (('temp file + validate_chapter', via_temp_files, 1),
+                              ('validate_many', via_validate_many, 1),
+                              (f'validate_many, {args.jobs} jobs', via_validate_many,
+                               args.jobs)):
+        seconds, peak = measure(func, sources, args.drafts, jobs)
+        print(f"{label:<28} {seconds:>9.3f} {peak / 2 ** 20:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
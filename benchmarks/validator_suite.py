@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Validator benchmark suite
+
+Times every check on its own and the validator end to end, on the real
+corpus (site/docs and expanded-toc-chapters) and on synthetic chapters
+scaled to 1x, 10x and 100x. Synthetic chapters are built from the
+ChapterValidator vocabularies, so every check has plenty to match.
+
+It also times the fixed cost paid per validator and per file: building
+a validator once the rule tables exist, and validating a one-line
+chapter. Results are printed as a table and can be written as JSON. Given a
+previous JSON file as --baseline, the run fails if any throughput drops
+by more than --tolerance.
+
+Usage:
+    python benchmarks/validator_suite.py
+    python benchmarks/validator_suite.py --json bench.json
+    python benchmarks/validator_suite.py --baseline bench.json --tolerance 0.25
+    python benchmarks/validator_suite.py --scales 1 10 --no-corpus --mmap
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from chapter_validator import ChapterValidator, LineIndex  # noqa: E402
+
+CORPUS_GLOBS = ['site/docs/**/*.md', 'expanded-toc-chapters/*.md']
+
+# In the order ChapterValidator runs them; reference resolution needs a link index
+CHECKS = [spec.method for spec in ChapterValidator.CHECKS if 'chapter_path' not in spec.needs]
+
+FILLER = ('replica lease quorum epoch partition clock skew failover shard log '
+          'snapshot coordinator consensus leader follower write read path latency '
+          'budget retry backoff fence token watermark checkpoint').split()
+
+
+def synthetic_chapter(units: int, seed: int = 0) -> str:
+    """A chapter of units sections, each dense in every check's vocabulary"""
+    rng = random.Random(seed)
+    v = ChapterValidator
+    components = [values[0].replace('\\([^)]+\\)', '(x)') for values in v.VALID_COMPONENTS.values()]
+    invariants = v.FUNDAMENTAL_INVARIANTS + v.DERIVED_INVARIANTS + v.COMPOSITE_INVARIANTS
+    operators = list(v.COMPOSITION_OPERATORS)
+
+    def prose(words: int) -> str:
+        return ' '.join(rng.choice(FILLER) for _ in range(words)) + '.'
+
+    parts = ['# Synthetic Chapter\n']
+    for unit in range(units):
+        pass_number = unit % 3 + 1
+        invariant = invariants[unit % len(invariants)]
+        parts.append(f'\n## Pass {pass_number}: {v.SACRED_DIAGRAMS[unit % len(v.SACRED_DIAGRAMS)]}\n')
+        parts.append(f'Primary invariant: {invariant}\n\n{prose(120)}\n')
+        parts.append(f'\nG = ⟨{", ".join(components)}⟩ {rng.choice(operators)} '
+                     f'G = ⟨{", ".join(components)}⟩\n')
+        for mode in v.REQUIRED_MODES:
+            parts.append(f'{mode} mode: entry trigger on {rng.choice(FILLER)}, '
+                         f'exit trigger after {rng.choice(FILLER)}\n')
+        parts.append('\n### Evidence Properties\n')
+        parts.append(' '.join(f'{prop}: {rng.choice(FILLER)}.' for prop in v.EVIDENCE_PROPERTIES))
+        parts.append('\n\n```\n{' + ', '.join(f'{field}: {rng.choice(FILLER)}'
+                                               for field in v.CAPSULE_FIELDS) + '}\n```\n')
+        parts.append(f'\n{invariant} {rng.choice(operators)} '
+                     f'{invariants[(unit + 1) % len(invariants)]}, as we saw in Chapter '
+                     f'{unit % 9 + 1}; we\'ll explore this in Chapter {unit % 9 + 11}.\n')
+        parts.append(f'\n{v.TRANSFER_TESTS[unit % 3]} Transfer Test: {prose(40)}\n')
+        parts.append(f'\n{prose(200)}\n')
+    return ''.join(parts)
+
+
+def best_of(repeat: int, func) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def mb_per_s(size: int, seconds: float) -> float:
+    return size / 2 ** 20 / seconds if seconds > 0 else 0.0
+
+
+def measure(validator: ChapterValidator, paths, repeat: int) -> dict:
+    """End-to-end and per-check figures for a set of files"""
+    texts = [p.read_text(encoding='utf-8') for p in paths]
+    size = sum(len(t.encode('utf-8')) for t in texts)
+
+    end_to_end = best_of(repeat, lambda: [validator.validate_chapter(p) for p in paths])
+    checks = {}
+    for name in CHECKS:
+        check = getattr(validator, name)
+        prepared = [(t, t.split('\n'), LineIndex(t)) for t in texts]
+        seconds = best_of(repeat, lambda: [check(t, lines, index)
+                                           for t, lines, index in prepared])
+        checks[name] = {'seconds': seconds, 'mb_per_s': mb_per_s(size, seconds)}
+
+    return {
+        'files': len(paths),
+        'bytes': size,
+        'seconds': end_to_end,
+        'mb_per_s': mb_per_s(size, end_to_end),
+        'checks': checks,
+    }
+
+
+def measure_overhead(repeat: int, files: int = 500) -> dict:
+    """Fixed costs: a new validator, and a chapter with almost nothing in it"""
+    ChapterValidator()
+    construct = best_of(repeat, lambda: [ChapterValidator() for _ in range(100)]) / 100
+    validator = ChapterValidator()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'tiny.md'
+        path.write_text('G = ⟨Range, Causal, SI, BS(5s), Idem(key), Auth(mTLS)⟩\n',
+                        encoding='utf-8')
+        validator.validate_chapter(path)
+        per_file = best_of(repeat, lambda: [validator.validate_chapter(path)
+                                            for _ in range(files)]) / files
+    return {'construct_ms': construct * 1000, 'tiny_file_us': per_file * 1e6}
+
+
+def regressions(current: dict, baseline: dict, tolerance: float):
+    """(label, before, after) for throughputs that fell by more than tolerance"""
+    found = []
+    for corpus, result in current['corpora'].items():
+        before = baseline.get('corpora', {}).get(corpus)
+        if before is None:
+            continue
+        pairs = [('end-to-end', before['mb_per_s'], result['mb_per_s'])]
+        for name, check in result['checks'].items():
+            if name in before['checks']:
+                pairs.append((name, before['checks'][name]['mb_per_s'], check['mb_per_s']))
+        for label, old, new in pairs:
+            if old > 0 and new < old * (1 - tolerance):
+                found.append((f'{corpus} {label}', old, new))
+    return found
+
+
+def print_table(results: dict):
+    print(f"{'corpus':<16} {'files':>6} {'MB':>8} {'seconds':>9} {'MB/s':>8}")
+    for corpus, result in results['corpora'].items():
+        print(f"{corpus:<16} {result['files']:>6} {result['bytes'] / 2 ** 20:>8.2f} "
+              f"{result['seconds']:>9.4f} {result['mb_per_s']:>8.2f}")
+    overhead = results['overhead']
+    print(f"\nnew validator {overhead['construct_ms']:.3f} ms, "
+          f"tiny chapter {overhead['tiny_file_us']:.1f} us")
+    print(f"\n{'check (standalone MB/s)':<30}" +
+          ''.join(f'{corpus:>16}' for corpus in results['corpora']))
+    for name in CHECKS:
+        print(f'{name:<30}' + ''.join(f"{r['checks'][name]['mb_per_s']:>16.2f}"
+                                      for r in results['corpora'].values()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the chapter validator')
+    parser.add_argument('--scales', type=int, nargs='*', default=[1, 10, 100],
+                        help='Synthetic chapter sizes, as multiples of the 1x chapter')
+    parser.add_argument('--units', type=int, default=20,
+                        help='Sections in the 1x synthetic chapter')
+    parser.add_argument('--no-corpus', action='store_true',
+                        help='Skip the real corpus')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per measurement (best is reported)')
+    parser.add_argument('--mmap', action='store_true',
+                        help='Validate through memory maps (end-to-end figures only)')
+    parser.add_argument('--json', type=Path,
+                        help='Write results to this file')
+    parser.add_argument('--baseline', type=Path,
+                        help='Previous --json output to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed fractional drop in MB/s before failing')
+    args = parser.parse_args()
+
+    validator = ChapterValidator(mapped=args.mmap)
+    results = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'mmap': args.mmap,
+        'corpora': {},
+    }
+
+    if not args.no_corpus:
+        paths = sorted(p for pattern in CORPUS_GLOBS for p in ROOT.glob(pattern))
+        if paths:
+            results['corpora']['corpus'] = measure(validator, paths, args.repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            path = Path(tmp) / f'synthetic-{scale}x.md'
+            path.write_text(synthetic_chapter(args.units * scale), encoding='utf-8')
+            results['corpora'][f'synthetic-{scale}x'] = measure(validator, [path], args.repeat)
+
+    results['overhead'] = measure_overhead(args.repeat)
+    print_table(results)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding='utf-8')
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        found = regressions(results, baseline, args.tolerance)
+        for label, old, new in found:
+            print(f'REGRESSION {label}: {old:.2f} -> {new:.2f} MB/s', file=sys.stderr)
+        sys.exit(1 if found else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,16 +9,47 @@ Usage:
     python chapter_validator.py <chapter_file.md>
     python chapter_validator.py --verbose --html site/docs/chapter-*/index.md
     python chapter_validator.py --format json --output report.json chapter-02/index.md
+    python chapter_validator.py --format jsonl --jobs 8 site/docs/chapter-*/*.md | ingest
+    python chapter_validator.py --jobs 8 site/docs/chapter-*/*.md
+    python chapter_validator.py --watch site/docs 'expanded-toc-chapters/*.md'
+    python chapter_validator.py --serve /tmp/chapter_validator.sock
+    python chapter_validator.py --corpus site/mkdocs.yml --summary
+    python chapter_validator.py --changed-since origin/main --summary
+    python chapter_validator.py --history scores.sqlite --revision main
+    python chapter_validator.py --links site/docs site/docs/chapter-*/*.md
+    python chapter_validator.py --only g-vectors --only mode-matrix chapter-02/index.md
+
+Chapters held in memory are validated without temporary files:
+    from chapter_validator import validate_text, validate_many
+    validation = validate_text(draft, 'chapter-02/index.md')
+    for validation in validate_many(((name, text) for ...), jobs=4): ...
 """
 
+import os
 import re
 import sys
+import glob
+import fnmatch
+import mmap
+import socket
+import asyncio
+import time
+import bisect
+import codecs
+import hashlib
+import inspect
+import posixpath
+import unicodedata
 import argparse
 import json
+from html import escape
+from stat import S_ISDIR
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass, asdict
-from collections import defaultdict
+from urllib.parse import unquote
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple, Optional
+from dataclasses import dataclass, asdict, replace
+from array import array
+from collections import defaultdict, deque, OrderedDict
 
 
 @dataclass
@@ -33,6 +64,21 @@ class ValidationResult:
     line_numbers: List[int]
 
 
+@dataclass
+class CheckProfile:
+    """Cost of one check on one file
+
+    seconds covers the check itself plus the time its patterns took to
+    verify candidates in the shared scan. bytes_scanned is the text its
+    patterns matched; the 'Shared scan' entry holds the trigger pass over
+    the whole document.
+    """
+    check_name: str
+    seconds: float
+    matches: int
+    bytes_scanned: int
+
+
 @dataclass
 class ChapterValidation:
     """Overall validation result for a chapter"""
@@ -43,9 +89,10 @@ class ChapterValidation:
     grade: str
     status: str
     results: List[ValidationResult]
+    profile: Optional[List[CheckProfile]] = None
 
     def to_dict(self):
-        return {
+        data = {
             'chapter_path': self.chapter_path,
             'total_score': self.total_score,
             'max_score': self.max_score,
@@ -54,6 +101,1955 @@ class ChapterValidation:
             'status': self.status,
             'results': [asdict(r) for r in self.results]
         }
+        if self.profile is not None:
+            data['profile'] = [asdict(p) for p in self.profile]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ChapterValidation':
+        fields = dict(data)
+        fields['results'] = [ValidationResult(**r) for r in data['results']]
+        if 'profile' in data:
+            fields['profile'] = [CheckProfile(**p) for p in data['profile']]
+        return cls(**fields)
+
+
+class ResultStore:
+    """Compact columnar storage for the validations of a large run
+
+    Paths, check names, details, suggestions, grades and statuses are
+    interned in one string table and referenced by index; scores, line
+    numbers and profile figures live in typed arrays, with offset arrays
+    marking where each chapter's results and each result's lists begin.
+    store[i] rebuilds a ChapterValidation; write_jsonl() streams records,
+    identical to json.dumps(validation.to_dict()), without building one.
+    """
+
+    __slots__ = ('strings', '_ids', '_encoded',
+                 'paths', 'totals', 'maxima', 'percentages', 'grades', 'statuses',
+                 'result_start', 'profile_start', 'profiled',
+                 'checks', 'passed', 'scores', 'max_scores', 'details',
+                 'suggestion_start', 'suggestions', 'line_start', 'lines',
+                 'profile_checks', 'profile_seconds', 'profile_matches', 'profile_bytes')
+
+    def __init__(self):
+        self.strings = []
+        self._ids = {}
+        self._encoded = {}
+        # Per chapter; the *_start arrays hold one extra, final offset
+        self.paths = array('i')
+        self.totals = array('q')
+        self.maxima = array('q')
+        self.percentages = array('d')
+        self.grades = array('i')
+        self.statuses = array('i')
+        self.result_start = array('q', [0])
+        self.profile_start = array('q', [0])
+        self.profiled = array('b')
+        # Per result
+        self.checks = array('i')
+        self.passed = array('b')
+        self.scores = array('i')
+        self.max_scores = array('i')
+        self.details = array('i')
+        self.suggestion_start = array('q', [0])
+        self.suggestions = array('i')
+        self.line_start = array('q', [0])
+        self.lines = array('i')
+        # Per profile entry
+        self.profile_checks = array('i')
+        self.profile_seconds = array('d')
+        self.profile_matches = array('q')
+        self.profile_bytes = array('q')
+
+    def intern(self, text: str) -> int:
+        """Index of text in the string table, adding it if new"""
+        sid = self._ids.get(text)
+        if sid is None:
+            sid = self._ids[text] = len(self.strings)
+            self.strings.append(text)
+        return sid
+
+    def append(self, validation: ChapterValidation):
+        intern = self.intern
+        self.paths.append(intern(validation.chapter_path))
+        self.totals.append(validation.total_score)
+        self.maxima.append(validation.max_score)
+        self.percentages.append(validation.percentage)
+        self.grades.append(intern(validation.grade))
+        self.statuses.append(intern(validation.status))
+
+        for result in validation.results:
+            self.checks.append(intern(result.check_name))
+            self.passed.append(bool(result.passed))
+            self.scores.append(result.score)
+            self.max_scores.append(result.max_score)
+            self.details.append(intern(result.details))
+            self.suggestions.extend(intern(s) for s in result.suggestions)
+            self.suggestion_start.append(len(self.suggestions))
+            self.lines.extend(result.line_numbers)
+            self.line_start.append(len(self.lines))
+        self.result_start.append(len(self.checks))
+
+        self.profiled.append(validation.profile is not None)
+        for profile in validation.profile or ():
+            self.profile_checks.append(intern(profile.check_name))
+            self.profile_seconds.append(profile.seconds)
+            self.profile_matches.append(profile.matches)
+            self.profile_bytes.append(profile.bytes_scanned)
+        self.profile_start.append(len(self.profile_checks))
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def chapter_path(self, i: int) -> str:
+        return self.strings[self.paths[i]]
+
+    def grade(self, i: int) -> str:
+        return self.strings[self.grades[i]]
+
+    def status(self, i: int) -> str:
+        return self.strings[self.statuses[i]]
+
+    def __getitem__(self, i: int) -> ChapterValidation:
+        if not -len(self) <= i < len(self):
+            raise IndexError('ResultStore index out of range')
+        i %= len(self)
+        strings = self.strings
+        results = []
+        for r in range(self.result_start[i], self.result_start[i + 1]):
+            results.append(ValidationResult(
+                check_name=strings[self.checks[r]],
+                passed=bool(self.passed[r]),
+                score=self.scores[r],
+                max_score=self.max_scores[r],
+                details=strings[self.details[r]],
+                suggestions=[strings[s] for s in self.suggestions[
+                    self.suggestion_start[r]:self.suggestion_start[r + 1]]],
+                line_numbers=self.lines[self.line_start[r]:self.line_start[r + 1]].tolist()
+            ))
+        profile = None
+        if self.profiled[i]:
+            profile = [CheckProfile(strings[self.profile_checks[p]], self.profile_seconds[p],
+                                    self.profile_matches[p], self.profile_bytes[p])
+                       for p in range(self.profile_start[i], self.profile_start[i + 1])]
+        return ChapterValidation(
+            chapter_path=self.chapter_path(i),
+            total_score=self.totals[i],
+            max_score=self.maxima[i],
+            percentage=self.percentages[i],
+            grade=self.grade(i),
+            status=self.status(i),
+            results=results,
+            profile=profile
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def _json(self, sid: int) -> str:
+        """An interned string as a JSON literal, encoded once"""
+        encoded = self._encoded.get(sid)
+        if encoded is None:
+            encoded = self._encoded[sid] = json.dumps(self.strings[sid])
+        return encoded
+
+    def record(self, i: int) -> str:
+        """Chapter i as one line of JSON"""
+        text = self._json
+        out = [f'{{"chapter_path": {text(self.paths[i])}, "total_score": {self.totals[i]}, '
+               f'"max_score": {self.maxima[i]}, "percentage": {json.dumps(self.percentages[i])}, '
+               f'"grade": {text(self.grades[i])}, "status": {text(self.statuses[i])}, '
+               f'"results": [']
+        for r in range(self.result_start[i], self.result_start[i + 1]):
+            suggestions = ', '.join(text(s) for s in self.suggestions[
+                self.suggestion_start[r]:self.suggestion_start[r + 1]])
+            lines = ', '.join(map(str, self.lines[self.line_start[r]:self.line_start[r + 1]]))
+            out.append(f'{", " if r > self.result_start[i] else ""}'
+                       f'{{"check_name": {text(self.checks[r])}, '
+                       f'"passed": {"true" if self.passed[r] else "false"}, '
+                       f'"score": {self.scores[r]}, "max_score": {self.max_scores[r]}, '
+                       f'"details": {text(self.details[r])}, "suggestions": [{suggestions}], '
+                       f'"line_numbers": [{lines}]}}')
+        out.append(']')
+        if self.profiled[i]:
+            entries = ', '.join(
+                f'{{"check_name": {text(self.profile_checks[p])}, '
+                f'"seconds": {json.dumps(self.profile_seconds[p])}, '
+                f'"matches": {self.profile_matches[p]}, "bytes_scanned": {self.profile_bytes[p]}}}'
+                for p in range(self.profile_start[i], self.profile_start[i + 1]))
+            out.append(f', "profile": [{entries}]')
+        out.append('}')
+        return ''.join(out)
+
+    def write_jsonl(self, stream, start: int = 0):
+        """Write chapters from start on as JSON Lines, one record per line"""
+        for i in range(start, len(self)):
+            stream.write(self.record(i))
+            stream.write('\n')
+
+
+class ProfileHook:
+    """Collector interface for a profiling ChapterValidator
+
+    Pass instances as ChapterValidator(hooks=[...]) and override any of the
+    methods; each is called in the process that validates the file.
+    """
+
+    def file_started(self, chapter_path: str):
+        pass
+
+    def check_finished(self, chapter_path: str, profile: CheckProfile):
+        pass
+
+    def file_finished(self, validation: 'ChapterValidation'):
+        pass
+
+
+class _TimedPattern:
+    """A compiled pattern that adds the time spent in match() to a counter"""
+
+    __slots__ = ('_pattern', 'pattern', 'flags', 'counter')
+
+    def __init__(self, pattern: 're.Pattern', counter: List[float]):
+        self._pattern = pattern
+        self.pattern = pattern.pattern
+        self.flags = pattern.flags
+        self.counter = counter
+
+    def match(self, string, pos: int = 0, endpos: int = sys.maxsize):
+        start = time.perf_counter()
+        match = self._pattern.match(string, pos, endpos)
+        self.counter[0] += time.perf_counter() - start
+        return match
+
+
+class LineIndex:
+    """Offset -> line number lookup for a single document
+
+    Built once per document from the positions of every newline, so each
+    lookup is a binary search instead of a rescan of the preceding text.
+    """
+
+    def __init__(self, content: str):
+        starts = [0]
+        if isinstance(content, MappedText):
+            find, newline = content.data.find, b'\n'
+        else:
+            find, newline = content.find, '\n'
+        pos = find(newline)
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = find(newline, pos + 1)
+        self.line_starts = starts
+
+    def line_of(self, offset: int) -> int:
+        """1-based line number containing the character at offset"""
+        return bisect.bisect_right(self.line_starts, offset)
+
+    def __len__(self) -> int:
+        return len(self.line_starts)
+
+
+@dataclass
+class Section:
+    """A heading and its text up to the next heading of any level
+
+    level is 0 for the preamble before the first heading. start and end are
+    character offsets; parent is the index of the enclosing section.
+    """
+    level: int
+    title: str
+    line: int
+    start: int
+    end: int
+    parent: Optional[int] = None
+
+
+_HEADING = re.compile(r'(?P<hashes>#{1,6})(?:[ \t]+(?P<title>.*?))?[ \t#]*$', re.MULTILINE)
+
+
+def parse_sections(content: str, regions: Optional['MarkdownRegions'] = None) -> List[Section]:
+    """Split markdown into a heading tree
+
+    Headings are the lines MarkdownTokenizer classifies as headings, so a
+    '#' line inside fenced or indented code is not one. regions, if given,
+    must be the tokenizer's regions of content.
+    """
+    if regions is None:
+        regions = tokenize_markdown(content)
+    sections = [Section(level=0, title='', line=1, start=0, end=len(content))]
+    stack = [0]
+    line = 1
+    last = 0
+
+    for kind, start, end in regions.regions:
+        if kind != 'heading':
+            continue
+        # Consecutive heading lines share a region, and a heading holding
+        # inline code is split across several; each line start is a heading
+        pos = start
+        if pos and content[pos - 1] != '\n':
+            pos = content.find('\n', pos, end) + 1
+            if not pos:
+                continue
+        while pos < end:
+            match = _HEADING.match(content, pos)
+            if match:
+                line += content.count('\n', last, pos)
+                last = pos
+                level = len(match.group('hashes'))
+                while sections[stack[-1]].level >= level:
+                    stack.pop()
+                sections[-1].end = pos
+                sections.append(Section(level=level, title=match.group('title') or '',
+                                        line=line, start=pos, end=len(content),
+                                        parent=stack[-1]))
+                stack.append(len(sections) - 1)
+            pos = content.find('\n', pos, end) + 1
+            if not pos:
+                break
+
+    return sections
+
+
+@dataclass
+class Capsule:
+    """A context capsule: a {...} mapping or fenced YAML block with invariant and evidence keys
+
+    start and end are offsets into the parsed text (bytes for a MappedText).
+    fields maps each lowercased key to its value, clipped to
+    CapsuleParser.VALUE_LIMIT characters; form is 'braces' or 'yaml'.
+    """
+    line: int
+    start: int
+    end: int
+    fields: Dict[str, str]
+    form: str = 'braces'
+
+    def missing(self, required: List[str]) -> List[str]:
+        return [field for field in required if field not in self.fields]
+
+
+_CAPSULE_FENCE = r'[ \t]*(?P<fence>`{3,}|~{3,})(?P<info>[^\n]*)'
+_CAPSULE_KEY_LINE = (r'(?P<indent>[ \t]*)(?P<key>[A-Za-z_][A-Za-z0-9_ -]{0,62}?|"[^"\n]{1,64}")'
+                     r'[ \t]*:(?=[ \t]|$)')
+# Searched patterns lead with a character class, which the regex engine
+# skips ahead to quickly; line-start tokens are matched from their newline
+_CAPSULE_SOURCES = {
+    # Outside fences only a brace can start a capsule
+    'prose': r'[\n{](?:(?<=\n)' + _CAPSULE_FENCE + r'|(?<=\{)(?P<open>))',
+    # Inside fences, 'key: value' lines build YAML mappings
+    'fenced': (r'[\n{](?:(?<=\n)' + _CAPSULE_FENCE + r'|(?<=\n)' + _CAPSULE_KEY_LINE +
+               r'|(?<=\{)(?P<open>))'),
+    # The same line-start tokens, for a parse that begins on a line start
+    'line': r'^(?:' + _CAPSULE_FENCE + '|' + _CAPSULE_KEY_LINE + ')',
+    # Inside braces: nesting, field separators, string quotes and key colons
+    'braces': '^' + _CAPSULE_FENCE + r'''
+        |(?P<open>[{[(])|(?P<close>[}\])])|(?P<sep>,|\n(?P<blank>[ \t]*(?=\n))?)
+        |(?P<quote>")|(?P<colon>:)''',
+    # Just what decides where braces end, to pass over those without a capsule
+    'skip': r'''[\n{}"](?:(?<=\n)''' + _CAPSULE_FENCE + r'''|(?<=\n)(?P<blank>[ \t]*(?=\n))
+        |(?<=\{)(?P<open>)|(?<=\})(?P<close>)|(?<=")(?P<quote>))''',
+    # A run of string characters up to a quote, backslash or line end
+    'string': r'[^"\\\n]*',
+    'fence': r'\n' + _CAPSULE_FENCE,
+    # Text without this cannot hold a capsule
+    'hint': r'(?ai)invariant',
+}
+_CAPSULE_KEY = re.compile(r'[a-z_][a-z0-9_ -]*')
+_CLOSERS = {'}': '{', ']': '[', ')': '('}
+
+
+_CAPSULE_PATTERNS: Dict[bool, Dict[str, 're.Pattern']] = {}
+
+
+def _capsule_patterns(binary: bool) -> Dict[str, 're.Pattern']:
+    """_CAPSULE_SOURCES compiled for str, or for bytes when binary"""
+    if binary not in _CAPSULE_PATTERNS:
+        _CAPSULE_PATTERNS[binary] = {
+            name: re.compile(source.encode('ascii') if binary else source,
+                             re.MULTILINE | re.VERBOSE)
+            for name, source in _CAPSULE_SOURCES.items()}
+    return _CAPSULE_PATTERNS[binary]
+
+
+class CapsuleParser:
+    """Single-pass extractor of context capsules
+
+    Tracks fenced code and brace/bracket nesting with an explicit stack, so
+    nested mappings are seen whole. A {...} mapping is a capsule when its
+    own keys include invariant and evidence; inside fences, 'key: value'
+    lines at one indentation form a YAML mapping judged the same way.
+    Braces opened in prose are abandoned at the paragraph's end, and braces
+    opened in a fence at the fence's end. Fences and brace regions that
+    never mention invariant are passed over after one cheap look. Every
+    token is read a bounded number of times and keys and values are sliced
+    to bounded length, so the cost is linear in the input whatever it
+    contains. Works on str and on bytes (or an mmap), with the same result.
+    """
+
+    KEY_LIMIT = 72
+    VALUE_LIMIT = 200
+
+    def __init__(self):
+        self.fence = None
+        self.groups = []
+        self.capsules = []
+
+    def feed(self, text, start: int = 0, stop: Optional[int] = None, final: bool = True,
+             line: int = 1, offset: int = 0) -> int:
+        """Parse text from start, appending to self.capsules
+
+        Nothing new is begun at or past stop, though a mapping open there is
+        followed to its end. line is the line number of text[0] and offset
+        is added to every recorded position. Returns where parsing stopped,
+        the place to resume a following feed of the same document.
+        """
+        binary = not isinstance(text, str)
+        patterns = _capsule_patterns(binary)
+        self._text, self._binary = text, binary
+        self._newline = b'\n' if binary else '\n'
+        self._line, self._counted, self._offset = line, 0, offset
+        end = len(text)
+        stop = end if stop is None else stop
+        pos = start
+
+        match = None
+        if pos < stop and (pos == 0 or text[pos - 1:pos] == self._newline):
+            match = patterns['line'].match(text, pos)
+        while pos < end:
+            if match is None:
+                pattern = patterns['fenced' if self.fence else 'prose']
+                match = pattern.search(text, pos)
+                if match is None:
+                    begin = end
+                else:
+                    # Line-start tokens match from the newline before them
+                    begin = match.start() + (match.lastgroup != 'open')
+                if begin >= stop:
+                    pos = max(pos, stop)
+                    break
+            if match.lastgroup == 'open':
+                pos = self._braces(match.start(), patterns)
+            elif match.lastgroup != 'key':
+                pos = self._fence_block(match, patterns)
+            elif self.fence:
+                self._yaml(match)
+                pos = match.end()
+            match = None
+
+        if final:
+            self._close_groups(-1)
+        return pos
+
+    def _line_of(self, pos: int) -> int:
+        """Line number at pos, which never moves backwards within a feed"""
+        self._line += self._text[self._counted:pos].count(self._newline)
+        self._counted = pos
+        return self._line
+
+    def _decode(self, start: int, end: int, limit: int) -> str:
+        if self._binary:
+            return self._text[start:min(end, start + 4 * limit)].decode('utf-8', 'ignore')[:limit]
+        return self._text[start:min(end, start + limit)]
+
+    def _fence(self, match):
+        marker = match.group('fence')
+        if self.fence is None:
+            self.fence = marker
+            self.groups = []
+        elif self._closes(match):
+            self.fence = None
+            self._close_groups(-1)
+
+    def _closes(self, match) -> bool:
+        marker = match.group('fence')
+        return (marker[:1] == self.fence[:1] and len(marker) >= len(self.fence)
+                and not match.group('info').strip(b' \t' if self._binary else ' \t'))
+
+    def _fence_block(self, match, patterns) -> int:
+        """Handle a fence line, passing over a whole block that cannot hold a capsule"""
+        opening = self.fence is None
+        self._fence(match)
+        pos = match.end()
+        if not opening:
+            return pos
+        text = self._text
+        close = patterns['fence'].search(text, pos)
+        while close is not None and not self._closes(close):
+            close = patterns['fence'].search(text, close.end())
+        body_end = len(text) if close is None else close.start()
+        if patterns['hint'].search(text, pos, body_end):
+            return pos
+        if close is None:
+            return body_end
+        self._fence(close)
+        return close.end()
+
+    def _yaml(self, match):
+        """A 'key: value' line inside a fence"""
+        indent = len(match.group('indent'))
+        key = self._decode(match.start('key'), match.end('key'), self.KEY_LIMIT)
+        key = key.strip('"').strip().lower()
+        eol = self._text.find(self._newline, match.end())
+        eol = len(self._text) if eol == -1 else eol
+        value = self._decode(match.end(), eol, self.VALUE_LIMIT).strip()
+        self._close_groups(indent)
+        if self.groups and self.groups[-1][0] == indent:
+            group = self.groups[-1]
+        else:
+            # Groups may outlive this feed, so they hold document positions
+            start = match.start('indent')
+            group = [indent, self._offset + start, self._line_of(start), {}, 0]
+            self.groups.append(group)
+        group[3][key] = value
+        group[4] = self._offset + eol
+
+    def _close_groups(self, indent: int):
+        """Finish the YAML mappings indented deeper than indent"""
+        while self.groups and self.groups[-1][0] > indent:
+            _, start, line, fields, end = self.groups.pop()
+            if self.groups:
+                self.groups[-1][4] = max(self.groups[-1][4], end)
+            self._emit(line, start, end, fields, 'yaml')
+
+    def _emit(self, line: int, start: int, end: int, fields: Dict[str, str], form: str):
+        if 'invariant' in fields and 'evidence' in fields:
+            self.capsules.append(Capsule(line, start, end, fields, form))
+
+    def _braces(self, pos: int, patterns) -> int:
+        """Follow the mapping opened at pos; returns the offset after it"""
+        text = self._text
+        end, fence = self._skip(pos, patterns)
+        if not patterns['hint'].search(text, pos, end):
+            if fence is not None:
+                self._fence(fence)
+            return end
+
+        pattern = patterns['braces']
+        # Frames are [opener, start, line, fields, segment start, key, value start]
+        stack = [['{', pos, self._line_of(pos), {}, pos + 1, None, 0]]
+        mappings = 1
+        pos += 1
+        while stack:
+            match = pattern.search(text, pos)
+            if match is None:
+                # Still open at the end of the text
+                return len(text)
+            pos = match.end()
+            if match.group('fence'):
+                self._fence(match)
+                return pos
+            if match.group('quote'):
+                pos = self._string_end(pos, patterns['string'])
+                continue
+            if match.group('blank') is not None and self.fence is None:
+                # The paragraph ended inside the braces
+                return pos
+            token = match.group(0)[:1]
+            if self._binary:
+                token = token.decode('ascii')
+            frame = stack[-1]
+            if match.group('open'):
+                if token == '{':
+                    mappings += 1
+                    stack.append(['{', match.start(), self._line_of(match.start()), {},
+                                  pos, None, 0])
+                else:
+                    stack.append([token])
+            elif match.group('close'):
+                opener = _CLOSERS[token]
+                if opener == '{' and mappings:
+                    while frame[0] != '{':
+                        stack.pop()
+                        frame = stack[-1]
+                    stack.pop()
+                    mappings -= 1
+                    self._field(frame, match.start())
+                    self._emit(frame[2], self._offset + frame[1], self._offset + pos,
+                               frame[3], 'braces')
+                    if stack and stack[-1][0] == '{' and stack[-1][5] is None:
+                        stack[-1][4] = pos
+                elif frame[0] == opener:
+                    stack.pop()
+            elif frame[0] != '{':
+                continue
+            elif match.group('sep'):
+                self._field(frame, match.start())
+                frame[4], frame[5] = pos, None
+            elif frame[5] is None:
+                frame[5], frame[6] = self._key(frame[4], match.start()), pos
+        return pos
+
+    def _skip(self, pos: int, patterns):
+        """Where the braces opened at pos end, as _braces would find it
+
+        Returns the offset after them and the fence line that ended them, if any.
+        """
+        text = self._text
+        pattern = patterns['skip']
+        depth = 1
+        pos += 1
+        while depth:
+            match = pattern.search(text, pos)
+            if match is None:
+                return len(text), None
+            pos = match.end()
+            kind = match.lastgroup
+            if kind == 'info':
+                return pos, match
+            if kind == 'blank':
+                if self.fence is None:
+                    return pos, None
+            elif kind == 'quote':
+                pos = self._string_end(pos, patterns['string'])
+            elif kind == 'open':
+                depth += 1
+            elif kind == 'close':
+                depth -= 1
+        return pos, None
+
+    def _string_end(self, pos: int, body: 're.Pattern') -> int:
+        """End of the string whose opening quote is just before pos
+
+        A string left open runs to the end of its line.
+        """
+        text = self._text
+        quote, backslash = ('"', '\\') if not self._binary else (b'"', b'\\')
+        while True:
+            pos = body.match(text, pos).end()
+            char = text[pos:pos + 1]
+            if char == quote:
+                return pos + 1
+            if char != backslash:
+                return pos
+            pos += 1 if text[pos + 1:pos + 2] in (self._newline, text[:0]) else 2
+
+    def _key(self, start: int, end: int) -> str:
+        """The key before a colon, or '' if the text there is not one"""
+        if end - start > self.KEY_LIMIT:
+            return ''
+        key = self._text[start:end]
+        if self._binary:
+            key = key.decode('utf-8', 'replace')
+        key = key.strip(' \t\r\n').strip('"\'').strip(' \t').lower()
+        return key if _CAPSULE_KEY.fullmatch(key) else ''
+
+    def _field(self, frame: list, end: int):
+        if frame[5]:
+            frame[3][frame[5]] = self._decode(frame[6], end, self.VALUE_LIMIT).strip()
+
+
+def parse_capsules(content) -> List[Capsule]:
+    """Context capsules in document order (content may be str, bytes or an mmap)"""
+    parser = CapsuleParser()
+    parser.feed(content)
+    return sorted(parser.capsules, key=lambda capsule: capsule.start)
+
+
+# Markdown region kinds, as classified by MarkdownTokenizer
+REGION_KINDS = ('prose', 'heading', 'code', 'inline_code', 'table', 'admonition')
+# What prose checks read: running text, headings and admonition bodies
+PROSE_REGIONS = ('prose', 'heading', 'admonition')
+
+# A backtick fence's info string cannot itself hold a backtick. A blank
+# line before one indented by four spaces (or a tab) may start indented
+# code; a delimiter row with no leading | makes the line above a table head
+_MD_LINE = r'''[ \t]*(?P<fence>`{3,}(?=[^`\n]*$)|~{3,})
+    |(?P<heading>\#{1,6})(?=[ \t]|$)
+    |[ \t]*(?P<table>\|)
+    |(?P<admonition>(?:!!!|\?\?\?\+?)[ \t])
+    |(?P<indented>[ \t]*(?=\n(?:[ ]{4}|[ ]{0,3}\t)[ \t]*[^ \t\n]))
+    |(?P<delimiter>[ \t]*:?-+:?[ \t]*(?:\|[ \t]*:?-+:?[ \t]*)+\|?[ \t]*$)'''
+_MD_SOURCES = {
+    # Newlines before a line that may start a construct; led by a literal,
+    # which the regex engine skips ahead to much faster than a class
+    'candidate': r'\n(?=[ \t]*(?:[`~|]|:?-+:?[ \t]*\||\n(?:[ ]{4}|[ ]{0,3}\t))|[\#!?])',
+    'line': r'^(?:' + _MD_LINE + ')',
+    'ticks': r'`+',
+    # The first line that is neither blank nor indented ends an admonition
+    'unindented': r'^(?=[^ \t\n])',
+    # Indented lines, with any blank lines between them
+    'indented_code': r'(?:(?:[ \t]*\n)*(?:[ ]{4}|[ ]{0,3}\t)[ \t]*[^ \t\n][^\n]*(?:\n|\Z))+',
+    # Table body rows: consecutive lines holding a |
+    'table_rows': r'(?:[^\n|]*\|[^\n]*(?:\n|\Z))*',
+    'list_item': r'[ ]{0,3}(?:[-*+]|\d{1,9}[.)])(?:[ \t]|$)',
+    'blank': r'[ \t]*$',
+    'indent': r'[ \t]',
+}
+
+
+_MD_PATTERNS: Dict[bool, Dict[str, 're.Pattern']] = {}
+
+
+def _md_patterns(binary: bool) -> Dict[str, 're.Pattern']:
+    """_MD_SOURCES compiled for str, or for bytes when binary"""
+    if binary not in _MD_PATTERNS:
+        _MD_PATTERNS[binary] = {
+            name: re.compile(source.encode('ascii') if binary else source,
+                             re.MULTILINE | re.VERBOSE)
+            for name, source in _MD_SOURCES.items()}
+    return _MD_PATTERNS[binary]
+
+
+class MarkdownRegions:
+    """A document cut into consecutive (kind, start, end) regions
+
+    Offsets are into the tokenized text (bytes for a MappedText). spans()
+    merges the regions of the wanted kinds into the ranges a scan covers.
+    """
+
+    def __init__(self, regions: List[Tuple[str, int, int]]):
+        self.regions = regions
+        self.starts = [start for _, start, _ in regions]
+        self._spans = {}
+
+    def spans(self, kinds: Tuple[str, ...], start: int = 0,
+              end: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Merged (start, end) ranges of the given kinds, clipped to [start, end)"""
+        whole = start == 0 and end is None
+        if whole and kinds in self._spans:
+            return self._spans[kinds]
+        regions = self.regions
+        spans = []
+        i = max(0, bisect.bisect_right(self.starts, start) - 1)
+        while i < len(regions):
+            kind, lo, hi = regions[i]
+            i += 1
+            if end is not None and lo >= end:
+                break
+            if kind not in kinds:
+                continue
+            lo, hi = max(lo, start), hi if end is None else min(hi, end)
+            if lo >= hi:
+                continue
+            if spans and spans[-1][1] == lo:
+                spans[-1] = (spans[-1][0], hi)
+            else:
+                spans.append((lo, hi))
+        if whole:
+            self._spans[kinds] = spans
+        return spans
+
+
+class MarkdownTokenizer:
+    """One-pass classifier of Markdown into REGION_KINDS
+
+    Recognises fenced code (``` or ~~~, closed by a longer or equal run of
+    the same character), indented code (lines indented by four spaces or a
+    tab after a blank line, outside lists and admonitions), ATX headings,
+    tables (lines starting with |, or a head row and the rows with a | that
+    follow a delimiter row such as --- | ---), MkDocs admonitions (!!! or
+    ??? and the indented block below them) and inline code, whose backtick
+    runs pair up within a line. Everything else is prose, or admonition
+    inside an admonition block. Only lines that start one of these
+    constructs or hold a backtick are looked at twice, and the look back
+    for an enclosing list stops where the previous one did, so the cost is
+    linear. feed() may be called on consecutive pieces of a document cut
+    at line starts: an open fence, indented code block, admonition or list
+    carries over. Works on str and on bytes (or an mmap), with the same
+    result.
+    """
+
+    def __init__(self):
+        self.fence = None
+        self.admonition = False
+        self.indented = False
+        self.in_list = False
+        self.after_blank = True
+
+    def feed(self, text) -> MarkdownRegions:
+        """Regions of text, which continues whatever was fed before"""
+        binary = not isinstance(text, str)
+        patterns = _md_patterns(binary)
+        self._text = text
+        self._binary = binary
+        self._regions = []
+        self._cursor = 0
+        self._admonition_end = self._unindented(0) if self.admonition else None
+        self._list_checked = None
+        size = len(text)
+        pos = 0
+
+        if self.fence is not None:
+            pos = self._fence_block(0)
+        else:
+            # Indented code needs a blank line before it, or nothing at all
+            if self.indented or (self.after_blank and not self.admonition
+                                 and not self.in_list):
+                pos = self._indented_block(0)
+            if not pos and size:
+                match = patterns['line'].match(text, 0)
+                if match:
+                    pos = self._token(match, 0)
+        candidate = patterns['candidate'].search
+        line = patterns['line'].match
+        tick = b'`' if binary else '`'
+        next_line = next_tick = -1
+        while pos < size:
+            if next_line < pos:
+                match = candidate(text, pos)
+                next_line = match.start() if match else size
+            if next_tick < pos:
+                next_tick = text.find(tick, pos)
+                if next_tick < 0:
+                    next_tick = size
+            if next_tick < next_line:
+                self._fill(next_tick)
+                pos = self._line_end(next_tick)
+                self._inline(next_tick, pos, None)
+            elif next_line < size:
+                match = line(text, next_line + 1)
+                pos = self._token(match, next_line + 1) if match else next_line + 1
+            else:
+                break
+
+        self._fill(size)
+        if size:
+            self.in_list = self._in_list(size)
+            last = size - 1 if text[size - 1:size] in ('\n', b'\n') else size
+            start = text.rfind(b'\n' if binary else '\n', 0, last) + 1
+            self.after_blank = patterns['blank'].match(text, start, last) is not None
+        regions = MarkdownRegions(self._regions)
+        self._text = self._regions = None
+        return regions
+
+    def _token(self, match, line_start: int) -> int:
+        """Emit the line construct match found; return where to search on"""
+        text = self._text
+        kind = match.lastgroup
+        if kind == 'fence':
+            self._fill(line_start)
+            marker = match.group('fence')
+            if self._binary:
+                marker = marker.decode('ascii')
+            self.fence = marker
+            return self._fence_block(self._line_end(match.end()), line_start)
+
+        eol = self._line_end(match.end())
+        # Line constructs take their newline; the search resumes on it
+        if kind == 'heading':
+            self._inline(line_start, min(eol + 1, len(text)), 'heading')
+        elif kind == 'table':
+            self._emit('table', line_start, min(eol + 1, len(text)))
+        elif kind == 'indented':
+            code = eol + 1
+            # Inside an admonition or a list the indent is their content
+            self._fill(code)
+            if self.admonition or self._in_list(line_start):
+                return eol
+            return self._indented_block(code)
+        elif kind == 'delimiter':
+            return self._pipe_table(line_start, eol)
+        else:
+            self._fill(line_start)
+            self.admonition = True
+            self._admonition_end = self._unindented(min(eol + 1, len(text)))
+        return eol
+
+    def _line_end(self, pos: int) -> int:
+        end = self._text.find(b'\n' if self._binary else '\n', pos)
+        return len(self._text) if end < 0 else end
+
+    def _unindented(self, pos: int) -> Optional[int]:
+        """Start of the first line from pos that ends an admonition, if any"""
+        match = _md_patterns(self._binary)['unindented'].search(self._text, pos)
+        return match.start() if match else None
+
+    def _fence_block(self, pos: int, start: int = 0) -> int:
+        """Emit code from start to the line closing the open fence, or to the end"""
+        body = r'[ \t]*' + re.escape(self.fence[0]) + '{' + str(len(self.fence)) + r',}[ \t]*$'
+        # Only the first line of a piece has no newline before it
+        match = pos == 0 and self._compile(body).match(self._text, 0)
+        if not match:
+            match = self._compile(r'\n' + body).search(self._text, pos)
+        if match:
+            end = match.end()
+            self.fence = None
+        else:
+            end = len(self._text)
+        self._emit('code', start, min(end + 1, len(self._text)))
+        return end
+
+    def _indented_block(self, start: int) -> int:
+        """Emit indented code from start to its last indented line"""
+        match = _md_patterns(self._binary)['indented_code'].match(self._text, start)
+        end = match.end() if match else start
+        self._emit('code', start, end)
+        # A block running to the end may go on in the next piece
+        self.indented = end == len(self._text) and end > start
+        return end - 1 if end > start and self._text[end - 1:end] in ('\n', b'\n') else end
+
+    def _pipe_table(self, line_start: int, eol: int) -> int:
+        """Emit the head row above a delimiter row, it and the rows below"""
+        text = self._text
+        regions = self._regions
+        if regions and regions[-1][0] == 'table' and regions[-1][2] == line_start:
+            # The head row started with | and is a table row already
+            start = line_start
+        else:
+            if line_start == 0 or self._cursor >= line_start:
+                return eol
+            start = text.rfind(b'\n' if self._binary else '\n', 0, line_start - 1) + 1
+            if text.find(b'|' if self._binary else '|', start, line_start - 1) < 0:
+                return eol
+        rows = min(eol + 1, len(text))
+        end = _md_patterns(self._binary)['table_rows'].match(text, rows).end()
+        self._emit('table', max(start, self._cursor), max(end, rows))
+        return end - 1 if end > rows else eol
+
+    def _in_list(self, pos: int) -> bool:
+        """Whether the line starting at pos is inside a list item
+
+        Looks back past blank and indented lines to the nearest unindented
+        one: a list item, or a paragraph continuing one without a blank line
+        in between. The walk stops where the previous one began, whose
+        answer holds for the same indented lines above.
+        """
+        text = self._text
+        patterns = _md_patterns(self._binary)
+        newline = b'\n' if self._binary else '\n'
+        checked = self._list_checked
+        if checked is not None and checked[0] > pos:
+            checked = None
+        paragraph = False
+        result = None
+        line = pos
+        while line > 0 and result is None:
+            if checked is not None and line <= checked[0] and not paragraph:
+                result = checked[1]
+                break
+            end = line - 1
+            line = text.rfind(newline, 0, end) + 1
+            if patterns['blank'].match(text, line, end):
+                if paragraph:
+                    result = False
+            elif patterns['list_item'].match(text, line, end):
+                result = True
+            elif not patterns['indent'].match(text, line, end):
+                paragraph = True
+        if result is None:
+            result = self.in_list
+        self._list_checked = (pos, result)
+        return result
+
+    def _compile(self, source: str) -> 're.Pattern':
+        return re.compile(source.encode('ascii') if self._binary else source, re.MULTILINE)
+
+    def _inline(self, start: int, end: int, base: Optional[str]):
+        """Emit inline code spans in [start, end), and base (or the running
+        kind) around them"""
+        if base is not None and self._text.find(b'`' if self._binary else '`', start, end) < 0:
+            self._emit(base, start, end)
+            return
+        runs = [m.span() for m in _md_patterns(self._binary)['ticks'].finditer(
+            self._text, start, end)]
+        # Each run closes at the next run of the same length
+        closer = [None] * len(runs)
+        last = {}
+        for i in range(len(runs) - 1, -1, -1):
+            length = runs[i][1] - runs[i][0]
+            closer[i] = last.get(length)
+            last[length] = i
+        i = 0
+        while i < len(runs):
+            j = closer[i]
+            if j is None:
+                i += 1
+                continue
+            if base is not None:
+                self._emit(base, start, runs[i][0])
+            else:
+                self._fill(runs[i][0])
+            self._emit('inline_code', runs[i][0], runs[j][1])
+            start = runs[j][1]
+            i = j + 1
+        if base is not None:
+            self._emit(base, start, end)
+
+    def _fill(self, end: int):
+        """Cover the text up to end with prose, or admonition while inside one"""
+        start = self._cursor
+        if start >= end:
+            return
+        if self.admonition:
+            stop = self._admonition_end
+            if stop is not None and stop <= start:
+                self.admonition = False
+            else:
+                split = end if stop is None else min(stop, end)
+                self._emit('admonition', start, split)
+                if split == stop:
+                    self.admonition = False
+                start = split
+        self._emit('prose', start, end)
+
+    def _emit(self, kind: str, start: int, end: int):
+        if start >= end:
+            return
+        if start > self._cursor:
+            self._fill(start)
+        regions = self._regions
+        if regions and regions[-1][0] == kind and regions[-1][2] == start:
+            regions[-1] = (kind, regions[-1][1], end)
+        else:
+            regions.append((kind, start, end))
+        self._cursor = end
+
+
+def tokenize_markdown(content) -> MarkdownRegions:
+    """Regions of a whole document (content may be str, bytes or an mmap)"""
+    return MarkdownTokenizer().feed(content)
+
+
+# Characters re.IGNORECASE equates with an ASCII letter that str.lower()
+# either leaves alone or expands to two characters
+_FOLD_EXTRA = str.maketrans({'İ': 'i', 'ı': 'i', 'ſ': 's'})
+
+
+def fold_case(content: str) -> str:
+    """Lowercase content without changing its length or offsets"""
+    if 'İ' in content or 'ı' in content or 'ſ' in content:
+        content = content.translate(_FOLD_EXTRA)
+    return content.lower()
+
+
+@dataclass
+class ScanRule:
+    """One vocabulary entry for the shared scanner
+
+    Every match of pattern must start with one of triggers once the text is
+    case-folded; the scanner only tries pattern at those positions.
+    """
+    tag: str
+    key: str
+    pattern: 're.Pattern'
+    triggers: Tuple[str, ...]
+    first_only: bool = False
+    trigger_regex: Optional[str] = None
+    lead: str = ''
+    spans_lines: bool = False
+
+
+ScanHits = Dict[str, Dict[str, List['re.Match']]]
+
+
+class ScanEngine:
+    """Single-pass scanner shared by all checks
+
+    The triggers of every rule are merged into one case-folded lookahead
+    alternation and the document is walked once. Each hit is verified with
+    the rule's own pattern, honouring finditer's non-overlapping semantics,
+    so checks see exactly the matches their individual patterns would find.
+    """
+
+    def __init__(self, rules: List[ScanRule]):
+        self.rules = rules
+        self._masters = {}
+        self._bytes = None
+        spanning = {r.tag for r in rules if r.spans_lines}
+        self.spanning_tags = tuple(sorted(spanning))
+        self.local_tags = tuple(sorted({r.tag for r in rules} - spanning))
+
+    @staticmethod
+    def _trie_regex(words: List[str]) -> str:
+        """Prefix-shared alternation; a word makes longer words redundant"""
+        trie = {}
+        for word in sorted(words):
+            node = trie
+            for ch in word:
+                if '' in node:
+                    break
+                node = node.setdefault(ch, {})
+            else:
+                node.clear()
+                node[''] = {}
+
+        def build(node):
+            alts = [re.escape(ch) + build(child)
+                    for ch, child in sorted(node.items()) if ch != '']
+            if not alts:
+                return ''
+            return alts[0] if len(alts) == 1 else '(?:' + '|'.join(alts) + ')'
+
+        return build(trie)
+
+    def _master(self, tags: Optional[Tuple[str, ...]], binary: bool = False):
+        """Combined trigger regex and lead-character buckets for tags
+
+        With binary the regex and bucket keys work on UTF-8 bytes.
+        """
+        if (tags, binary) not in self._masters:
+            rules = [(i, r) for i, r in enumerate(self.rules)
+                     if tags is None or r.tag in tags]
+            literals = [t for _, r in rules for t in r.triggers]
+            alternatives = [self._trie_regex(literals)] if literals else []
+            alternatives += [r.trigger_regex for _, r in rules if r.trigger_regex]
+            buckets = defaultdict(list)
+            for i, rule in rules:
+                leads = {t[0] for t in rule.triggers} | set(rule.lead)
+                for lead in leads:
+                    buckets[lead.encode('utf-8')[0] if binary else lead].append(i)
+            master = None
+            if alternatives:
+                source = '(?=' + '|'.join(alternatives) + ')'
+                master = re.compile(source.encode('utf-8') if binary else source)
+            self._masters[tags, binary] = (master, dict(buckets))
+        return self._masters[tags, binary]
+
+    def warm(self, tags: Optional[Tuple[str, ...]], binary: bool = False):
+        """Compile the regexes a scan for tags needs ahead of time"""
+        self._master(tags)
+        if binary:
+            self._master(tags, binary=True)
+            self._byte_patterns()
+
+    def _byte_patterns(self) -> List[Tuple['re.Pattern', bool]]:
+        """Per rule: a pattern over UTF-8 bytes, and whether its matches
+        need confirming when they touch non-ASCII text
+
+        Byte-level \\b only knows ASCII word characters; \\w is widened to
+        any non-ASCII byte. Both then accept at least what the str pattern
+        accepts, and MappedText.confirm() rejects the surplus.
+        """
+        if self._bytes is None:
+            self._bytes = []
+            for rule in self.rules:
+                source = _NEGATED_CHAR.sub(_negated_bytes, rule.pattern.pattern)
+                sensitive = bool(re.search(r'\\[bw]', source))
+                source = source.replace('\\w', r'(?:\w|[\x80-\xff])')
+                flags = rule.pattern.flags & (re.IGNORECASE | re.DOTALL | re.MULTILINE)
+                compiled = re.compile(source.encode('utf-8'), flags)
+                if isinstance(rule.pattern, _TimedPattern):
+                    compiled = _TimedPattern(compiled, rule.pattern.counter)
+                self._bytes.append((compiled, sensitive))
+        return self._bytes
+
+    def iter_matches(self, content: str, tags: Optional[Tuple[str, ...]] = None,
+                     start: int = 0, end: Optional[int] = None,
+                     spans: Optional[Dict[str, List[Tuple[int, int]]]] = None):
+        """Yield (rule index, match) for hits starting in content[start:end]
+
+        spans maps tags to the ordered (start, end) ranges their hits must
+        start and end in; other tags are matched anywhere.
+        """
+        if isinstance(content, MappedText):
+            yield from self._iter_mapped(content, tags, start, end, spans)
+            return
+
+        master, buckets = self._master(tags)
+        if master is None:
+            return
+
+        rules = self.rules
+        if start or end is not None:
+            folded = fold_case(content[start:end])
+        else:
+            folded = fold_case(content)
+        allowed = self._allowed(spans)
+        cursor = [0] * len(rules)
+        last_end = [0] * len(rules)
+        done = [False] * len(rules)
+        size = len(content)
+
+        for hit in master.finditer(folded):
+            offset = hit.start()
+            pos = start + offset
+            for i in buckets[folded[offset]]:
+                if done[i] or pos < last_end[i]:
+                    continue
+                limit = size
+                if allowed[i] is not None:
+                    limit = self._span_end(allowed[i], cursor, i, pos)
+                    if limit is None:
+                        continue
+                match = rules[i].pattern.match(content, pos, limit)
+                if match:
+                    last_end[i] = match.end()
+                    done[i] = rules[i].first_only
+                    yield i, match
+
+    def _iter_mapped(self, text: 'MappedText', tags: Optional[Tuple[str, ...]],
+                     start: int, end: Optional[int],
+                     spans: Optional[Dict[str, List[Tuple[int, int]]]] = None):
+        """iter_matches over the bytes of a MappedText, yielding MappedMatch"""
+        master, buckets = self._master(tags, binary=True)
+        if master is None:
+            return
+
+        rules = self.rules
+        patterns = self._byte_patterns()
+        data = text.data
+        folded = text.fold(start, end)
+        allowed = self._allowed(spans)
+        cursor = [0] * len(rules)
+        last_end = [0] * len(rules)
+        done = [False] * len(rules)
+        size = len(text)
+
+        for hit in master.finditer(folded):
+            offset = hit.start()
+            pos = start + offset
+            for i in buckets[folded[offset]]:
+                if done[i] or pos < last_end[i]:
+                    continue
+                limit = size
+                if allowed[i] is not None:
+                    limit = self._span_end(allowed[i], cursor, i, pos)
+                    if limit is None:
+                        continue
+                pattern, unicode_sensitive = patterns[i]
+                match = pattern.match(data, pos, limit)
+                if match:
+                    match = text.confirm(rules[i].pattern, match, unicode_sensitive, limit)
+                if match:
+                    last_end[i] = match.end()
+                    done[i] = rules[i].first_only
+                    yield i, match
+
+    def _allowed(self, spans: Optional[Dict[str, List[Tuple[int, int]]]]) -> List:
+        """Per rule: the spans its hits must lie in, or None for anywhere"""
+        if not spans:
+            return [None] * len(self.rules)
+        return [spans.get(rule.tag) for rule in self.rules]
+
+    @staticmethod
+    def _span_end(spans: List[Tuple[int, int]], cursor: List[int], i: int,
+                  pos: int) -> Optional[int]:
+        """End of the span holding pos, or None; rule i's cursor only moves
+        forward, as its candidates come in document order"""
+        k = cursor[i]
+        while k < len(spans) and spans[k][1] <= pos:
+            k += 1
+        cursor[i] = k
+        if k == len(spans) or pos < spans[k][0]:
+            return None
+        return spans[k][1]
+
+    def group(self, matches) -> ScanHits:
+        """Arrange (rule index, match) pairs by tag and key"""
+        hits = defaultdict(lambda: defaultdict(list))
+        rules = self.rules
+        for i, match in matches:
+            hits[rules[i].tag][rules[i].key].append(match)
+        return hits
+
+    def scan(self, content: str, tags: Optional[Tuple[str, ...]] = None,
+             spans: Optional[Dict[str, List[Tuple[int, int]]]] = None) -> ScanHits:
+        """Walk content once and return matches grouped by tag and key"""
+        return self.group(self.iter_matches(content, tags, spans=spans))
+
+
+# A character class excluding one non-ASCII character, e.g. [^⟩]
+_NEGATED_CHAR = re.compile(r'\[\^([^\x00-\x7f])\]')
+
+
+def _negated_bytes(match: 're.Match') -> str:
+    """Byte-level equivalent of a [^c] class for a multi-byte character c"""
+    encoded = ''.join(f'\\x{b:02x}' for b in match.group(1).encode('utf-8'))
+    return f'(?:(?!{encoded})[\\x00-\\xff])'
+
+
+# Text that str patterns and their UTF-8 byte counterparts can read
+# differently: carriage returns (text mode turns them into newlines),
+# whitespace beyond ASCII, and letters IGNORECASE equates with ASCII ones
+_BYTES_INEXACT = re.compile(b'|'.join(
+    [b'\r'] + [re.escape(ch.encode('utf-8')) for ch in
+               '\x1c\x1d\x1e\x1f\x85\xa0\u1680\u2028\u2029\u202f\u205f\u3000'
+               '\u0130\u0131\u017f\u212a' + ''.join(map(chr, range(0x2000, 0x200b)))]))
+
+
+class MappedText:
+    """UTF-8 document bytes standing in for its decoded text
+
+    Offsets are byte offsets. Supports the str operations the checks apply
+    to content (len, find, slicing), decoding only the slices asked for.
+    """
+
+    DECODE_CHUNK = 1 << 20
+
+    def __init__(self, data):
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def find(self, sub: str, start: int = 0, end: Optional[int] = None) -> int:
+        if end is None:
+            end = len(self.data)
+        return self.data.find(sub.encode('utf-8'), start, end)
+
+    def __getitem__(self, key: slice) -> str:
+        return self.data[key].decode('utf-8')
+
+    def fold(self, start: int = 0, end: Optional[int] = None) -> bytearray:
+        """ASCII-lowercased copy of data[start:end], made a chunk at a time"""
+        start, end, _ = slice(start, end).indices(len(self.data))
+        folded = bytearray(max(0, end - start))
+        for pos in range(start, end, self.DECODE_CHUNK):
+            stop = min(end, pos + self.DECODE_CHUNK)
+            folded[pos - start:stop - start] = self.data[pos:stop].lower()
+        return folded
+
+    def byte_exact(self) -> bool:
+        """Whether scanning the bytes gives the same matches as the text"""
+        return _BYTES_INEXACT.search(self.data) is None
+
+    def check_utf8(self):
+        """Raise UnicodeDecodeError, as reading the file as text would"""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        data = self.data
+        for pos in range(0, len(data), self.DECODE_CHUNK):
+            decoder.decode(data[pos:pos + self.DECODE_CHUNK])
+        decoder.decode(b'', final=True)
+
+    def confirm(self, pattern: 're.Pattern', match: 're.Match',
+                unicode_sensitive: bool, limit: Optional[int] = None) -> Optional['MappedMatch']:
+        """The match pattern itself gives for a byte-level match, if any
+
+        Byte patterns over-approximate word boundaries and word classes, so
+        when such a match touches non-ASCII text it is redone with the str
+        pattern over the enclosing lines, up to limit.
+        """
+        start, end = match.span()
+        data = self.data
+        if not unicode_sensitive or data[max(0, start - 1):end + 1].isascii():
+            return MappedMatch(start, end, match)
+        line_start = data.rfind(b'\n', 0, start) + 1
+        line_end = data.find(b'\n', end)
+        if line_end < 0 or (limit is not None and line_end > limit):
+            line_end = len(data) if limit is None else limit
+        window = data[line_start:line_end].decode('utf-8')
+        pos = len(data[line_start:start].decode('utf-8'))
+        exact = pattern.match(window, pos)
+        if exact is None:
+            return None
+        return MappedMatch(start, start + len(window[pos:exact.end()].encode('utf-8')), exact)
+
+
+class MappedMatch:
+    """A scanner match in a MappedText: byte offsets, decoded groups"""
+
+    __slots__ = ('_start', '_end', '_match')
+
+    def __init__(self, start: int, end: int, match: 're.Match'):
+        self._start = start
+        self._end = end
+        self._match = match
+
+    def start(self) -> int:
+        return self._start
+
+    def end(self) -> int:
+        return self._end
+
+    def group(self, group: int = 0) -> str:
+        value = self._match.group(group)
+        return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+class LazyLines:
+    """The lines of a MappedText, decoded when indexed or sliced"""
+
+    def __init__(self, text: MappedText, index: LineIndex):
+        self.text = text
+        self.starts = index.line_starts
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def _end(self, stop: int) -> int:
+        """Byte offset where line stop - 1 ends, without its newline"""
+        return self.starts[stop] - 1 if stop < len(self.starts) else len(self.text)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            first, stop, step = key.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(first, stop, step)]
+            if first >= stop:
+                return []
+            return self.text[self.starts[first]:self._end(stop)].split('\n')
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError('line index out of range')
+        return self.text[self.starts[key]:self._end(key + 1)]
+
+    def word_count(self, first: int, stop: int) -> int:
+        """len('\\n'.join(self[first:stop]).split()), counted on the bytes
+
+        Exact for a byte-exact MappedText, which has no whitespace beyond
+        ASCII. The range is split at newlines into pieces of bounded size.
+        """
+        first, stop, _ = slice(first, stop).indices(len(self))
+        if first >= stop:
+            return 0
+        data = self.text.data
+        pos, end = self.starts[first], self._end(stop)
+        count = 0
+        while pos < end:
+            cut = min(end, pos + self.text.DECODE_CHUNK)
+            if cut < end:
+                newline = data.rfind(b'\n', pos, cut)
+                if newline <= pos:
+                    newline = data.find(b'\n', cut, end)
+                cut = end if newline < 0 else newline
+            count += len(data[pos:cut].split())
+            pos = cut
+        return count
+
+
+def default_cache_dir() -> Path:
+    """Per-user cache location, honouring XDG_CACHE_HOME"""
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'chapter_validator'
+
+
+class ResultCache:
+    """On-disk validation results keyed by content hash and rule-set version
+
+    One JSON file per entry. Hits refresh the file's mtime, and prune()
+    drops entries older than max_age_days and then the least recently used
+    ones beyond max_entries. Cache I/O errors are treated as misses.
+    """
+
+    MAX_ENTRIES = 5000
+    MAX_AGE_DAYS = 30
+
+    def __init__(self, cache_dir: Path, max_entries: int = MAX_ENTRIES,
+                 max_age_days: float = MAX_AGE_DAYS):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+
+    @staticmethod
+    def key(content: str, ruleset_version: str) -> str:
+        """Entry key for text, or for its UTF-8 bytes (same key)"""
+        digest = hashlib.sha256(ruleset_version.encode('utf-8'))
+        if isinstance(content, str):
+            content = content.encode('utf-8', 'surrogatepass')
+        digest.update(content)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}.json'
+
+    def get(self, key: str) -> Optional[ChapterValidation]:
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+            validation = ChapterValidation.from_dict(data)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return validation
+
+    def put(self, key: str, validation: ChapterValidation):
+        path = self._path(key)
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(validation.to_dict()), encoding='utf-8')
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def prune(self):
+        """Apply the age limit, then the entry limit (oldest first)"""
+        cutoff = time.time() - self.max_age_days * 86400
+        entries = []
+        try:
+            paths = list(self.cache_dir.glob('*.json'))
+        except OSError:
+            return
+        for path in paths:
+            try:
+                mtime = path.stat().st_mtime
+                if mtime < cutoff:
+                    path.unlink()
+                else:
+                    entries.append((mtime, path))
+            except OSError:
+                continue
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_entries)]:
+            try:
+                path.unlink()
+            except OSError:
+                continue
+
+
+_MD_LINK = re.compile(r'\[[^\]\n]*\]\(\s*<?([^)\s>]+)>?(?:\s+"[^"\n]*")?\s*\)')
+_CHAPTER_MENTION = re.compile(r'\bChapter\s+(\d+)\b', re.IGNORECASE)
+_CHAPTER_NAME = re.compile(r'^chapter[-_ ]?0*(\d+)', re.IGNORECASE)
+_NAV_ITEM = re.compile(r'^(\s*)-\s+(.*?)\s*$')
+_HEADING_ID = re.compile(r'\s*\{[^}]*#([\w-]+)[^}]*\}\s*$')
+
+
+def parse_nav(config_text: str) -> List[Tuple[Optional[int], str]]:
+    """Pages listed under nav: in a mkdocs.yml, in order
+
+    Returns (chapter number, page path) pairs; the number comes from the
+    nearest enclosing "Chapter N ..." section. Only the plain block layout
+    MkDocs documents is understood, so no YAML parser is needed.
+    """
+    pages = []
+    stack = []
+    in_nav = False
+    for raw in config_text.splitlines():
+        if not in_nav:
+            in_nav = raw.rstrip() == 'nav:'
+            continue
+        if not raw.strip() or raw.lstrip().startswith('#'):
+            continue
+        if not raw[0].isspace() and not raw.startswith('-'):
+            break
+        match = _NAV_ITEM.match(raw)
+        if not match:
+            continue
+        indent, item = len(match.group(1)), match.group(2)
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        chapter = stack[-1][1] if stack else None
+
+        if item.endswith(':'):
+            title = item[:-1].strip('\'"')
+            number = _CHAPTER_NAME.match(title)
+            stack.append((indent, int(number.group(1)) if number else chapter))
+            continue
+        value = item.split(': ', 1)[1] if ': ' in item else item
+        value = value.strip().strip('\'"')
+        if value.endswith('.md'):
+            pages.append((chapter, value))
+    return pages
+
+
+def heading_anchor(title: str, seen: Set[str]) -> str:
+    """The id MkDocs gives a heading: explicit {#id}, else a toc slug
+
+    Repeated slugs get _1, _2, ... suffixes in document order, as the toc
+    extension does.
+    """
+    explicit = _HEADING_ID.search(title)
+    if explicit:
+        anchor = explicit.group(1)
+    else:
+        title = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', title)
+        title = unicodedata.normalize('NFKD', title).encode('ascii', 'ignore').decode('ascii')
+        title = re.sub(r'[^\w\s-]', '', title).strip().lower()
+        anchor = re.sub(r'[-\s]+', '-', title)
+    unique, n = anchor, 0
+    while unique in seen:
+        n += 1
+        unique = f'{anchor}_{n}'
+    seen.add(unique)
+    return unique
+
+
+@dataclass
+class PageLinks:
+    """What the link index records about one page of the docs directory"""
+    path: str
+    mtime_ns: int
+    size: int
+    headings: List[Tuple[int, str, str, int]]
+    links: List[Tuple[str, int]]
+    mentions: List[Tuple[int, int]]
+    digest: str = ''
+
+
+def _text_digest(content: str) -> str:
+    """Identifies page text, so in-memory text can be told from the indexed copy"""
+    return hashlib.sha1(content.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+class LinkIndex:
+    """Corpus-wide index of pages, headings, anchors and chapter mentions
+
+    Built by scanning a MkDocs docs directory and the nav of the mkdocs.yml
+    beside it. Page entries are persisted as JSON; update() re-parses only
+    files whose size or mtime changed and then rebuilds the lookup tables,
+    which resolve a link or a "Chapter N" mention with dictionary lookups.
+    """
+
+    VERSION = 2
+
+    def __init__(self, docs_dir: Path, config_path: Optional[Path] = None,
+                 store_path: Optional[Path] = None):
+        self.docs_dir = Path(docs_dir)
+        self.config_path = (Path(config_path) if config_path
+                            else self.docs_dir.parent / 'mkdocs.yml')
+        self.store_path = store_path
+        self.pages: Dict[str, PageLinks] = {}
+        self.nav: List[Tuple[Optional[int], str]] = []
+        self._config_stamp = None
+        self._load()
+        if not self.update():
+            self._build_tables()
+
+    @staticmethod
+    def store_for(docs_dir: Path, cache_dir: Path) -> Path:
+        """Where the index of docs_dir is kept inside a result cache directory"""
+        digest = hashlib.sha1(str(Path(docs_dir).resolve()).encode('utf-8')).hexdigest()
+        return Path(cache_dir) / 'links' / f'{digest[:16]}.json'
+
+    def _load(self):
+        if self.store_path is None:
+            return
+        try:
+            data = json.loads(Path(self.store_path).read_text(encoding='utf-8'))
+            if data['version'] != self.VERSION:
+                return
+            pages = {}
+            for path, page in data['pages'].items():
+                pages[path] = PageLinks(
+                    path=path, mtime_ns=page['mtime_ns'], size=page['size'],
+                    headings=[tuple(h) for h in page['headings']],
+                    links=[tuple(link) for link in page['links']],
+                    mentions=[tuple(m) for m in page['mentions']], digest=page['digest'])
+            nav = [tuple(entry) for entry in data['nav']]
+            config_stamp = tuple(data['config_stamp']) if data['config_stamp'] else None
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        self.pages, self.nav, self._config_stamp = pages, nav, config_stamp
+
+    def _save(self):
+        if self.store_path is None:
+            return
+        path = Path(self.store_path)
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        data = {
+            'version': self.VERSION,
+            'config_stamp': self._config_stamp,
+            'nav': self.nav,
+            'pages': {p: asdict(page) for p, page in self.pages.items()},
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data), encoding='utf-8')
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def _walk(self):
+        """(relative path, stat) for every markdown file under docs_dir"""
+        pending = [(self.docs_dir, '')]
+        while pending:
+            directory, prefix = pending.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir():
+                    pending.append((entry.path, f'{prefix}{entry.name}/'))
+                elif entry.name.endswith('.md') and entry.is_file():
+                    yield prefix + entry.name, entry.stat()
+
+    def update(self) -> bool:
+        """Bring the index up to date with the files; True if anything changed"""
+        changed = False
+        seen = set()
+        for path, stat in self._walk():
+            seen.add(path)
+            page = self.pages.get(path)
+            if page is not None and (page.mtime_ns, page.size) == (stat.st_mtime_ns,
+                                                                    stat.st_size):
+                continue
+            try:
+                content = (self.docs_dir / path).read_text(encoding='utf-8')
+            except (OSError, UnicodeDecodeError):
+                continue
+            self.pages[path] = self.extract(path, content, stat.st_mtime_ns, stat.st_size)
+            changed = True
+        for path in self.pages.keys() - seen:
+            del self.pages[path]
+            changed = True
+
+        try:
+            stat = self.config_path.stat()
+            config_stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            config_stamp = None
+        if config_stamp != self._config_stamp:
+            try:
+                self.nav = parse_nav(self.config_path.read_text(encoding='utf-8'))
+            except (OSError, UnicodeDecodeError):
+                self.nav = []
+            self._config_stamp = config_stamp
+            changed = True
+
+        if changed:
+            self._build_tables()
+            self._save()
+        return changed
+
+    @staticmethod
+    def extract(path: str, content: str, mtime_ns: int = 0, size: int = 0) -> PageLinks:
+        """Headings, links and chapter mentions of one page"""
+        index = LineIndex(content)
+        seen = set()
+        headings = [(s.level, s.title, heading_anchor(s.title, seen), s.line)
+                    for s in parse_sections(content)[1:]]
+        links = [(m.group(1), index.line_of(m.start())) for m in _MD_LINK.finditer(content)
+                 if '://' not in m.group(1) and not m.group(1).startswith('mailto:')]
+        mentions = [(int(m.group(1)), index.line_of(m.start()))
+                    for m in _CHAPTER_MENTION.finditer(content)]
+        return PageLinks(path=path, mtime_ns=mtime_ns, size=size, headings=headings,
+                         links=links, mentions=mentions, digest=_text_digest(content))
+
+    def _build_tables(self):
+        self.anchors = {path: {h[2] for h in page.headings} for path, page in self.pages.items()}
+        self.in_nav = {page for _, page in self.nav}
+        self.chapter_of = {}
+        for chapter, page in self.nav:
+            if chapter is not None:
+                self.chapter_of.setdefault(page, chapter)
+        for path in self.pages:
+            number = _CHAPTER_NAME.match(path)
+            if path not in self.chapter_of and number:
+                self.chapter_of[path] = int(number.group(1))
+        self.chapters = defaultdict(list)
+        for path, chapter in self.chapter_of.items():
+            if path in self.pages:
+                self.chapters[chapter].append(path)
+
+        self.linked_from = defaultdict(set)
+        self.mentioned_by = defaultdict(list)
+        for path, page in self.pages.items():
+            for target, _ in page.links:
+                resolved = self._target(path, target)[0]
+                if resolved != path and resolved in self.pages:
+                    self.linked_from[resolved].add(path)
+            for chapter, line in page.mentions:
+                self.mentioned_by[chapter].append((path, line))
+
+        digest = hashlib.sha256(json.dumps(self.nav).encode('utf-8'))
+        for path in sorted(self.pages):
+            page = self.pages[path]
+            digest.update(json.dumps([path, page.headings, page.links]).encode('utf-8'))
+        self.fingerprint = digest.hexdigest()
+
+    def relative(self, filepath) -> Optional[str]:
+        """Path of filepath inside docs_dir, or None if it lies outside"""
+        try:
+            return Path(filepath).resolve().relative_to(self.docs_dir.resolve()).as_posix()
+        except (OSError, ValueError):
+            return None
+
+    def chapter_for(self, path: Optional[str], filepath) -> Optional[int]:
+        """Chapter number of a page, falling back to a chapter-NN file or folder name"""
+        if path in self.chapter_of:
+            return self.chapter_of[path]
+        for part in reversed(Path(filepath).parts):
+            number = _CHAPTER_NAME.match(part)
+            if number:
+                return int(number.group(1))
+        return None
+
+    @staticmethod
+    def _target(source: str, target: str) -> Tuple[str, str]:
+        path, _, anchor = target.partition('#')
+        if not path:
+            return source, anchor
+        path = posixpath.normpath(posixpath.join(posixpath.dirname(source), unquote(path)))
+        return path, anchor
+
+    def resolves(self, source: str, target: str, own: Optional[PageLinks] = None) -> bool:
+        """Whether a link written in source points at an existing page and anchor
+
+        own, if given, is source's text as validated, whose headings stand in
+        for the indexed ones when a link points back into source.
+        """
+        path, anchor = self._target(source, target)
+        if not path.endswith('.md'):
+            return True
+        if own is not None and path == source:
+            anchors = {h[2] for h in own.headings}
+        else:
+            anchors = self.anchors.get(path)
+        return anchors is not None and (not anchor or anchor in anchors)
+
+    def is_orphan(self, path: str) -> bool:
+        """A page that is neither in the nav nor linked from another page"""
+        return (path != 'index.md' and path not in self.in_nav
+                and not self.linked_from.get(path))
+
+    def dependents(self, changed: Set[str], structural: Set[str] = frozenset(),
+                   previous: Optional[Dict[str, PageLinks]] = None) -> Set[str]:
+        """Other pages whose reference resolution can change with changed
+
+        That is pages linking to a changed page (its anchors may have moved),
+        pages a changed page links to now or linked to in previous (whether
+        they are orphans may have flipped) and, when pages added or removed
+        (structural) give a chapter its first page or take its last, pages
+        mentioning that chapter.
+        """
+        found = set()
+        for path in changed:
+            found |= self.linked_from.get(path, set())
+            pages = [self.pages.get(path)] + [(previous or {}).get(path)]
+            for page in filter(None, pages):
+                found.update(self._target(path, target)[0] for target, _ in page.links)
+        # linked_from only knows pages that exist
+        removed = changed - self.pages.keys()
+        if removed:
+            for source, page in self.pages.items():
+                if any(self._target(source, target)[0] in removed for target, _ in page.links):
+                    found.add(source)
+        for path in structural:
+            chapter = self.chapter_for(path, path)
+            if chapter is not None and not set(self.chapters.get(chapter, ())) - structural:
+                found.update(source for source, _ in self.mentioned_by.get(chapter, ()))
+        return {path for path in found if path in self.pages} - changed
+
+
+@dataclass(frozen=True)
+class CheckSpec:
+    """A registered check
+
+    method is called as method(content, lines, index, hits) and returns a
+    ValidationResult named name and worth weight points. needs lists the
+    inputs it reads beyond the raw text ('lines', 'index', 'hits' for the
+    scanner tags, 'sections' for the heading tree, 'capsules' for the parsed
+    context capsules, 'chapter_path'); the last three are passed as keyword
+    arguments. Only the inputs some selected check needs are built. regions
+    limits its tags to the Markdown region kinds listed (see
+    MarkdownTokenizer); None scans the whole document.
+    """
+    key: str
+    method: str
+    name: str
+    weight: int
+    tags: Tuple[str, ...] = ()
+    needs: Tuple[str, ...] = ('index', 'hits')
+    regions: Optional[Tuple[str, ...]] = None
+
+
+class ChapterArtifacts:
+    """Per-document inputs shared by the checks, each built on first use"""
+
+    def __init__(self, validator: 'ChapterValidator', content: str, specs: List[CheckSpec],
+                 scanner: Optional[ScanEngine] = None):
+        self.validator = validator
+        self.content = content
+        self.scanner = scanner or validator.scanner
+        tags = {tag for spec in specs for tag in spec.tags}
+        self.tags = None if tags >= set(self.scanner.spanning_tags + self.scanner.local_tags) \
+            else tuple(sorted(tags))
+        self._built = {}
+
+    def _get(self, name: str, build):
+        if name not in self._built:
+            self._built[name] = build()
+        return self._built[name]
+
+    @property
+    def index(self) -> LineIndex:
+        return self._get('index', lambda: LineIndex(self.content))
+
+    @property
+    def lines(self) -> List[str]:
+        if isinstance(self.content, MappedText):
+            return self._get('lines', lambda: LazyLines(self.content, self.index))
+        return self._get('lines', lambda: self.content.split('\n'))
+
+    @property
+    def hits(self) -> ScanHits:
+        def build():
+            validator = self.validator
+            if validator.incremental and self.scanner is validator.scanner:
+                return validator._scan_sections(self.content, self.regions)
+            tag_regions = validator.tag_regions(self.tags)
+            spans = validator.region_spans(tag_regions, self.regions) if tag_regions else None
+            return self.scanner.scan(self.content, self.tags, spans)
+        return self._get('hits', build)
+
+    @property
+    def regions(self) -> MarkdownRegions:
+        content = self.content
+        if isinstance(content, MappedText):
+            content = content.data
+        return self._get('regions', lambda: tokenize_markdown(content))
+
+    @property
+    def sections(self) -> List[Section]:
+        content = self.content
+        if isinstance(content, MappedText):
+            # The regions of a MappedText are byte offsets; sections are by character
+            content = content[0:len(content)]
+            return self._get('sections', lambda: parse_sections(content))
+        return self._get('sections', lambda: parse_sections(content, self.regions))
+
+    @property
+    def capsules(self) -> List[Capsule]:
+        content = self.content
+        if isinstance(content, MappedText):
+            content = content.data
+        return self._get('capsules', lambda: parse_capsules(content))
+
+    def call(self, validator: 'ChapterValidator', spec: CheckSpec,
+             chapter_path: str) -> ValidationResult:
+        """Run one check with the inputs it declares"""
+        needs = spec.needs
+        extra = {}
+        if 'sections' in needs:
+            extra['sections'] = self.sections
+        if 'capsules' in needs:
+            extra['capsules'] = self.capsules
+        if 'chapter_path' in needs:
+            extra['chapter_path'] = chapter_path
+        return getattr(validator, spec.method)(
+            self.content,
+            self.lines if 'lines' in needs else None,
+            self.index if 'index' in needs else None,
+            self.hits if 'hits' in needs else None,
+            **extra
+        )
+
+
+class RuleTable:
+    """Everything compiled from a validator class's vocabularies
+
+    Holds the scanner (whose combined trigger regexes compile on first use)
+    and, per G-vector slot, the values it accepts verbatim plus one
+    alternation of all of them. Tables are built once per class and
+    rule-set version and shared by every validator in the process; those
+    built before a process pool forks are inherited by its workers.
+    """
+
+    def __init__(self, validator: 'ChapterValidator'):
+        self.version = validator.ruleset_version
+        self.scanner = ScanEngine(validator.scan_rules())
+        self.components = [
+            (name, frozenset(v for v in values if re.escape(v) == v),
+             re.compile('|'.join(f'(?:{v})' for v in values)))
+            for name, values in validator.VALID_COMPONENTS.items()
+        ]
+
+    def invalid_components(self, values: List[str]) -> List[Tuple[str, str]]:
+        """(slot name, value) for each value its slot does not accept
+
+        A value is accepted if one of the slot's patterns matches at its
+        start, as re.match() would; exact literals skip the regex.
+        """
+        invalid = []
+        for (name, literals, matcher), value in zip(self.components, values):
+            if value not in literals and not matcher.match(value):
+                invalid.append((name, value))
+        return invalid
+
+
+# Rule tables by (validator class, rule-set version), and each class's
+# rule-set version, so neither is rebuilt per validator
+_RULE_TABLES: Dict[Tuple[type, str], RuleTable] = {}
+_RULESET_VERSIONS: Dict[type, str] = {}
 
 
 class ChapterValidator:
@@ -102,38 +2098,407 @@ class ChapterValidator:
         '⤓': 'downgrade'
     }
 
-    def __init__(self, verbose: bool = False):
+    # Context capsule fields
+    CAPSULE_FIELDS = ['invariant', 'evidence', 'boundary', 'mode', 'fallback']
+
+    # Transfer tests at increasing distance
+    TRANSFER_TESTS = ['Near', 'Medium', 'Far']
+
+    # Spiral narrative passes: (pattern, case-folded triggers)
+    SPIRAL_PASSES = {
+        'Pass 1': (r'(Part 1|Pass 1|INTUITION|Intuition)', ('part 1', 'pass 1', 'intuition')),
+        'Pass 2': (r'(Part 2|Pass 2|UNDERSTANDING|Understanding)',
+                   ('part 2', 'pass 2', 'understanding')),
+        'Pass 3': (r'(Part 3|Pass 3|MASTERY|Mastery)', ('part 3', 'pass 3', 'mastery'))
+    }
+
+    # Cross-references: (pattern, case-folded triggers)
+    BACKWARD_REFERENCE = (
+        r'(Chapter [1-9]|from Chapter|as we saw in|in Chapter [1-9])',
+        ('chapter', 'from chapter', 'as we saw in', 'in chapter')
+    )
+    FORWARD_REFERENCE = (
+        r"(we'll explore|will explore|in Chapter [1-9][0-9]?|future chapter)",
+        ("we'll explore", 'will explore', 'in chapter', 'future chapter')
+    )
+
+    # Registered checks, in report order
+    CHECKS = [
+        CheckSpec('g-vectors', 'check_g_vectors', 'G-Vector Syntax', 10, ('g_vector',)),
+        CheckSpec('mode-matrix', 'check_mode_matrix', 'Mode Matrix', 10, ('mode',),
+                  ('lines', 'index', 'hits')),
+        CheckSpec('evidence-properties', 'check_evidence_properties', 'Evidence Properties', 10,
+                  ('evidence_property', 'evidence_section')),
+        CheckSpec('sacred-diagrams', 'check_sacred_diagrams', 'Sacred Diagrams', 5,
+                  ('sacred_diagram',)),
+        CheckSpec('transfer-tests', 'check_transfer_tests', 'Transfer Tests', 10,
+                  ('transfer_test',), ('lines', 'index', 'hits')),
+        CheckSpec('context-capsules', 'check_context_capsules', 'Context Capsules', 10,
+                  (), ('capsules',)),
+        CheckSpec('composition-operators', 'check_composition_operators',
+                  'Composition Operators', 10, ('operator',), regions=PROSE_REGIONS),
+        CheckSpec('invariant-mapping', 'check_invariant_mapping', 'Invariant Mapping', 15,
+                  ('invariant', 'primary_invariant'), regions=PROSE_REGIONS),
+        CheckSpec('spiral-narrative', 'check_spiral_narrative', 'Spiral Narrative', 10,
+                  ('spiral_pass',), ('lines', 'index', 'hits')),
+        CheckSpec('cross-references', 'check_cross_references', 'Cross-References', 10,
+                  ('cross_reference',), regions=PROSE_REGIONS),
+        CheckSpec('reference-resolution', 'check_reference_resolution', 'Reference Resolution',
+                  10, (), ('chapter_path',)),
+    ]
+
+    # Checks whose low scores cap the grade at D, with the minimum score
+    CRITICAL_CHECKS = {
+        'Invariant Mapping': 7,
+        'Evidence Properties': 7,
+        'G-Vector Syntax': 5
+    }
+
+    # The command line exits non-zero when any chapter scores below this
+    PASS_PERCENTAGE = 70
+
+    # Sections remembered for incremental re-validation
+    SECTION_CACHE_SIZE = 20000
+
+    def __init__(self, verbose: bool = False, cache: Optional[ResultCache] = None,
+                 incremental: bool = False, stream: bool = False, mapped: bool = False,
+                 link_index: Optional[LinkIndex] = None, profile: bool = False,
+                 hooks: Optional[List[ProfileHook]] = None,
+                 only: Optional[List[str]] = None, skip: Optional[List[str]] = None,
+                 early_exit: bool = False):
         self.verbose = verbose
+        self.cache = cache
+        self.incremental = incremental
+        self.stream = stream
+        self.mapped = mapped
+        self.link_index = link_index
+        self.hooks = list(hooks or [])
+        self.profile = profile or bool(self.hooks)
+        self.only = list(only or [])
+        self.skip = list(skip or [])
+        self.early_exit = early_exit
+        self.checks = self.select_checks(self.only, self.skip)
+        self._profiled_scanner = None
+        self.rule_table = self._rule_table()
+        self.scanner = self.rule_table.scanner
+        self._section_hits = OrderedDict()
+
+    def worker_options(self) -> Dict:
+        """Constructor arguments that rebuild this validator in a pool worker
+
+        Hooks stay in this process; profiles come back with each result.
+        """
+        return dict(verbose=self.verbose, stream=self.stream, mapped=self.mapped,
+                    link_index=self.link_index, profile=self.profile,
+                    only=self.only, skip=self.skip, early_exit=self.early_exit)
+
+    def _rule_table(self) -> RuleTable:
+        """The shared RuleTable for this class and rule-set version"""
+        key = (type(self), self.ruleset_version)
+        table = _RULE_TABLES.get(key)
+        if table is None:
+            table = _RULE_TABLES[key] = RuleTable(self)
+        return table
+
+    def warm(self):
+        """Compile the scanner regexes this validator's checks will use
+
+        Called before forking workers, so they start with them compiled.
+        """
+        tags = ChapterArtifacts(self, '', self.checks).tags
+        self.scanner.warm(tags, binary=self.mapped)
+
+    @property
+    def ruleset_version(self) -> str:
+        """Hash of the vocabularies and the code that turns them into scores"""
+        cls = type(self)
+        if cls not in _RULESET_VERSIONS:
+            digest = hashlib.sha256()
+            for name in sorted(dir(cls)):
+                if name.isupper():
+                    digest.update(f'{name}={getattr(cls, name)!r}\n'.encode('utf-8'))
+            # Whole defining modules: cheap to hash, and conservative
+            sources = {__file__}
+            for klass in cls.__mro__[:-1]:
+                try:
+                    sources.add(inspect.getsourcefile(klass))
+                except TypeError:
+                    continue
+            for source in sorted(path for path in sources if path):
+                try:
+                    digest.update(Path(source).read_bytes())
+                except OSError:
+                    continue
+            _RULESET_VERSIONS[cls] = digest.hexdigest()
+        return _RULESET_VERSIONS[cls]
+
+    @property
+    def cache_version(self) -> str:
+        """ruleset_version, plus the check selection and link index state"""
+        version = self.ruleset_version
+        if self.only or self.skip or self.early_exit:
+            version += ':' + ','.join(spec.key for spec in self.checks)
+            version += ':early' if self.early_exit else ''
+        if self.link_index is not None:
+            version += f':{self.link_index.fingerprint}'
+        return version
+
+    def scan_rules(self) -> List[ScanRule]:
+        """Scanner rules for every check vocabulary"""
+        ic = re.IGNORECASE
+        rules = [
+            ScanRule('g_vector', 'G', re.compile(self.G_VECTOR_PATTERN), (),
+                     trigger_regex=r'g\s*=\s*⟨', lead='g', spans_lines=True),
+            ScanRule('evidence_section', 'Evidence', re.compile(r'##.*Evidence', ic), ('##',)),
+            ScanRule('primary_invariant', 'primary', re.compile(
+                r'Primary\s+invariant:\s*(\w+)', ic), ('primary',), first_only=True),
+            ScanRule('cross_reference', 'backward',
+                     re.compile(self.BACKWARD_REFERENCE[0], ic), self.BACKWARD_REFERENCE[1]),
+            ScanRule('cross_reference', 'forward',
+                     re.compile(self.FORWARD_REFERENCE[0], ic), self.FORWARD_REFERENCE[1]),
+        ]
+        for mode in self.REQUIRED_MODES:
+            rules.append(ScanRule('mode', mode, re.compile(rf'\b{mode}\s+(Mode|mode)\b', ic),
+                                  (mode.lower(),), first_only=True))
+        for prop in self.EVIDENCE_PROPERTIES:
+            rules.append(ScanRule('evidence_property', prop,
+                                  re.compile(rf'\b{prop}\b\s*:', ic), (prop.lower(),)))
+        for diagram in self.SACRED_DIAGRAMS:
+            rules.append(ScanRule('sacred_diagram', diagram, re.compile(re.escape(diagram), ic),
+                                  (diagram.lower(),), first_only=True))
+        for test_type in self.TRANSFER_TESTS:
+            rules.append(ScanRule('transfer_test', test_type,
+                                  re.compile(rf'\b{test_type}\b.*Test', ic),
+                                  (test_type.lower(),), first_only=True))
+        for op_symbol in self.COMPOSITION_OPERATORS:
+            rules.append(ScanRule('operator', op_symbol, re.compile(re.escape(op_symbol)),
+                                  (op_symbol,)))
+        for invariant in (self.FUNDAMENTAL_INVARIANTS + self.DERIVED_INVARIANTS +
+                          self.COMPOSITE_INVARIANTS):
+            rules.append(ScanRule('invariant', invariant, re.compile(rf'\b{invariant}\b', ic),
+                                  (invariant.lower(),), first_only=True))
+        for pass_name, (pattern, triggers) in self.SPIRAL_PASSES.items():
+            rules.append(ScanRule('spiral_pass', pass_name, re.compile(pattern, ic),
+                                  triggers, first_only=True))
+        return rules
 
     def validate_chapter(self, filepath: Path) -> ChapterValidation:
         """Main validation entry point"""
-        content = filepath.read_text(encoding='utf-8')
-        lines = content.split('\n')
+        if self.stream:
+            return StreamingValidator(self).validate_chapter(filepath)
 
-        results = []
+        if self.mapped and not self.incremental:
+            validation = self._validate_mapped(filepath)
+            if validation is not None:
+                return validation
 
-        # Run all validation checks
-        results.append(self.check_g_vectors(content, lines))
-        results.append(self.check_mode_matrix(content, lines))
-        results.append(self.check_evidence_properties(content, lines))
-        results.append(self.check_sacred_diagrams(content, lines))
-        results.append(self.check_transfer_tests(content, lines))
-        results.append(self.check_context_capsules(content, lines))
-        results.append(self.check_composition_operators(content, lines))
-        results.append(self.check_invariant_mapping(content, lines))
-        results.append(self.check_spiral_narrative(content, lines))
-        results.append(self.check_cross_references(content, lines))
+        content = filepath.read_text(encoding='utf-8')
+        return self._validate_cached(content, content, str(filepath))
+
+    def validate_text(self, content: str, chapter_path: str = '<text>') -> ChapterValidation:
+        """Validate chapter text that is not (or not yet) saved to disk"""
+        return self._validate_cached(content, content, chapter_path)
+
+    def _validate_mapped(self, filepath: Path) -> Optional[ChapterValidation]:
+        """validate_chapter over a read-only memory map of the file
+
+        Returns None for files the byte-level scan cannot reproduce exactly
+        (empty files, carriage returns, Unicode-only whitespace or case
+        folds); those take the text path.
+        """
+        with open(filepath, 'rb') as handle:
+            try:
+                data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return None
+        try:
+            text = MappedText(data)
+            if not text.byte_exact():
+                return None
+            text.check_utf8()
+            return self._validate_cached(text, data, str(filepath))
+        finally:
+            data.close()
+
+    def _validate_cached(self, content: str, raw, chapter_path: str) -> ChapterValidation:
+        """_validate_content through the result cache, keyed on raw
+
+        Profiling runs bypass the cache, since a cached result costs nothing.
+        """
+        if self.cache is None or self.profile:
+            return self._validate_content(content, chapter_path)
+
+        key = self.cache.key(raw, self.cache_version)
+        validation = self.cache.get(key)
+        if validation is None:
+            validation = self._validate_content(content, chapter_path)
+            self.cache.put(key, validation)
+        else:
+            validation.chapter_path = chapter_path
+        return validation
+
+    def _validate_content(self, content: str, chapter_path: str) -> ChapterValidation:
+        """Run the selected checks over chapter text or a MappedText"""
+        if self.profile:
+            return self._validate_profiled(content, chapter_path)
+        artifacts = ChapterArtifacts(self, content, self.checks)
+        return self._run_checks(artifacts, chapter_path)
+
+    @classmethod
+    def register_check(cls, spec: CheckSpec):
+        """Add a check to this class's registry (subclasses keep their own copy)"""
+        cls.CHECKS = [c for c in cls.CHECKS if c.key != spec.key] + [spec]
+        # CHECKS is part of the rule-set version, here and in subclasses
+        _RULESET_VERSIONS.clear()
+
+    def select_checks(self, only: Optional[List[str]] = None,
+                      skip: Optional[List[str]] = None) -> List[CheckSpec]:
+        """Registered checks filtered by key, method or report name, in report order"""
+        available = [spec for spec in self.CHECKS
+                     if 'chapter_path' not in spec.needs or self.link_index is not None]
+
+        def resolve(names):
+            wanted = set()
+            for name in names:
+                matches = [spec.key for spec in self.CHECKS
+                           if name.lower() in (spec.key, spec.method, spec.name.lower())]
+                if not matches:
+                    raise ValueError(f"Unknown check '{name}' (choose from: "
+                                     f"{', '.join(spec.key for spec in self.CHECKS)})")
+                wanted.update(matches)
+            return wanted
+
+        if only:
+            wanted = resolve(only)
+            available = [spec for spec in available if spec.key in wanted]
+        if skip:
+            unwanted = resolve(skip)
+            available = [spec for spec in available if spec.key not in unwanted]
+        return available
+
+    def _execution_order(self) -> List[CheckSpec]:
+        """Report order, or critical and heavy checks first when exiting early"""
+        if not self.early_exit:
+            return self.checks
+        return sorted(self.checks, key=lambda spec: (spec.name not in self.CRITICAL_CHECKS,
+                                                     -spec.weight))
+
+    def _run_checks(self, artifacts: ChapterArtifacts, chapter_path: str,
+                    on_result: Optional[Callable] = None) -> ChapterValidation:
+        """Run the selected checks once each and summarize them in report order"""
+        results = {}
+        pending = self._execution_order()
+        max_score = sum(spec.weight for spec in self.checks)
+        while pending:
+            spec, pending = pending[0], pending[1:]
+            start = time.perf_counter()
+            results[spec.key] = artifacts.call(self, spec, chapter_path)
+            if on_result is not None:
+                on_result(spec, results[spec.key], time.perf_counter() - start)
+            if self.early_exit and pending and self._grade_settled(
+                    list(results.values()), pending, max_score):
+                break
 
+        ordered = [results[spec.key] for spec in self.checks if spec.key in results]
+        if not pending:
+            return self.summarize(chapter_path, ordered)
+        validation = self.summarize(chapter_path, ordered, max_score)
+        validation.status += f' (grade settled after {len(ordered)} of {len(self.checks)} checks)'
+        return validation
+
+    def _grade_settled(self, results: List[ValidationResult], pending: List[CheckSpec],
+                       max_score: int) -> bool:
+        """Whether no outcome of the pending checks can change the grade
+
+        Nor whether the chapter passes: an early-exit run reports the lower
+        bound, which must fall on the same side of PASS_PERCENTAGE as the
+        full score, or the exit code could differ.
+        """
+        if max_score <= 0:
+            return False
+        score = sum(r.score for r in results)
+        low = score / max_score * 100
+        high = (score + sum(spec.weight for spec in pending)) / max_score * 100
+        if (low >= self.PASS_PERCENTAGE) != (high >= self.PASS_PERCENTAGE):
+            return False
+        variants = [results]
+        critical = [spec for spec in pending if spec.name in self.CRITICAL_CHECKS]
+        if critical:
+            variants.append(results + [ValidationResult(spec.name, False, 0, spec.weight, '', [], [])
+                                       for spec in critical])
+        grades = {self.calculate_grade(percentage, variant)[0]
+                  for variant in variants for percentage in (low, high)}
+        return len(grades) == 1
+
+    def _validate_profiled(self, content: str, chapter_path: str) -> ChapterValidation:
+        """_validate_content, timing every check and reporting to the hooks"""
+        for hook in self.hooks:
+            hook.file_started(chapter_path)
+        scanner, counters = self._timed_scanner()
+        for counter in counters.values():
+            counter[0] = 0.0
+
+        # Build every needed input up front so the checks are timed alone
+        start = time.perf_counter()
+        artifacts = ChapterArtifacts(self, content, self.checks, scanner)
+        needs = {need for spec in self.checks for need in spec.needs}
+        for need in ('index', 'lines', 'hits', 'sections'):
+            if need in needs:
+                getattr(artifacts, need)
+        hits = artifacts.hits if 'hits' in needs else {}
+        verify = sum(counter[0] for counter in counters.values())
+        size = len(content) if isinstance(content, MappedText) else len(content.encode('utf-8'))
+        total = sum(len(m) for keys in hits.values() for m in keys.values())
+        profiles = [CheckProfile('Shared scan', time.perf_counter() - start - verify, total, size)]
+
+        def record(spec, result, seconds):
+            spans = [m.group(0) for tag in spec.tags for found in hits[tag].values() for m in found]
+            if 'capsules' in spec.needs:
+                spans += [content[c.start:c.end] for c in artifacts.capsules]
+            profile = CheckProfile(
+                check_name=result.check_name,
+                seconds=seconds + sum(counters[tag][0] for tag in spec.tags if tag in counters),
+                matches=len(spans),
+                bytes_scanned=sum(len(span.encode('utf-8')) for span in spans)
+            )
+            profiles.append(profile)
+            for hook in self.hooks:
+                hook.check_finished(chapter_path, profile)
+
+        validation = self._run_checks(artifacts, chapter_path, record)
+        validation.profile = profiles
+        for hook in self.hooks:
+            hook.file_finished(validation)
+        return validation
+
+    def _timed_scanner(self):
+        """A copy of the scanner whose rules time their verification, per tag"""
+        if self._profiled_scanner is None:
+            counters = {}
+            rules = [replace(rule, pattern=_TimedPattern(
+                rule.pattern, counters.setdefault(rule.tag, [0.0])))
+                for rule in self.scanner.rules]
+            self._profiled_scanner = (ScanEngine(rules), counters)
+        return self._profiled_scanner
+
+    def summarize(self, chapter_path: str, results: List[ValidationResult],
+                  max_score: Optional[int] = None) -> ChapterValidation:
+        """Combine check results into a scored chapter validation
+
+        max_score overrides the sum of the results' maxima, for runs that
+        stopped before every check.
+        """
         # Calculate total score
         total_score = sum(r.score for r in results)
-        max_score = sum(r.max_score for r in results)
-        percentage = (total_score / max_score * 100) if max_score > 0 else 0
+        if max_score is None:
+            max_score = sum(r.max_score for r in results)
+        percentage = (total_score / max_score * 100) if max_score > 0 else 0.0
 
         # Determine grade and status
         grade, status = self.calculate_grade(percentage, results)
 
         return ChapterValidation(
-            chapter_path=str(filepath),
+            chapter_path=chapter_path,
             total_score=total_score,
             max_score=max_score,
             percentage=percentage,
@@ -142,13 +2507,111 @@ class ChapterValidator:
             results=results
         )
 
-    def check_g_vectors(self, content: str, lines: List[str]) -> ValidationResult:
+    def tag_regions(self, tags: Optional[Tuple[str, ...]] = None) -> Dict[str, Tuple[str, ...]]:
+        """Region kinds for those of tags (default: all) whose check reads
+        only some Markdown regions"""
+        return {tag: spec.regions for spec in self.CHECKS if spec.regions is not None
+                for tag in spec.tags if tags is None or tag in tags}
+
+    @staticmethod
+    def region_spans(tag_regions: Dict[str, Tuple[str, ...]], regions: MarkdownRegions,
+                     start: int = 0, end: Optional[int] = None
+                     ) -> Dict[str, List[Tuple[int, int]]]:
+        """ScanEngine spans for tag_regions, clipped to [start, end)"""
+        by_kinds = {}
+        for kinds in tag_regions.values():
+            if kinds not in by_kinds:
+                by_kinds[kinds] = regions.spans(kinds, start, end)
+        return {tag: by_kinds[kinds] for tag, kinds in tag_regions.items()}
+
+    def scan_hits(self, content: str, tags: Optional[Tuple[str, ...]] = None) -> ScanHits:
+        """Scanner hits for tags, each only in the regions its check reads"""
+        tag_regions = self.tag_regions(tags)
+        spans = None
+        if tag_regions:
+            regions = tokenize_markdown(content.data if isinstance(content, MappedText)
+                                        else content)
+            spans = self.region_spans(tag_regions, regions)
+        return self.scanner.scan(content, tags, spans)
+
+    def _scan_sections(self, content: str, regions: MarkdownRegions) -> ScanHits:
+        """Scan hits reusing the results of sections seen unchanged before
+
+        Rules whose matches stay on one line cannot cross a heading, so their
+        hits in a section depend only on that section's text and on where
+        its regions lie, and are cached by both as relative offsets. Rules
+        that may span lines (G-vectors) are always scanned over the whole
+        document.
+        """
+        scanner = self.scanner
+        rules = scanner.rules
+        cache = self._section_hits
+        tag_regions = self.tag_regions(scanner.local_tags)
+        spanning = scanner.spanning_tags
+        matches = list(scanner.iter_matches(
+            content, spanning, spans=self.region_spans(self.tag_regions(spanning), regions)))
+        seen_first = set()
+
+        for section in parse_sections(content, regions):
+            if section.start == section.end:
+                continue
+            start = section.start
+            text = content[start:section.end]
+            spans = self.region_spans(tag_regions, regions, start, section.end)
+            digest = hashlib.sha1(text.encode('utf-8', 'surrogatepass'))
+            for tag in sorted(spans):
+                digest.update(repr([(lo - start, hi - start) for lo, hi in spans[tag]]).encode())
+            key = digest.digest()
+            offsets = cache.get(key)
+            found = None
+            if offsets is not None:
+                cache.move_to_end(key)
+                found = [(i, rules[i].pattern.match(content, start + offset,
+                                                    len(content) if stop is None
+                                                    else start + stop))
+                         for i, offset, stop in offsets]
+                if not all(match for _, match in found):
+                    found = None
+            if found is None:
+                found = list(scanner.iter_matches(content, scanner.local_tags,
+                                                  start, section.end, spans))
+                ends = {tag: [hi for _, hi in tag_spans] for tag, tag_spans in spans.items()}
+                stops = []
+                for i, match in found:
+                    tag_ends = ends.get(rules[i].tag)
+                    stops.append(None if tag_ends is None else
+                                 tag_ends[bisect.bisect_right(tag_ends, match.start())] - start)
+                cache[key] = tuple((i, m.start() - start, stop)
+                                   for (i, m), stop in zip(found, stops))
+                if len(cache) > self.SECTION_CACHE_SIZE:
+                    cache.popitem(last=False)
+
+            for i, match in found:
+                if rules[i].first_only:
+                    if i in seen_first:
+                        continue
+                    seen_first.add(i)
+                matches.append((i, match))
+
+        return scanner.group(matches)
+
+    def check_g_vectors(self, content: str, lines: List[str],
+                        index: Optional[LineIndex] = None,
+                        hits: Optional[ScanHits] = None) -> ValidationResult:
         """Validate G-vector syntax and components"""
-        matches = list(re.finditer(self.G_VECTOR_PATTERN, content))
+        if index is None:
+            index = LineIndex(content)
+        if hits is None:
+            hits = self.scanner.scan(content, ('g_vector',))
+        vectors = [(index.line_of(m.start()), m.group(1)) for m in hits['g_vector']['G']]
+        return self._g_vector_result(vectors)
+
+    def _g_vector_result(self, vectors: List[Tuple[int, str]]) -> ValidationResult:
+        """Score G-vectors given as (line number, text inside the brackets)"""
         suggestions = []
         line_numbers = []
 
-        if not matches:
+        if not vectors:
             return ValidationResult(
                 check_name="G-Vector Syntax",
                 passed=False,
@@ -160,12 +2623,8 @@ class ChapterValidator:
             )
 
         valid_count = 0
-        for match in matches:
-            vector_content = match.group(1)
+        for line_num, vector_content in vectors:
             components = [c.strip() for c in vector_content.split(',')]
-
-            # Find line number
-            line_num = content[:match.start()].count('\n') + 1
             line_numbers.append(line_num)
 
             # Should have 6 components
@@ -177,45 +2636,59 @@ class ChapterValidator:
                 continue
 
             # Validate each component
-            component_valid = True
-            for i, (comp_name, valid_values) in enumerate(self.VALID_COMPONENTS.items()):
-                if i < len(components):
-                    comp_value = components[i]
-                    if not any(re.match(vv, comp_value) for vv in valid_values):
-                        suggestions.append(
-                            f"Line {line_num}: Invalid {comp_name} value: '{comp_value}'"
-                        )
-                        component_valid = False
-
-            if component_valid:
+            invalid = self.rule_table.invalid_components(components)
+            for comp_name, comp_value in invalid:
+                suggestions.append(
+                    f"Line {line_num}: Invalid {comp_name} value: '{comp_value}'"
+                )
+
+            if not invalid:
                 valid_count += 1
 
         # Scoring: 10 points max, proportional to valid vectors
-        score = min(10, (valid_count / max(len(matches), 1)) * 10)
+        score = min(10, (valid_count / max(len(vectors), 1)) * 10)
 
         return ValidationResult(
             check_name="G-Vector Syntax",
             passed=valid_count > 0,
             score=int(score),
             max_score=10,
-            details=f"Found {len(matches)} G-vectors, {valid_count} valid",
+            details=f"Found {len(vectors)} G-vectors, {valid_count} valid",
             suggestions=suggestions,
             line_numbers=line_numbers
         )
 
-    def check_mode_matrix(self, content: str, lines: List[str]) -> ValidationResult:
+    def check_mode_matrix(self, content: str, lines: List[str],
+                          index: Optional[LineIndex] = None,
+                          hits: Optional[ScanHits] = None) -> ValidationResult:
         """Check for complete mode matrix (all 4 modes)"""
+        if index is None:
+            index = LineIndex(content)
+        if hits is None:
+            hits = self.scanner.scan(content, ('mode',))
         found_modes = {}
-        suggestions = []
+        untriggered = set()
 
         for mode in self.REQUIRED_MODES:
-            pattern = re.compile(rf'\b{mode}\s+(Mode|mode)\b', re.IGNORECASE)
-            matches = list(pattern.finditer(content))
+            matches = hits['mode'][mode]
             if matches:
-                line_num = content[:matches[0].start()].count('\n') + 1
+                line_num = index.line_of(matches[0].start())
                 found_modes[mode] = line_num
 
-        missing_modes = set(self.REQUIRED_MODES) - set(found_modes.keys())
+                # Look for entry/exit triggers near the mode definition
+                context_start = max(0, line_num - 5)
+                context_end = min(len(lines), line_num + 20)
+                context = '\n'.join(lines[context_start:context_end]).lower()
+                if 'entry' not in context and 'trigger' not in context:
+                    untriggered.add(mode)
+
+        return self._mode_matrix_result(found_modes, untriggered)
+
+    def _mode_matrix_result(self, found_modes: Dict[str, int],
+                            untriggered: Set[str]) -> ValidationResult:
+        """Score modes given their first line and those lacking triggers"""
+        suggestions = []
+        missing_modes = [m for m in self.REQUIRED_MODES if m not in found_modes]
 
         if missing_modes:
             suggestions.append(
@@ -225,12 +2698,7 @@ class ChapterValidator:
 
         # Check mode completeness (entry/exit triggers)
         for mode, line_num in found_modes.items():
-            # Look for entry/exit triggers near the mode definition
-            context_start = max(0, line_num - 5)
-            context_end = min(len(lines), line_num + 20)
-            context = '\n'.join(lines[context_start:context_end])
-
-            if 'entry' not in context.lower() and 'trigger' not in context.lower():
+            if mode in untriggered:
                 suggestions.append(
                     f"{mode} mode (line {line_num}): Missing entry/exit triggers"
                 )
@@ -248,22 +2716,24 @@ class ChapterValidator:
             line_numbers=list(found_modes.values())
         )
 
-    def check_evidence_properties(self, content: str, lines: List[str]) -> ValidationResult:
+    def check_evidence_properties(self, content: str, lines: List[str],
+                                  index: Optional[LineIndex] = None,
+                                  hits: Optional[ScanHits] = None) -> ValidationResult:
         """Check for evidence lifecycle properties"""
-        found_properties = defaultdict(list)
-        suggestions = []
-
+        if index is None:
+            index = LineIndex(content)
+        if hits is None:
+            hits = self.scanner.scan(content, ('evidence_property', 'evidence_section'))
+        found_properties = {}
         for prop in self.EVIDENCE_PROPERTIES:
-            pattern = re.compile(rf'\b{prop}\b\s*:', re.IGNORECASE)
-            for match in pattern.finditer(content):
-                line_num = content[:match.start()].count('\n') + 1
-                found_properties[prop].append(line_num)
+            matches = hits['evidence_property'][prop]
+            if matches:
+                found_properties[prop] = index.line_of(matches[0].start())
 
         # Check if evidence sections have all properties
-        evidence_sections = re.finditer(r'##.*Evidence', content, re.IGNORECASE)
-
-        for section_match in evidence_sections:
-            section_line = content[:section_match.start()].count('\n') + 1
+        sections = []
+        for section_match in hits['evidence_section']['Evidence']:
+            section_line = index.line_of(section_match.start())
 
             # Look at next 50 lines for properties
             section_end = content.find('\n##', section_match.end())
@@ -272,11 +2742,17 @@ class ChapterValidator:
 
             section_content = content[section_match.start():section_end]
 
-            missing_props = []
-            for prop in self.EVIDENCE_PROPERTIES:
-                if prop not in section_content:
-                    missing_props.append(prop)
+            missing_props = [p for p in self.EVIDENCE_PROPERTIES if p not in section_content]
+            sections.append((section_line, missing_props))
+
+        return self._evidence_result(found_properties, sections)
 
+    def _evidence_result(self, found_properties: Dict[str, int],
+                         sections: List[Tuple[int, List[str]]]) -> ValidationResult:
+        """Score evidence properties given their first line and each
+        evidence section's (line number, missing properties)"""
+        suggestions = []
+        for section_line, missing_props in sections:
             if missing_props:
                 suggestions.append(
                     f"Evidence section at line {section_line} missing properties: "
@@ -295,28 +2771,35 @@ class ChapterValidator:
             max_score=10,
             details=f"Found {found_props}/{total_props} evidence properties",
             suggestions=suggestions,
-            line_numbers=[ln[0] for ln in found_properties.values() if ln]
+            line_numbers=list(found_properties.values())
         )
 
-    def check_sacred_diagrams(self, content: str, lines: List[str]) -> ValidationResult:
+    def check_sacred_diagrams(self, content: str, lines: List[str],
+                              index: Optional[LineIndex] = None,
+                              hits: Optional[ScanHits] = None) -> ValidationResult:
         """Check for sacred diagrams"""
+        if index is None:
+            index = LineIndex(content)
+        if hits is None:
+            hits = self.scanner.scan(content, ('sacred_diagram',))
         found_diagrams = {}
-        suggestions = []
-
         for diagram in self.SACRED_DIAGRAMS:
-            pattern = re.compile(re.escape(diagram), re.IGNORECASE)
-            matches = list(pattern.finditer(content))
+            matches = hits['sacred_diagram'][diagram]
             if matches:
-                line_num = content[:matches[0].start()].count('\n') + 1
-                found_diagrams[diagram] = line_num
+                found_diagrams[diagram] = index.line_of(matches[0].start())
+
+        return self._sacred_diagram_result(found_diagrams)
 
+    def _sacred_diagram_result(self, found_diagrams: Dict[str, int]) -> ValidationResult:
+        """Score sacred diagrams given their first line"""
+        suggestions = []
         if len(found_diagrams) < 2:
             suggestions.append(
                 f"Only {len(found_diagrams)} sacred diagrams found. "
                 "Chapters should include at least 2 of the 5 sacred diagrams."
             )
-            missing = set(self.SACRED_DIAGRAMS) - set(found_diagrams.keys())
-            suggestions.append(f"Consider adding: {', '.join(list(missing)[:2])}")
+            missing = [d for d in self.SACRED_DIAGRAMS if d not in found_diagrams]
+            suggestions.append(f"Consider adding: {', '.join(missing[:2])}")
 
         # Scoring: 5 points max (1 per diagram, max 5)
         score = min(5, len(found_diagrams))
@@ -331,20 +2814,37 @@ class ChapterValidator:
             line_numbers=list(found_diagrams.values())
         )
 
-    def check_transfer_tests(self, content: str, lines: List[str]) -> ValidationResult:
+    def check_transfer_tests(self, content: str, lines: List[str],
+                             index: Optional[LineIndex] = None,
+                             hits: Optional[ScanHits] = None) -> ValidationResult:
         """Check for transfer tests (Near, Medium, Far)"""
-        test_types = ['Near', 'Medium', 'Far']
+        if index is None:
+            index = LineIndex(content)
+        if hits is None:
+            hits = self.scanner.scan(content, ('transfer_test',))
         found_tests = {}
-        suggestions = []
+        brief = set()
 
-        for test_type in test_types:
-            pattern = re.compile(rf'\b{test_type}\b.*Test', re.IGNORECASE)
-            matches = list(pattern.finditer(content))
+        for test_type in self.TRANSFER_TESTS:
+            matches = hits['transfer_test'][test_type]
             if matches:
-                line_num = content[:matches[0].start()].count('\n') + 1
+                line_num = index.line_of(matches[0].start())
                 found_tests[test_type] = line_num
 
-        missing_tests = set(test_types) - set(found_tests.keys())
+                # Check if tests are substantive (>100 chars context)
+                context_start = max(0, line_num - 1)
+                context_end = min(len(lines), line_num + 10)
+                if len('\n'.join(lines[context_start:context_end])) < 100:
+                    brief.add(test_type)
+
+        return self._transfer_test_result(found_tests, brief)
+
+    def _transfer_test_result(self, found_tests: Dict[str, int],
+                              brief: Set[str]) -> ValidationResult:
+        """Score transfer tests given their first line and the brief ones"""
+        test_types = self.TRANSFER_TESTS
+        suggestions = []
+        missing_tests = [t for t in test_types if t not in found_tests]
 
         if missing_tests:
             suggestions.append(
@@ -352,13 +2852,8 @@ class ChapterValidator:
                 "Chapters should have 3 tests at increasing distance."
             )
 
-        # Check if tests are substantive (>100 chars context)
         for test_type, line_num in found_tests.items():
-            context_start = max(0, line_num - 1)
-            context_end = min(len(lines), line_num + 10)
-            test_content = '\n'.join(lines[context_start:context_end])
-
-            if len(test_content) < 100:
+            if test_type in brief:
                 suggestions.append(
                     f"{test_type} test (line {line_num}) seems too brief. "
                     "Tests should include problem statement and expected insights."
@@ -377,28 +2872,22 @@ class ChapterValidator:
             line_numbers=list(found_tests.values())
         )
 
-    def check_context_capsules(self, content: str, lines: List[str]) -> ValidationResult:
+    def check_context_capsules(self, content: str, lines: List[str],
+                               index: Optional[LineIndex] = None,
+                               hits: Optional[ScanHits] = None,
+                               capsules: Optional[List[Capsule]] = None) -> ValidationResult:
         """Check for context capsules with required fields"""
-        # Look for capsule-like structures
-        capsule_pattern = re.compile(
-            r'\{[^}]*?invariant:[^}]*?evidence:[^}]*?\}',
-            re.IGNORECASE | re.DOTALL
-        )
+        if capsules is None:
+            capsules = parse_capsules(content)
+        return self._capsule_result([(capsule.line, capsule.missing(self.CAPSULE_FIELDS))
+                                     for capsule in capsules])
 
-        capsules = list(capsule_pattern.finditer(content))
-        required_fields = ['invariant', 'evidence', 'boundary', 'mode', 'fallback']
+    def _capsule_result(self, capsules: List[Tuple[int, List[str]]]) -> ValidationResult:
+        """Score capsules given as (line number, missing fields)"""
         suggestions = []
         complete_capsules = 0
 
-        for capsule_match in capsules:
-            capsule_text = capsule_match.group(0)
-            line_num = content[:capsule_match.start()].count('\n') + 1
-
-            missing_fields = []
-            for field in required_fields:
-                if field not in capsule_text.lower():
-                    missing_fields.append(field)
-
+        for line_num, missing_fields in capsules:
             if not missing_fields:
                 complete_capsules += 1
             else:
@@ -424,20 +2913,28 @@ class ChapterValidator:
             max_score=10,
             details=f"Found {len(capsules)} capsules, {complete_capsules} complete",
             suggestions=suggestions,
-            line_numbers=[content[:m.start()].count('\n') + 1 for m in capsules]
+            line_numbers=[line_num for line_num, _ in capsules]
         )
 
-    def check_composition_operators(self, content: str, lines: List[str]) -> ValidationResult:
+    def check_composition_operators(self, content: str, lines: List[str],
+                                    index: Optional[LineIndex] = None,
+                                    hits: Optional[ScanHits] = None) -> ValidationResult:
         """Check for composition operators"""
-        found_operators = defaultdict(list)
-        suggestions = []
-
+        if index is None:
+            index = LineIndex(content)
+        if hits is None:
+            hits = self.scan_hits(content, ('operator',))
+        found_operators = {}
         for op_symbol, op_name in self.COMPOSITION_OPERATORS.items():
-            pattern = re.compile(re.escape(op_symbol))
-            for match in pattern.finditer(content):
-                line_num = content[:match.start()].count('\n') + 1
-                found_operators[op_name].append(line_num)
+            matches = hits['operator'][op_symbol]
+            if matches:
+                found_operators[op_name] = index.line_of(matches[0].start())
+
+        return self._operator_result(found_operators)
 
+    def _operator_result(self, found_operators: Dict[str, int]) -> ValidationResult:
+        """Score composition operators given the first line of each type"""
+        suggestions = []
         if not found_operators:
             suggestions.append(
                 "No composition operators found (▷, ||, ↑, ⤓). "
@@ -445,7 +2942,7 @@ class ChapterValidator:
             )
 
         # Check for explicit downgrades
-        if 'downgrade' not in found_operators or not found_operators['downgrade']:
+        if 'downgrade' not in found_operators:
             suggestions.append(
                 "No explicit downgrades (⤓) found. When guarantees weaken, mark with ⤓."
             )
@@ -460,38 +2957,46 @@ class ChapterValidator:
             max_score=10,
             details=f"Found {len(found_operators)} operator types",
             suggestions=suggestions,
-            line_numbers=[ln[0] for ln in found_operators.values() if ln]
+            line_numbers=list(found_operators.values())
         )
 
-    def check_invariant_mapping(self, content: str, lines: List[str]) -> ValidationResult:
+    def check_invariant_mapping(self, content: str, lines: List[str],
+                                index: Optional[LineIndex] = None,
+                                hits: Optional[ScanHits] = None) -> ValidationResult:
         """Check for invariant catalog mapping"""
-        all_invariants = (
+        if index is None:
+            index = LineIndex(content)
+        if hits is None:
+            hits = self.scan_hits(content, ('invariant', 'primary_invariant'))
+        found_invariants = {}
+        for invariant in self.all_invariants():
+            matches = hits['invariant'][invariant]
+            if matches:
+                found_invariants[invariant] = index.line_of(matches[0].start())
+
+        # Look for "Primary invariant" or "Invariant:" declarations
+        has_primary = bool(hits['primary_invariant']['primary'])
+        return self._invariant_result(found_invariants, has_primary)
+
+    def all_invariants(self) -> List[str]:
+        """Fundamental, derived and composite invariants in catalog order"""
+        return (
             self.FUNDAMENTAL_INVARIANTS +
             self.DERIVED_INVARIANTS +
             self.COMPOSITE_INVARIANTS
         )
 
-        found_invariants = {}
+    def _invariant_result(self, found_invariants: Dict[str, int],
+                          has_primary: bool) -> ValidationResult:
+        """Score invariants given their first line and the primary declaration"""
         suggestions = []
-
-        for invariant in all_invariants:
-            pattern = re.compile(rf'\b{invariant}\b', re.IGNORECASE)
-            matches = list(pattern.finditer(content))
-            if matches:
-                line_num = content[:matches[0].start()].count('\n') + 1
-                found_invariants[invariant] = line_num
-
         if not found_invariants:
             suggestions.append(
                 "No catalog invariants referenced. Map chapter to at least one "
                 "primary invariant from the catalog."
             )
 
-        # Look for "Primary invariant" or "Invariant:" declarations
-        primary_pattern = re.compile(r'Primary\s+invariant:\s*(\w+)', re.IGNORECASE)
-        primary_match = primary_pattern.search(content)
-
-        if not primary_match:
+        if not has_primary:
             suggestions.append(
                 "No explicit primary invariant declared. "
                 "Add 'Primary invariant: <Name>' statement."
@@ -510,42 +3015,51 @@ class ChapterValidator:
             line_numbers=list(found_invariants.values())
         )
 
-    def check_spiral_narrative(self, content: str, lines: List[str]) -> ValidationResult:
+    def check_spiral_narrative(self, content: str, lines: List[str],
+                               index: Optional[LineIndex] = None,
+                               hits: Optional[ScanHits] = None) -> ValidationResult:
         """Check for 3-pass spiral structure"""
-        passes = {
-            'Pass 1': r'(Part 1|Pass 1|INTUITION|Intuition)',
-            'Pass 2': r'(Part 2|Pass 2|UNDERSTANDING|Understanding)',
-            'Pass 3': r'(Part 3|Pass 3|MASTERY|Mastery)'
-        }
-
+        if index is None:
+            index = LineIndex(content)
+        if hits is None:
+            hits = self.scanner.scan(content, ('spiral_pass',))
         found_passes = {}
-        suggestions = []
-
-        for pass_name, pattern in passes.items():
-            regex = re.compile(pattern, re.IGNORECASE)
-            matches = list(regex.finditer(content))
+        for pass_name in self.SPIRAL_PASSES:
+            matches = hits['spiral_pass'][pass_name]
             if matches:
-                line_num = content[:matches[0].start()].count('\n') + 1
-                found_passes[pass_name] = line_num
-
-        missing_passes = set(passes.keys()) - set(found_passes.keys())
-
-        if missing_passes:
-            suggestions.append(
-                f"Missing spiral passes: {', '.join(missing_passes)}. "
-                "Chapters should have 3-pass structure: Intuition → Understanding → Mastery."
-            )
+                found_passes[pass_name] = index.line_of(matches[0].start())
 
         # Check if passes are substantive (>300 words each)
+        word_counts = {}
         for pass_name, line_num in found_passes.items():
             next_pass_line = len(lines)
             for other_pass, other_line in found_passes.items():
                 if other_line > line_num:
                     next_pass_line = min(next_pass_line, other_line)
 
-            pass_content = '\n'.join(lines[line_num:next_pass_line])
-            word_count = len(pass_content.split())
+            if isinstance(lines, LazyLines):
+                word_counts[pass_name] = lines.word_count(line_num, next_pass_line)
+            else:
+                pass_content = '\n'.join(lines[line_num:next_pass_line])
+                word_counts[pass_name] = len(pass_content.split())
+
+        return self._spiral_result(found_passes, word_counts)
 
+    def _spiral_result(self, found_passes: Dict[str, int],
+                       word_counts: Dict[str, int]) -> ValidationResult:
+        """Score spiral passes given their first line and word count"""
+        passes = self.SPIRAL_PASSES
+        suggestions = []
+        missing_passes = [p for p in passes if p not in found_passes]
+
+        if missing_passes:
+            suggestions.append(
+                f"Missing spiral passes: {', '.join(missing_passes)}. "
+                "Chapters should have 3-pass structure: Intuition → Understanding → Mastery."
+            )
+
+        for pass_name, line_num in found_passes.items():
+            word_count = word_counts[pass_name]
             if word_count < 300:
                 suggestions.append(
                     f"{pass_name} (line {line_num}) is too short ({word_count} words). "
@@ -565,63 +3079,124 @@ class ChapterValidator:
             line_numbers=list(found_passes.values())
         )
 
-    def check_cross_references(self, content: str, lines: List[str]) -> ValidationResult:
+    def check_cross_references(self, content: str, lines: List[str],
+                               index: Optional[LineIndex] = None,
+                               hits: Optional[ScanHits] = None) -> ValidationResult:
         """Check for cross-references to other chapters"""
-        backward_pattern = re.compile(
-            r'(Chapter [1-9]|from Chapter|as we saw in|in Chapter [1-9])',
-            re.IGNORECASE
-        )
-        forward_pattern = re.compile(
-            r"(we'll explore|will explore|in Chapter [1-9][0-9]?|future chapter)",
-            re.IGNORECASE
+        if index is None:
+            index = LineIndex(content)
+        if hits is None:
+            hits = self.scan_hits(content, ('cross_reference',))
+        backward_refs = hits['cross_reference']['backward']
+        forward_refs = hits['cross_reference']['forward']
+        return self._cross_reference_result(
+            len(backward_refs), [index.line_of(m.start()) for m in backward_refs[:3]],
+            len(forward_refs), [index.line_of(m.start()) for m in forward_refs[:2]]
         )
 
-        backward_refs = list(backward_pattern.finditer(content))
-        forward_refs = list(forward_pattern.finditer(content))
-
+    def _cross_reference_result(self, backward: int, backward_lines: List[int],
+                                forward: int, forward_lines: List[int]) -> ValidationResult:
+        """Score reference counts, keeping the first 3 backward and 2 forward lines"""
         suggestions = []
 
-        if len(backward_refs) < 2:
+        if backward < 2:
             suggestions.append(
-                f"Only {len(backward_refs)} backward references found. "
+                f"Only {backward} backward references found. "
                 "Include at least 2 references to prior chapters to reinforce concepts."
             )
 
-        if len(forward_refs) < 1:
+        if forward < 1:
             suggestions.append(
                 "No forward references found. "
                 "Set up at least one future concept to create continuity."
             )
 
         # Scoring: 10 points max (5 for backward, 5 for forward)
-        backward_score = min(5, len(backward_refs) * 2.5)
-        forward_score = min(5, len(forward_refs) * 5)
+        backward_score = min(5, backward * 2.5)
+        forward_score = min(5, forward * 5)
         score = backward_score + forward_score
 
         return ValidationResult(
             check_name="Cross-References",
-            passed=len(backward_refs) >= 2 and len(forward_refs) >= 1,
+            passed=backward >= 2 and forward >= 1,
             score=int(score),
             max_score=10,
-            details=f"{len(backward_refs)} backward, {len(forward_refs)} forward",
+            details=f"{backward} backward, {forward} forward",
             suggestions=suggestions,
-            line_numbers=(
-                [content[:m.start()].count('\n') + 1 for m in backward_refs[:3]] +
-                [content[:m.start()].count('\n') + 1 for m in forward_refs[:2]]
+            line_numbers=backward_lines + forward_lines
+        )
+
+    def check_reference_resolution(self, content: str, lines: List[str],
+                                   index: Optional[LineIndex] = None,
+                                   hits: Optional[ScanHits] = None,
+                                   chapter_path: str = '') -> ValidationResult:
+        """Resolve links and "Chapter N" mentions against the link index"""
+        links = self.link_index
+        path = links.relative(chapter_path) if chapter_path else None
+        page = links.pages.get(path)
+        # Text validated from memory (validate_text, the daemon's buffers) may
+        # differ from the indexed file; its own links and headings count then
+        text = content[0:len(content)]
+        if page is None or page.digest != _text_digest(text):
+            page = links.extract(path or '', text)
+        own_chapter = links.chapter_for(path, chapter_path)
+
+        # Relative links can only be resolved from inside the docs directory
+        dangling_links = []
+        if path is not None:
+            dangling_links = [(line, target) for target, line in page.links
+                              if not links.resolves(path, target, page)]
+        dangling_mentions = [(line, chapter) for chapter, line in page.mentions
+                             if chapter not in links.chapters]
+        orphaned = path is not None and links.is_orphan(path)
+        return self._reference_resolution_result(
+            len(page.links), len(page.mentions), dangling_links, dangling_mentions,
+            own_chapter, orphaned
+        )
+
+    def _reference_resolution_result(self, link_count: int, mention_count: int,
+                                     dangling_links: List[Tuple[int, str]],
+                                     dangling_mentions: List[Tuple[int, int]],
+                                     own_chapter: Optional[int],
+                                     orphaned: bool) -> ValidationResult:
+        """Score unresolved (line, target) links and (line, chapter) mentions"""
+        suggestions = []
+        for line_num, target in dangling_links:
+            suggestions.append(f"Line {line_num}: Link target '{target}' does not exist")
+        for line_num, chapter in dangling_mentions:
+            if own_chapter is None:
+                direction = ''
+            else:
+                direction = 'forward ' if chapter > own_chapter else 'backward '
+            suggestions.append(
+                f"Line {line_num}: Dangling {direction}reference to Chapter {chapter}, "
+                "which is not in the book"
             )
+        if orphaned:
+            suggestions.append(
+                "Page is orphaned: add it to the nav in mkdocs.yml or link to it from another chapter"
+            )
+
+        dangling = len(dangling_links) + len(dangling_mentions)
+        # Scoring: 10 points max, 2 off per dangling reference, 5 off if orphaned
+        score = max(0, 10 - 2 * dangling - (5 if orphaned else 0))
+
+        return ValidationResult(
+            check_name="Reference Resolution",
+            passed=dangling == 0 and not orphaned,
+            score=score,
+            max_score=10,
+            details=(f"{link_count} links, {mention_count} chapter mentions, "
+                     f"{dangling} dangling" + (", orphaned" if orphaned else "")),
+            suggestions=suggestions,
+            line_numbers=sorted(line for line, _ in dangling_links + dangling_mentions)
         )
 
     def calculate_grade(self, percentage: float, results: List[ValidationResult]) -> Tuple[str, str]:
         """Calculate letter grade and status"""
         # Check critical dimensions
-        critical_checks = {
-            'Invariant Mapping': 7,
-            'Evidence Properties': 7,
-            'G-Vector Syntax': 5
-        }
-
         critical_failure = False
-        for check_name, min_score in critical_checks.items():
+        for check_name, min_score in self.CRITICAL_CHECKS.items():
             result = next((r for r in results if r.check_name == check_name), None)
             if result and result.score < min_score:
                 critical_failure = True
@@ -646,6 +3221,499 @@ class ChapterValidator:
         return grade, status
 
 
+class StreamingValidator:
+    """Validate arbitrarily large input in bounded memory
+
+    Input is read in chunks and cut into segments just before a line that
+    starts with '#', falling back to a plain line break inside very long
+    sections (a single line is never split, so memory is bounded by the
+    chunk size or the longest line). Line-bound rules cannot cross such a
+    cut, so they are scanned per segment exactly. G-vectors and capsules may continue past a cut and
+    are matched against the segment plus at most overlap characters of the
+    text that follows; longer constructs are not recognised. The capsule
+    parser carries its fence and YAML state from one segment to the next, and
+    the Markdown tokenizer its open fence or admonition. Each check keeps
+    only the state its score needs and reuses the validator's scoring, so
+    results match validate_chapter for everything within those bounds.
+    """
+
+    CHUNK_SIZE = 1 << 20
+    OVERLAP = 1 << 16
+
+    def __init__(self, validator: ChapterValidator, chunk_size: int = CHUNK_SIZE,
+                 overlap: int = OVERLAP):
+        self.validator = validator
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+
+    def validate_chapter(self, filepath: Path) -> ChapterValidation:
+        with open(filepath, encoding='utf-8') as stream:
+            return self.validate_stream(stream, str(filepath))
+
+    def validate_stream(self, stream, chapter_path: str) -> ChapterValidation:
+        """Validate text read incrementally from a file-like object"""
+        state = _StreamState(self.validator)
+        buffer = ''
+        eof = False
+        wanted = self.chunk_size
+
+        while True:
+            while not eof and len(buffer) < wanted + self.overlap:
+                data = stream.read(self.chunk_size)
+                eof = not data
+                buffer += data
+            cut = self._cut(buffer, eof)
+            if cut is None or (not eof and len(buffer) < cut + self.overlap):
+                wanted = max(wanted, cut or 0) + self.chunk_size
+                continue
+            wanted = self.chunk_size
+            final = eof and cut == len(buffer)
+            state.feed(buffer[:cut], buffer[cut:cut + self.overlap], final,
+                       eof and cut + self.overlap >= len(buffer))
+            buffer = buffer[cut:]
+            if final:
+                break
+
+        return state.finish(chapter_path)
+
+    def _cut(self, buffer: str, eof: bool) -> Optional[int]:
+        """End of the next segment, or None if more input is needed"""
+        if eof and len(buffer) <= self.chunk_size:
+            return len(buffer)
+        heading = buffer.rfind('\n#', 0, self.chunk_size)
+        if heading > 0:
+            return heading + 1
+        newline = buffer.rfind('\n', 0, self.chunk_size)
+        if newline < 0:
+            newline = buffer.find('\n', self.chunk_size)
+        if newline >= 0:
+            return newline + 1
+        return len(buffer) if eof else None
+
+
+class _StreamState:
+    """Per-document check state for StreamingValidator"""
+
+    # Lines before/after a mode for triggers, lines from a transfer test
+    MODE_CONTEXT = (4, 20)
+    TEST_CONTEXT = 10
+
+    def __init__(self, validator: ChapterValidator):
+        self.validator = validator
+        self.scanner = validator.scanner
+        self.offset = 0
+        self.line = 1
+        self.words = 0
+        self.total_lines = 0
+        self.tail = []
+        self.span_end = defaultdict(int)
+
+        self.vectors = []
+        self.capsules = []
+        self.capsule_parser = CapsuleParser()
+        self.capsule_end = 0
+        self.tokenizer = MarkdownTokenizer()
+        self.tag_regions = validator.tag_regions(self.scanner.local_tags)
+        self.first = defaultdict(dict)
+        self.untriggered = set()
+        self.brief = set()
+        self.pending = []
+        self.pass_words = {}
+        self.sections = []
+        self.open_sections = []
+        self.references = {'backward': [0, []], 'forward': [0, []]}
+
+    def feed(self, segment: str, lookahead: str, final: bool, complete: bool = False):
+        """Take the next segment; complete says lookahead runs to the end of input"""
+        scanner = self.scanner
+        index = LineIndex(segment)
+        base = self.line - 1
+        lines = segment.split('\n')
+        if not final:
+            lines.pop()
+
+        spans = self.validator.region_spans(self.tag_regions, self.tokenizer.feed(segment))
+        hits = scanner.group(scanner.iter_matches(segment, scanner.local_tags, spans=spans))
+        window = segment + lookahead
+        for tag in scanner.spanning_tags:
+            start = max(0, self.span_end[tag] - self.offset)
+            found = []
+            for i, match in scanner.iter_matches(window, (tag,), start):
+                if match.start() >= len(segment):
+                    break
+                found.append((i, match))
+                self.span_end[tag] = self.offset + match.end()
+            hits.update(scanner.group(found))
+
+        def line_of(match):
+            return base + index.line_of(match.start())
+
+        for match in hits['g_vector']['G']:
+            self.vectors.append((line_of(match), match.group(1)))
+        # Resume points must fall on line starts, where fences are recognised
+        parser = self.capsule_parser
+        text = window if complete else window[:max(len(segment), window.rfind('\n') + 1)]
+        resume = parser.feed(text, max(0, self.capsule_end - self.offset), len(segment),
+                             final, self.line, self.offset)
+        self.capsule_end = self.offset + resume
+        self.capsules.extend(parser.capsules)
+        parser.capsules = []
+
+        for tag in ('mode', 'evidence_property', 'sacred_diagram', 'transfer_test',
+                    'operator', 'invariant', 'primary_invariant', 'spiral_pass'):
+            first = self.first[tag]
+            for key, matches in hits[tag].items():
+                if matches and key not in first:
+                    line_num = line_of(matches[0])
+                    first[key] = line_num
+                    if tag == 'mode':
+                        lo, hi = self.MODE_CONTEXT
+                        self.pending.append(['mode', key, max(1, line_num - lo),
+                                             line_num + hi, False])
+                    elif tag == 'transfer_test':
+                        self.pending.append(['test', key, line_num,
+                                             line_num + self.TEST_CONTEXT, -1])
+                    elif tag == 'spiral_pass':
+                        self.pass_words[line_num] = None
+
+        for key, count_limit in (('backward', 3), ('forward', 2)):
+            matches = hits['cross_reference'][key]
+            count, first_lines = self.references[key]
+            first_lines.extend(line_of(m) for m in matches[:count_limit - len(first_lines)])
+            self.references[key][0] = count + len(matches)
+
+        self._feed_sections(segment, hits['evidence_section']['Evidence'], line_of)
+        self._feed_lines(lines, final)
+
+        self.offset += len(segment)
+        self.line += segment.count('\n')
+
+    def _feed_sections(self, segment: str, matches, line_of):
+        """Track evidence sections, which run until the next '\\n##'"""
+        props = self.validator.EVIDENCE_PROPERTIES
+        if self.open_sections:
+            end = 0 if segment.startswith('##') else segment.find('\n##')
+            text = segment if end == -1 else segment[:end]
+            for _, seen in self.open_sections:
+                seen.update(p for p in props if p in text)
+            if end != -1:
+                self._close_sections()
+
+        for match in matches:
+            end = segment.find('\n##', match.end())
+            text = segment[match.start():] if end == -1 else segment[match.start():end]
+            self.open_sections.append((line_of(match), {p for p in props if p in text}))
+            if end != -1:
+                self._close_sections()
+
+    def _close_sections(self):
+        props = self.validator.EVIDENCE_PROPERTIES
+        for line_num, seen in self.open_sections:
+            self.sections.append((line_num, [p for p in props if p not in seen]))
+        self.open_sections = []
+
+    def _feed_lines(self, lines: List[str], final: bool):
+        """Resolve line-window queries and word counts for this segment"""
+        first_line = self.line
+        last_line = first_line + len(lines) - 1
+
+        for line_num in sorted(self.pass_words):
+            if self.pass_words[line_num] is None and line_num <= last_line:
+                upto = lines[:line_num - first_line + 1]
+                self.pass_words[line_num] = self.words + sum(len(ln.split()) for ln in upto)
+
+        still_pending = []
+        for query in self.pending:
+            kind, key, lo, hi, acc = query
+            for line_num in range(max(lo, first_line - len(self.tail)), min(hi, last_line) + 1):
+                if line_num >= first_line:
+                    text = lines[line_num - first_line]
+                else:
+                    text = self.tail[line_num - first_line]
+                if kind == 'mode':
+                    lowered = text.lower()
+                    acc = acc or 'entry' in lowered or 'trigger' in lowered
+                else:
+                    acc += len(text) + 1
+            query[2] = max(lo, last_line + 1)
+            query[4] = acc
+            if hi > last_line and not final:
+                still_pending.append(query)
+            elif kind == 'mode' and not acc:
+                self.untriggered.add(key)
+            elif kind == 'test' and acc < 100:
+                self.brief.add(key)
+        self.pending = still_pending
+
+        self.words += sum(len(ln.split()) for ln in lines)
+        self.tail = (self.tail + lines)[-self.MODE_CONTEXT[0]:]
+        self.total_lines = last_line
+
+    def finish(self, chapter_path: str) -> ChapterValidation:
+        validator = self.validator
+        self._close_sections()
+        self.capsules.sort(key=lambda capsule: capsule.start)
+
+        def ordered(tag, vocabulary):
+            return {k: self.first[tag][k] for k in vocabulary if k in self.first[tag]}
+
+        operators = {validator.COMPOSITION_OPERATORS[k]: line_num
+                     for k, line_num in ordered('operator', validator.COMPOSITION_OPERATORS).items()}
+        found_passes = ordered('spiral_pass', validator.SPIRAL_PASSES)
+        word_counts = {}
+        for pass_name, line_num in found_passes.items():
+            later = [other for other in found_passes.values() if other > line_num]
+            end_words = self.pass_words[min(later)] if later else self.words
+            word_counts[pass_name] = end_words - self.pass_words[line_num]
+
+        results = [
+            validator._g_vector_result(self.vectors),
+            validator._mode_matrix_result(ordered('mode', validator.REQUIRED_MODES),
+                                          self.untriggered),
+            validator._evidence_result(ordered('evidence_property', validator.EVIDENCE_PROPERTIES),
+                                       self.sections),
+            validator._sacred_diagram_result(ordered('sacred_diagram', validator.SACRED_DIAGRAMS)),
+            validator._transfer_test_result(ordered('transfer_test', validator.TRANSFER_TESTS),
+                                            self.brief),
+            validator._capsule_result([(capsule.line, capsule.missing(validator.CAPSULE_FIELDS))
+                                       for capsule in self.capsules]),
+            validator._operator_result(operators),
+            validator._invariant_result(ordered('invariant', validator.all_invariants()),
+                                        bool(self.first['primary_invariant'])),
+            validator._spiral_result(found_passes, word_counts),
+            validator._cross_reference_result(*self.references['backward'],
+                                              *self.references['forward']),
+        ]
+        selected = {spec.name for spec in validator.checks}
+        return validator.summarize(chapter_path,
+                                   [r for r in results if r.check_name in selected])
+
+
+# Files read ahead of validation in single-process runs, and the threads
+# reading them
+PREFETCH_DEPTH = 8
+PREFETCH_THREADS = 4
+
+
+def prefetch_texts(filepaths: List[Path], depth: int = PREFETCH_DEPTH):
+    """Yield (filepath, text) in order while a thread pool reads ahead
+
+    At most depth files are read ahead of the one being consumed. A file
+    that cannot be read raises its error when its turn comes.
+    """
+    # Imported here so runs that never prefetch skip the import
+    from concurrent.futures import ThreadPoolExecutor
+
+    executor = ThreadPoolExecutor(max_workers=min(depth, PREFETCH_THREADS))
+    try:
+        pending = deque()
+        for filepath in filepaths:
+            pending.append((filepath, executor.submit(filepath.read_text, encoding='utf-8')))
+            if len(pending) > depth:
+                path, future = pending.popleft()
+                yield path, future.result()
+        while pending:
+            path, future = pending.popleft()
+            yield path, future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class OutputStage:
+    """Runs output actions on a background thread, in submission order
+
+    The queue between the two is bounded, so a slow reader of the output
+    holds back validation instead of letting formatted output pile up.
+    The first error an action raises stops the rest and is re-raised,
+    once, by the next submit() or by close().
+    """
+
+    DEPTH = 32
+
+    def __init__(self, depth: int = DEPTH):
+        # Imported here so the module loads without them
+        import queue
+        import threading
+        self._queue = queue.Queue(maxsize=depth)
+        self._error: Optional[BaseException] = None
+        self._raised = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is None:
+                func, args, kwargs = item
+                try:
+                    func(*args, **kwargs)
+                except BaseException as e:
+                    self._error = e
+
+    def submit(self, func: Callable, *args, **kwargs):
+        """Queue func(*args, **kwargs), waiting while the queue is full"""
+        if self._error is not None:
+            self._raised = True
+            raise self._error
+        self._queue.put((func, args, kwargs))
+
+    def close(self):
+        """Run what is queued, stop the thread and raise any error"""
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None and not self._raised:
+            self._raised = True
+            raise self._error
+
+
+# Per-process validator for pool workers, built once by the initializer
+_worker_validator: Optional[ChapterValidator] = None
+
+
+def _init_worker(cls: type, options: Dict, cache_dir: Optional[Path]):
+    global _worker_validator
+    cache = ResultCache(cache_dir) if cache_dir is not None else None
+    _worker_validator = cls(cache=cache, **options)
+
+
+def _validate_in_worker(filepath: Path) -> ChapterValidation:
+    return _worker_validator.validate_chapter(filepath)
+
+
+def iter_validations(validator: ChapterValidator, filepaths: List[Path],
+                     jobs: int = 1, ordered: bool = True):
+    """Yield validations for filepaths, optionally across processes
+
+    With ordered False, parallel runs yield each validation as soon as it
+    finishes rather than in the order of filepaths. Single-process runs
+    that read whole files read them ahead on a thread pool, so the CPU
+    does not wait on the disk.
+    """
+    if jobs <= 1 or len(filepaths) <= 1:
+        # Streaming and memory-mapped runs do their own reading
+        if (len(filepaths) <= 1 or validator.stream
+                or (validator.mapped and not validator.incremental)):
+            for filepath in filepaths:
+                yield validator.validate_chapter(filepath)
+            return
+        for filepath, content in prefetch_texts(filepaths):
+            yield validator.validate_text(content, str(filepath))
+        return
+
+    # Imported here so single-process runs skip the multiprocessing import
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    workers = min(jobs, len(filepaths))
+    validator.warm()
+    cache_dir = validator.cache.cache_dir if validator.cache is not None else None
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(type(validator), validator.worker_options(),
+                                       cache_dir)) as executor:
+        if ordered:
+            yield from executor.map(_validate_in_worker, filepaths)
+            return
+        # as_completed lets go of each future once yielded
+        for future in as_completed({executor.submit(_validate_in_worker, filepath)
+                                    for filepath in filepaths}):
+            yield future.result()
+
+
+def _validate_text_in_worker(name: str, text: str) -> ChapterValidation:
+    return _worker_validator.validate_text(text, name)
+
+
+# Built by the first validate_text()/validate_many() call without a validator
+_default_validator: Optional[ChapterValidator] = None
+
+
+def default_validator() -> ChapterValidator:
+    """The validator the module-level API uses unless it is given one"""
+    global _default_validator
+    if _default_validator is None:
+        _default_validator = ChapterValidator()
+    return _default_validator
+
+
+def validate_text(text: str, name: str = '<text>',
+                  validator: Optional[ChapterValidator] = None) -> ChapterValidation:
+    """Validate chapter text held in memory; name becomes its chapter_path
+
+    Nothing is read from or written to disk unless validator has a result
+    cache. Repeated calls share one validator and its compiled rules.
+    """
+    return (validator or default_validator()).validate_text(text, name)
+
+
+def validate_many(chapters: Iterable[Tuple[str, str]], jobs: int = 1,
+                  validator: Optional[ChapterValidator] = None,
+                  ordered: bool = True) -> Iterator[ChapterValidation]:
+    """Yield a validation for each (name, text) pair, lazily
+
+    chapters may be a generator: it is consumed only as far as results
+    are wanted, plus a few pairs in flight, so a large batch streams
+    through in bounded memory. With jobs above 1 the texts are validated
+    in that many worker processes, each rebuilding validator (or the
+    default one) as iter_validations() does; with ordered False results
+    come back as they finish rather than in input order.
+    """
+    validator = validator or default_validator()
+    if jobs <= 1:
+        for name, text in chapters:
+            yield validator.validate_text(text, name)
+        return
+
+    # Imported here so single-process runs skip the multiprocessing import
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+    validator.warm()
+    cache_dir = validator.cache.cache_dir if validator.cache is not None else None
+    window = jobs * 4
+    pending = iter(chapters)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(type(validator), validator.worker_options(),
+                                       cache_dir)) as executor:
+        # Executor.map would submit the whole iterable up front; instead
+        # at most window texts are pickled and waiting at any time
+        in_flight = deque()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(in_flight) < window:
+                    item = next(pending, None)
+                    if item is None:
+                        exhausted = True
+                    else:
+                        in_flight.append(executor.submit(_validate_text_in_worker, *item))
+                if not in_flight:
+                    return
+                if ordered:
+                    yield in_flight.popleft().result()
+                    continue
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    in_flight.remove(future)
+                    yield future.result()
+        finally:
+            # A caller that stops early does not wait for texts it never asked about
+            for future in in_flight:
+                future.cancel()
+
+
+def write_json_array(stream, validations):
+    """Write validations as an indented JSON array, one chapter at a time
+
+    The output is the same as json.dumps([v.to_dict() ...], indent=2).
+    """
+    first = True
+    for validation in validations:
+        item = json.dumps(validation.to_dict(), indent=2).replace('\n', '\n  ')
+        stream.write(('[\n  ' if first else ',\n  ') + item)
+        first = False
+    stream.write('[]' if first else '\n]')
+
+
 def format_console_output(validation: ChapterValidation, verbose: bool = False) -> str:
     """Format validation results for console"""
     output = []
@@ -677,15 +3745,42 @@ def format_console_output(validation: ChapterValidation, verbose: bool = False)
     return '\n'.join(output)
 
 
-def format_html_output(validation: ChapterValidation) -> str:
-    """Format validation results as HTML"""
-    html = ['''
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>Chapter Validation Report</title>
-    <style>
+def format_profile(validations: List[ChapterValidation], slowest: int = 5) -> str:
+    """Per-check cost summed over files, then the slowest files"""
+    profiled = [v for v in validations if v.profile]
+    if not profiled:
+        return "No profile data"
+
+    totals = OrderedDict()
+    for validation in profiled:
+        for p in validation.profile:
+            entry = totals.setdefault(p.check_name, [0.0, 0, 0])
+            entry[0] += p.seconds
+            entry[1] += p.matches
+            entry[2] += p.bytes_scanned
+    overall = sum(entry[0] for entry in totals.values()) or 1.0
+
+    output = [f"\n{'='*70}", f"Profile ({len(profiled)} files)", f"{'='*70}",
+              f"{'Check':<30} {'ms':>10} {'share':>7} {'matches':>9} {'KB':>10}"]
+    for name, (seconds, matches, size) in totals.items():
+        output.append(f"{name:<30} {seconds * 1000:>10.1f} {seconds / overall:>7.1%} "
+                      f"{matches:>9} {size / 1024:>10.1f}")
+
+    output.append(f"\nSlowest files:")
+    by_time = sorted(profiled, key=lambda v: -sum(p.seconds for p in v.profile))
+    for validation in by_time[:slowest]:
+        seconds = sum(p.seconds for p in validation.profile)
+        # The first entry is the shared scan; every check may have been skipped
+        worst = max(validation.profile[1:], key=lambda p: p.seconds, default=None)
+        line = f"  {seconds * 1000:>8.1f} ms  {validation.chapter_path}"
+        if worst is not None:
+            line += f" (slowest check: {worst.check_name})"
+        output.append(line)
+    return '\n'.join(output)
+
+
+# One stylesheet for the single-chapter report and the dashboard
+HTML_STYLE = """
         body { font-family: Arial, sans-serif; margin: 20px; }
         h1 { color: #333; }
         .summary { background: #f5f5f5; padding: 15px; border-radius: 5px; margin: 20px 0; }
@@ -701,24 +3796,17 @@ def format_html_output(validation: ChapterValidation) -> str:
         .grade-C { background-color: #fff3cd; }
         .grade-D { background-color: #f8d7da; }
         .grade-F { background-color: #f5c6cb; }
-    </style>
-</head>
-<body>
-''']
+        th[data-dir] { cursor: pointer; user-select: none; }
+        th[data-dir="asc"]::after { content: " ▲"; }
+        th[data-dir="desc"]::after { content: " ▼"; }
+        tr.chapter { cursor: pointer; }
+        tr.detail > td { background: #fff; padding: 0 20px; }
+"""
 
-    html.append(f'<h1>Chapter Validation Report</h1>')
-    html.append(f'<p><strong>Chapter:</strong> {validation.chapter_path}</p>')
 
-    grade_class = f'grade-{validation.grade}'
-    html.append(f'<div class="summary {grade_class}">')
-    html.append(f'<h2>Summary</h2>')
-    html.append(f'<p><strong>Score:</strong> {validation.total_score}/{validation.max_score} '
-                f'({validation.percentage:.1f}%)</p>')
-    html.append(f'<p><strong>Grade:</strong> {validation.grade}</p>')
-    html.append(f'<p><strong>Status:</strong> {validation.status}</p>')
-    html.append('</div>')
-
-    html.append('<h2>Detailed Results</h2>')
+def _html_details(validation: ChapterValidation) -> List[str]:
+    """The results table, and the profile table if any, for one chapter"""
+    html = ['<h2>Detailed Results</h2>']
     html.append('<table>')
     html.append('<tr><th>Check</th><th>Score</th><th>Status</th><th>Details</th></tr>')
 
@@ -727,36 +3815,976 @@ def format_html_output(validation: ChapterValidation) -> str:
         status_text = '✓ Pass' if result.passed else '✗ Fail'
 
         html.append(f'<tr>')
-        html.append(f'<td>{result.check_name}</td>')
+        html.append(f'<td>{escape(result.check_name)}</td>')
         html.append(f'<td>{result.score}/{result.max_score}</td>')
         html.append(f'<td class="{status_class}">{status_text}</td>')
-        html.append(f'<td>{result.details}')
+        html.append(f'<td>{escape(result.details)}')
 
         if result.suggestions:
             html.append('<ul class="suggestions">')
             for suggestion in result.suggestions:
-                html.append(f'<li>{suggestion}</li>')
+                html.append(f'<li>{escape(suggestion)}</li>')
             html.append('</ul>')
 
         html.append('</td>')
         html.append('</tr>')
 
     html.append('</table>')
+
+    if validation.profile:
+        html.append('<h2>Profile</h2>')
+        html.append('<table>')
+        html.append('<tr><th>Check</th><th>Time (ms)</th><th>Matches</th><th>Bytes</th></tr>')
+        for p in validation.profile:
+            html.append(f'<tr><td>{escape(p.check_name)}</td><td>{p.seconds * 1000:.2f}</td>'
+                        f'<td>{p.matches}</td><td>{p.bytes_scanned}</td></tr>')
+        html.append('</table>')
+    return html
+
+
+def format_html_output(validation: ChapterValidation) -> str:
+    """Format validation results as HTML"""
+    html = [f'''
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>Chapter Validation Report</title>
+    <style>{HTML_STYLE}    </style>
+</head>
+<body>
+''']
+
+    html.append(f'<h1>Chapter Validation Report</h1>')
+    html.append(f'<p><strong>Chapter:</strong> {escape(validation.chapter_path)}</p>')
+
+    grade_class = f'grade-{validation.grade}'
+    html.append(f'<div class="summary {grade_class}">')
+    html.append(f'<h2>Summary</h2>')
+    html.append(f'<p><strong>Score:</strong> {validation.total_score}/{validation.max_score} '
+                f'({validation.percentage:.1f}%)</p>')
+    html.append(f'<p><strong>Grade:</strong> {validation.grade}</p>')
+    html.append(f'<p><strong>Status:</strong> {escape(validation.status)}</p>')
+    html.append('</div>')
+
+    html.extend(_html_details(validation))
     html.append('</body>')
     html.append('</html>')
 
     return '\n'.join(html)
 
 
+# Sorts the summary table by the clicked column, and shows a chapter's
+# details (kept in an inert <template> until then) when its row is clicked
+_DASHBOARD_SCRIPT = """
+<script>
+(function () {
+  var table = document.getElementById('chapters');
+  var body = table.tBodies[0];
+  Array.prototype.forEach.call(table.tHead.rows[0].cells, function (th, col) {
+    th.addEventListener('click', function () {
+      var dir = th.dataset.dir === 'asc' ? -1 : 1;
+      Array.prototype.forEach.call(table.tHead.rows[0].cells, function (other) {
+        other.dataset.dir = '';
+      });
+      th.dataset.dir = dir === 1 ? 'asc' : 'desc';
+      body.querySelectorAll('tr.detail').forEach(function (row) { row.remove(); });
+      var rows = Array.prototype.slice.call(body.querySelectorAll('tr.chapter'));
+      rows.sort(function (a, b) {
+        var x = a.cells[col].dataset.sort, y = b.cells[col].dataset.sort;
+        var nx = parseFloat(x), ny = parseFloat(y);
+        return dir * (isNaN(nx) || isNaN(ny) ? x.localeCompare(y) : nx - ny);
+      });
+      rows.forEach(function (row) { body.appendChild(row); });
+    });
+  });
+  body.addEventListener('click', function (event) {
+    var row = event.target.closest('tr.chapter');
+    if (!row) return;
+    var next = row.nextElementSibling;
+    if (next && next.classList.contains('detail')) { next.remove(); return; }
+    var detail = document.createElement('tr');
+    detail.className = 'detail';
+    var cell = detail.insertCell();
+    cell.colSpan = row.cells.length;
+    cell.appendChild(document.getElementById(row.dataset.detail).content.cloneNode(true));
+    row.after(detail);
+  });
+})();
+</script>
+"""
+
+
+class HtmlDashboard:
+    """One HTML report for a multi-chapter run, written as results arrive
+
+    The page has a single head and stylesheet, and a summary table with a
+    row per chapter: its score, grade, status and the score of every
+    check. Clicking a column header sorts the table. Each chapter's
+    details sit in a <template>, which the browser keeps inert until the
+    row is clicked, so large runs stay quick to load. Only running totals
+    are kept in memory.
+    """
+
+    def __init__(self, stream, check_names: List[str]):
+        self.stream = stream
+        self.check_names = list(check_names)
+        self.count = 0
+        self.total_percentage = 0.0
+        self.grades = defaultdict(int)
+        headers = ''.join(f'<th data-dir="">{escape(name)}</th>'
+                          for name in ['Chapter', 'Score', 'Grade', 'Status'] + self.check_names)
+        stream.write(f'''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>Chapter Validation Dashboard</title>
+    <style>{HTML_STYLE}    </style>
+</head>
+<body>
+<h1>Chapter Validation Dashboard</h1>
+<p>Click a column to sort, and a chapter to show its details.</p>
+<table id="chapters">
+<thead><tr>{headers}</tr></thead>
+<tbody>
+''')
+
+    def add(self, validation: ChapterValidation):
+        """Append a chapter's row and its details"""
+        n = self.count
+        self.count += 1
+        self.total_percentage += validation.percentage
+        self.grades[validation.grade] += 1
+
+        by_name = {result.check_name: result for result in validation.results}
+        path = escape(validation.chapter_path)
+        cells = [f'<td data-sort="{path}">{path}</td>',
+                 f'<td data-sort="{validation.percentage:.1f}">'
+                 f'{validation.total_score}/{validation.max_score} '
+                 f'({validation.percentage:.1f}%)</td>',
+                 f'<td data-sort="{escape(validation.grade)}">{escape(validation.grade)}</td>',
+                 f'<td data-sort="{escape(validation.status)}">{escape(validation.status)}</td>']
+        for name in self.check_names:
+            result = by_name.get(name)
+            if result is None:
+                cells.append('<td data-sort="">–</td>')
+            else:
+                status_class = 'pass' if result.passed else 'fail'
+                cells.append(f'<td data-sort="{result.score}" class="{status_class}">'
+                             f'{result.score}/{result.max_score}</td>')
+        self.stream.write(
+            f'<tr class="chapter grade-{escape(validation.grade)}" data-detail="detail-{n}">'
+            f'{"".join(cells)}</tr>\n'
+            f'<template id="detail-{n}">\n{chr(10).join(_html_details(validation))}\n'
+            f'</template>\n')
+
+    def close(self):
+        """Finish the page with totals and the table's script"""
+        average = self.total_percentage / self.count if self.count else 0.0
+        grades = ', '.join(f'{grade}: {self.grades[grade]}' for grade in sorted(self.grades))
+        self.stream.write(f'''</tbody>
+</table>
+<div class="summary">
+<p><strong>Chapters:</strong> {self.count}</p>
+<p><strong>Average Score:</strong> {average:.1f}%</p>
+<p><strong>Grades:</strong> {escape(grades) or '–'}</p>
+</div>
+{_DASHBOARD_SCRIPT}</body>
+</html>
+''')
+
+
+class BuildValidation:
+    """Validates pages as a MkDocs build hands over their markdown
+
+    Driven by the hooks in site/hooks/chapter_validation.py: start() at
+    the beginning of each build, page_markdown() for every page (given the
+    text MkDocs has already read, so nothing is read from disk again) and
+    finish() at the end. Results come from the validator's result cache
+    when a page's content is unchanged since an earlier build. finish()
+    writes the aggregated report, if one is configured, and returns the
+    pages graded below min_grade.
+
+    Pages only need file.src_path, and file.abs_src_path when there is
+    one, so a stub stands in for mkdocs.structure.pages.Page in tests.
+    """
+
+    GRADES = 'ABCDF'
+
+    def __init__(self, validator: ChapterValidator, min_grade: Optional[str] = None,
+                 report: Optional[Path] = None):
+        if min_grade is not None and min_grade not in self.GRADES:
+            raise ValueError(f"min_grade must be one of {', '.join(self.GRADES)}, "
+                             f"not {min_grade!r}")
+        self.validator = validator
+        self.min_grade = min_grade
+        self.report = Path(report) if report else None
+        self.validations = ResultStore()
+
+    def start(self):
+        """Forget the previous build's results (mkdocs serve rebuilds)"""
+        self.validations = ResultStore()
+
+    def page_markdown(self, markdown: str, page) -> ChapterValidation:
+        """Validate one page's markdown and keep the result for the report"""
+        path = getattr(page.file, 'abs_src_path', None) or page.file.src_path
+        validation = self.validator.validate_text(markdown, str(path))
+        self.validations.append(validation)
+        return validation
+
+    def failures(self) -> List[int]:
+        """Indices of the validations graded below min_grade"""
+        if self.min_grade is None:
+            return []
+        limit = self.GRADES.index(self.min_grade)
+        return [i for i in range(len(self.validations))
+                if self.GRADES.index(self.validations.grade(i)) > limit]
+
+    def summary(self) -> str:
+        """One line: page count, average score and grade counts"""
+        count = len(self.validations)
+        if not count:
+            return 'Validated 0 pages'
+        grades = defaultdict(int)
+        for i in range(count):
+            grades[self.validations.grade(i)] += 1
+        average = sum(self.validations.percentages) / count
+        return (f"Validated {count} pages, average {average:.1f}% "
+                f"({', '.join(f'{g}: {grades[g]}' for g in self.GRADES if grades[g])})")
+
+    def finish(self) -> List[str]:
+        """Write the report and return 'path grade' for each failing page"""
+        if self.report is not None:
+            self.report.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.report, 'w', encoding='utf-8') as stream:
+                if self.report.suffix == '.json':
+                    write_json_array(stream, self.validations)
+                elif self.report.suffix == '.jsonl':
+                    self.validations.write_jsonl(stream)
+                else:
+                    dashboard = HtmlDashboard(
+                        stream, [spec.name for spec in self.validator.checks])
+                    for validation in self.validations:
+                        dashboard.add(validation)
+                    dashboard.close()
+        return [f"{self.validations.chapter_path(i)} "
+                f"{self.validations.percentages[i]:.1f}% ({self.validations.grade(i)})"
+                for i in self.failures()]
+
+
+@dataclass
+class CorpusPage:
+    """A markdown file found by discover_corpus(), with its chapter"""
+    path: Path
+    relative: str
+    chapter: Optional[int]
+    in_nav: bool
+
+
+_DOCS_DIR = re.compile(r'''^docs_dir:\s*['"]?([^'"#\n]*?)['"]?\s*(?:#.*)?$''', re.MULTILINE)
+
+
+def read_mkdocs_config(config_path: Path) -> Tuple[Path, List[Tuple[Optional[int], str]]]:
+    """docs_dir (default docs, beside the config) and nav of a mkdocs.yml"""
+    config_path = Path(config_path)
+    text = config_path.read_text(encoding='utf-8')
+    match = _DOCS_DIR.search(text)
+    docs_dir = config_path.parent / (match.group(1) if match and match.group(1) else 'docs')
+    return docs_dir, parse_nav(text)
+
+
+def _fnmatch_any(patterns: Optional[List[str]]) -> Optional[Callable[[str], bool]]:
+    """One compiled test for a list of fnmatch patterns, or None if there are none"""
+    if not patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(p) for p in patterns)).match
+
+
+def discover_corpus(root: Path, nav: List[Tuple[Optional[int], str]] = (),
+                    include: Optional[List[str]] = None,
+                    exclude: Optional[List[str]] = None) -> List[CorpusPage]:
+    """Markdown files under root, in book order and grouped by chapter
+
+    One os.scandir walk finds them. include and exclude are fnmatch
+    patterns tested against the path relative to root; a directory that
+    matches an exclude pattern is not entered, and dot-files are skipped
+    as MkDocs skips them. Pages listed in nav come first, in nav order,
+    each under the chapter of its nav section. Other pages follow the last
+    nav page of their chapter (taken from a chapter-NN name, as LinkIndex
+    does), and pages of no listed chapter come last, by chapter and path.
+    """
+    included = _fnmatch_any(include)
+    excluded = _fnmatch_any(exclude)
+    found = {}
+    pending = [(Path(root), '')]
+    while pending:
+        directory, prefix = pending.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            relative = prefix + entry.name
+            if entry.name.startswith('.') or (excluded and excluded(relative)):
+                continue
+            if entry.is_dir():
+                pending.append((directory / entry.name, relative + '/'))
+            elif (entry.name.endswith('.md') and (included is None or included(relative))
+                  and entry.is_file()):
+                found[relative] = directory / entry.name
+
+    position = {}
+    last_of_chapter = {}
+    for i, (chapter, page) in enumerate(nav):
+        if './' in page or '//' in page:
+            page = posixpath.normpath(page)
+        if page in found and page not in position:
+            position[page] = (i, chapter)
+            if chapter is not None:
+                last_of_chapter[chapter] = i
+
+    keyed = []
+    for relative, path in found.items():
+        if relative in position:
+            i, chapter = position[relative]
+            key = (i, 0, '')
+        else:
+            number = _CHAPTER_NAME.match(relative)
+            chapter = int(number.group(1)) if number else None
+            if chapter in last_of_chapter:
+                key = (last_of_chapter[chapter], 1, relative)
+            else:
+                key = (len(nav), float('inf') if chapter is None else chapter, relative)
+        keyed.append((key, CorpusPage(path, relative, chapter, relative in position)))
+    keyed.sort(key=lambda item: item[0])
+    return [page for _, page in keyed]
+
+
+def chapter_scores(validations: ResultStore, chapters: Dict[str, Optional[int]],
+                   order: Optional[List[int]] = None
+                   ) -> List[Tuple[Optional[int], List[int], float]]:
+    """(chapter, validation indices, aggregate percentage) per chapter
+
+    chapters maps a chapter_path to its chapter number; chapters appear in
+    the order of their first page, taking the validations in order (their
+    indices) if given. The aggregate is the chapter's total
+    score over its total maximum, so each page weighs by its maximum
+    score; pages of no chapter are grouped under None.
+    """
+    groups = OrderedDict()
+    for i in (order if order is not None else range(len(validations))):
+        chapter = chapters.get(validations.chapter_path(i))
+        groups.setdefault(chapter, []).append(i)
+    scores = []
+    for chapter, indices in groups.items():
+        maximum = sum(validations.maxima[i] for i in indices)
+        total = sum(validations.totals[i] for i in indices)
+        scores.append((chapter, indices, total / maximum * 100 if maximum else 0.0))
+    return scores
+
+
+def expand_watch_targets(targets: List[Path]) -> List[Path]:
+    """Resolve watched files, directories (all *.md below) and glob patterns"""
+    found = {}
+    for target in targets:
+        pattern = str(target)
+        if glob.has_magic(pattern):
+            paths = [Path(p) for p in glob.glob(pattern, recursive=True)]
+        elif target.is_dir():
+            paths = list(target.rglob('*.md'))
+        else:
+            paths = [target]
+        for path in sorted(paths):
+            found.setdefault(path, None)
+    return list(found)
+
+
+def _stat_paths(paths: List[Path]) -> Dict[Path, Tuple[int, int]]:
+    stamps = {}
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        if not S_ISDIR(st.st_mode):
+            stamps[path] = (st.st_mtime_ns, st.st_size)
+    return stamps
+
+
+def format_score_diff(previous: Optional[ChapterValidation],
+                      validation: ChapterValidation) -> str:
+    """One-line status plus the per-check score changes since previous"""
+    symbol = '✓' if 'PASS' in validation.status else '✗'
+    output = [f"{time.strftime('%H:%M:%S')} {symbol} {validation.chapter_path} "
+              f"{validation.percentage:.1f}% ({validation.grade})"]
+    if previous is None:
+        return output[0]
+
+    delta = validation.percentage - previous.percentage
+    if previous.grade != validation.grade:
+        output[0] += f" [{delta:+.1f}%, was {previous.grade}]"
+    elif delta:
+        output[0] += f" [{delta:+.1f}%]"
+
+    before = {r.check_name: r for r in previous.results}
+    for result in validation.results:
+        old = before.get(result.check_name)
+        if old is None or old.score != result.score:
+            old_score = old.score if old is not None else 0
+            output.append(
+                f"  {result.check_name:.<30} {old_score} → {result.score}/{result.max_score} "
+                f"({result.score - old_score:+d})"
+            )
+    if len(output) == 1:
+        output.append("  (no score changes)")
+    return '\n'.join(output)
+
+
+def watch_chapters(validator: ChapterValidator, targets: List[Path],
+                   interval: float = 0.1, rescan: float = 2.0):
+    """Poll targets and re-validate files whenever they change on disk
+
+    Known files are stat'ed every interval; directories and glob patterns
+    are expanded again only every rescan seconds, so walking them does not
+    dominate a poll and new files show up within rescan.
+    """
+    previous = {}
+    stamps = {}
+    paths = expand_watch_targets(targets)
+    expanded = time.monotonic()
+    print(f"Watching {len(_stat_paths(paths))} files (Ctrl-C to stop)")
+
+    while True:
+        if time.monotonic() - expanded >= rescan:
+            paths = expand_watch_targets(targets)
+            expanded = time.monotonic()
+        current = _stat_paths(paths)
+        if validator.link_index is not None and current != stamps:
+            validator.link_index.update()
+        for path in stamps.keys() - current.keys():
+            previous.pop(path, None)
+            print(f"{time.strftime('%H:%M:%S')} - {path} removed")
+
+        for path, stamp in current.items():
+            if stamps.get(path) == stamp:
+                continue
+            try:
+                validation = validator.validate_chapter(path)
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Error: Cannot validate {path}: {e}", file=sys.stderr)
+                continue
+            print(format_score_diff(previous.get(path), validation), flush=True)
+            previous[path] = validation
+
+        stamps = current
+        time.sleep(interval)
+
+
+class ValidationServer:
+    """Answers validation requests from editors and hooks over a Unix socket
+
+    One JSON object per line in each direction. Requests carry an "op":
+
+        {"op": "validate", "path": "chapter-02/index.md"}
+        {"op": "validate_text", "path": "chapter-02/index.md", "text": "..."}
+        {"op": "result", "path": "chapter-02/index.md"}
+        {"op": "ping"}
+
+    and an optional "id" that is echoed back. Replies are {"ok": true,
+    "result": ...} or {"ok": false, "error": "..."}; "result" replies also
+    say whether the file is still as it was validated ("fresh").
+
+    Every client shares one warm validator, so rules are compiled once and
+    the section and result caches carry over between requests. Requests
+    are validated one at a time on the event loop, which keeps the caches
+    single-threaded; connections are served concurrently around them.
+    """
+
+    # Longest request line accepted (a text buffer travels in one line)
+    MAX_REQUEST = 64 * 2 ** 20
+
+    def __init__(self, validator: ChapterValidator):
+        self.validator = validator
+        # Latest result per path, with the file stamp it was computed from
+        self.results: Dict[str, Tuple[Optional[Tuple[int, int]], ChapterValidation]] = {}
+
+    @staticmethod
+    def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _refresh_links(self):
+        """Update the link index; results computed against the old one are dropped"""
+        if self.validator.link_index is not None and self.validator.link_index.update():
+            self.results.clear()
+
+    def handle(self, request: Dict) -> Dict:
+        """Reply to one decoded request"""
+        op = request.get('op')
+        if op == 'ping':
+            return {'ok': True, 'result': 'pong'}
+        if op not in ('validate', 'validate_text', 'result'):
+            return {'ok': False, 'error': f'Unknown op: {op!r}'}
+        path = request.get('path')
+        if not isinstance(path, str):
+            if op == 'validate_text':
+                path = '<text>'
+            else:
+                return {'ok': False, 'error': f"{op!r} needs a 'path'"}
+
+        if op == 'validate':
+            self._refresh_links()
+            filepath = Path(path)
+            stamp = self._stamp(filepath)
+            if stamp is None:
+                return {'ok': False, 'error': f'File not found: {path}'}
+            entry = self.results.get(path)
+            if entry is not None and entry[0] == stamp:
+                return {'ok': True, 'result': entry[1].to_dict()}
+            try:
+                validation = self.validator.validate_chapter(filepath)
+            except (OSError, UnicodeDecodeError) as e:
+                return {'ok': False, 'error': f'Cannot validate {path}: {e}'}
+            self.results[path] = (stamp, validation)
+            return {'ok': True, 'result': validation.to_dict()}
+
+        if op == 'validate_text':
+            text = request.get('text')
+            if not isinstance(text, str):
+                return {'ok': False, 'error': "'validate_text' needs a 'text'"}
+            self._refresh_links()
+            validation = self.validator.validate_text(text, path)
+            # Matches the file only if the buffer was saved unchanged
+            self.results[path] = (None, validation)
+            return {'ok': True, 'result': validation.to_dict()}
+
+        entry = self.results.get(path)
+        if entry is None:
+            return {'ok': True, 'result': None, 'fresh': False}
+        stamp, validation = entry
+        fresh = stamp is not None and stamp == self._stamp(Path(path))
+        return {'ok': True, 'result': validation.to_dict(), 'fresh': fresh}
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(b'{"ok": false, "error": "Request too long"}\n')
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError('request must be a JSON object')
+                except ValueError as e:
+                    reply = {'ok': False, 'error': f'Bad request: {e}'}
+                else:
+                    reply = self.handle(request)
+                    if 'id' in request:
+                        reply['id'] = request['id']
+                writer.write(json.dumps(reply).encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path: Path, ready: Optional[Callable[[], None]] = None):
+        """Listen on socket_path until cancelled, then remove it"""
+        socket_path = Path(socket_path)
+        if socket_path.exists():
+            # Refuse to take over a socket another daemon is answering on
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(socket_path))
+            except OSError:
+                socket_path.unlink()
+            else:
+                raise OSError(f'{socket_path} is already being served')
+            finally:
+                probe.close()
+        server = await asyncio.start_unix_server(self._client, path=str(socket_path),
+                                                 limit=self.MAX_REQUEST)
+        try:
+            if ready is not None:
+                ready()
+            async with server:
+                await server.serve_forever()
+        finally:
+            try:
+                socket_path.unlink()
+            except OSError:
+                pass
+
+
+def request_daemon(socket_path: Path, request: Dict, timeout: float = 30.0) -> Dict:
+    """Send one request to a --serve daemon and return its reply"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(timeout)
+        conn.connect(str(socket_path))
+        conn.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with conn.makefile('rb') as replies:
+            line = replies.readline()
+    if not line:
+        raise ConnectionError(f'{socket_path} closed the connection')
+    return json.loads(line)
+
+
+# Where --changed-since looks for chapters, relative to the repository root
+CHANGED_SINCE_DIRS = ['site/docs', 'expanded-toc-chapters']
+
+
+def _git(root: Path, *args: str) -> str:
+    """Output of a git command run in root; ValueError if it fails"""
+    # Imported here so runs that never call git skip the import
+    import subprocess
+    try:
+        done = subprocess.run(['git', *args], cwd=root, capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        detail = getattr(e, 'stderr', b'') or b''
+        message = detail.decode('utf-8', 'replace').strip() or str(e)
+        raise ValueError(f"git {' '.join(args)}: {message}")
+    return done.stdout.decode('utf-8', 'surrogateescape')
+
+
+def repository_root() -> Path:
+    """Top directory of the git work tree holding the current directory"""
+    return Path(_git(Path.cwd(), 'rev-parse', '--show-toplevel').strip())
+
+
+def changed_chapters(ref: str, targets: Optional[List[Path]] = None,
+                     link_index: Optional[LinkIndex] = None) -> Tuple[List[Path], List[Path]]:
+    """Markdown under targets changed since ref, and the pages referencing them
+
+    Changes are taken against the merge base of ref and HEAD and include
+    staged, unstaged and untracked files. With a link index, pages whose
+    links or chapter mentions may resolve differently are returned as well
+    (see LinkIndex.dependents); a changed mkdocs.yml affects every page.
+    targets defaults to CHANGED_SINCE_DIRS. Returns (changed files,
+    dependent files), both sorted and relative to the current directory.
+    """
+    root = repository_root()
+    base = _git(root, 'merge-base', ref, 'HEAD').strip()
+    specs = []
+    for target in targets or [root / d for d in CHANGED_SINCE_DIRS]:
+        try:
+            specs.append(Path(target).resolve().relative_to(root).as_posix())
+        except ValueError:
+            raise ValueError(f'{target} is outside the repository at {root}')
+    if link_index is not None:
+        try:
+            specs.append(link_index.config_path.resolve().relative_to(root).as_posix())
+        except ValueError:
+            pass
+
+    # NUL-separated: status, path, and a second path for renames and copies
+    fields = _git(root, 'diff', '--name-status', '-z', '-M', base, '--', *specs).split('\0')
+    touched = {}
+    i = 0
+    while i < len(fields) - 1:
+        status = fields[i][0]
+        if status in 'RC':
+            if status == 'R':
+                touched[fields[i + 1]] = 'D'
+            touched[fields[i + 2]] = 'A'
+            i += 3
+        else:
+            touched[fields[i + 1]] = status
+            i += 2
+    untracked = _git(root, 'ls-files', '--others', '--exclude-standard', '-z', '--', *specs)
+    for path in filter(None, untracked.split('\0')):
+        touched[path] = 'A'
+
+    changed = sorted(Path(os.path.relpath(root / path)) for path, status in touched.items()
+                     if path.endswith('.md') and status != 'D')
+    dependents = []
+    if link_index is not None:
+        pages = {}
+        for path, status in touched.items():
+            page = link_index.relative(root / path)
+            if page is not None and page.endswith('.md'):
+                pages[page] = (path, status)
+        config_changed = any(root / path == link_index.config_path.resolve()
+                             for path in touched)
+        if config_changed:
+            found = set(link_index.pages)
+        else:
+            previous = {}
+            for page, (path, status) in pages.items():
+                if status != 'A':
+                    content = _git(root, 'show', f'{base}:{path}')
+                    previous[page] = LinkIndex.extract(page, content)
+            structural = {page for page, (_, status) in pages.items() if status in 'AD'}
+            found = link_index.dependents(set(pages), structural, previous)
+        own = set(changed)
+        dependents = sorted(path for path in (Path(os.path.relpath(link_index.docs_dir / page))
+                                              for page in found) if path not in own)
+    return changed, dependents
+
+
+class GitObjects:
+    """Commits, trees and blobs read through one `git cat-file --batch`
+
+    Objects are requested one at a time over the same pipe. Trees are
+    parsed once and the markdown files below each are remembered by tree
+    id, so a subdirectory unchanged between commits is not read again.
+    """
+
+    def __init__(self, root: Path):
+        # Imported here so runs that never call git skip the import
+        import subprocess
+        self.process = subprocess.Popen(['git', 'cat-file', '--batch'], cwd=root,
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self._trees: Dict[str, List[Tuple[str, str, str]]] = {}
+        self._markdown: Dict[str, List[Tuple[str, str]]] = {}
+
+    # Requests written ahead of reading the replies; small enough that the
+    # pipe to git never fills while git waits for us to read
+    BATCH = 256
+
+    def read(self, oid: str) -> Tuple[str, bytes]:
+        """(type, content) of an object; KeyError if it is missing"""
+        _, kind, data = next(self.read_many([oid]))
+        if data is None:
+            raise KeyError(oid)
+        return kind, data
+
+    def read_many(self, oids: List[str]):
+        """Yield (object id, type, content) for oids, requesting them in batches
+
+        Type and content are None for a missing object. Every reply of a
+        batch is read before any is yielded, so the pipe stays in step
+        with the requests even if the caller stops early.
+        """
+        for start in range(0, len(oids), self.BATCH):
+            batch = oids[start:start + self.BATCH]
+            self.process.stdin.write(''.join(f'{oid}\n' for oid in batch).encode('ascii'))
+            self.process.stdin.flush()
+            replies = []
+            for oid in batch:
+                # "<oid> <type> <size>", or "<oid> missing" with no content
+                header = self.process.stdout.readline().split()
+                if len(header) != 3:
+                    replies.append((oid, None, None))
+                    continue
+                data = self.process.stdout.read(int(header[2]))
+                self.process.stdout.read(1)
+                replies.append((oid, header[1].decode('ascii'), data))
+            yield from replies
+
+    def tree(self, oid: str) -> List[Tuple[str, str, str]]:
+        """(mode, name, object id) for each entry of a tree"""
+        if oid not in self._trees:
+            _, data = self.read(oid)
+            width = len(oid) // 2
+            entries = []
+            pos = 0
+            while pos < len(data):
+                space = data.index(b' ', pos)
+                nul = data.index(b'\0', space)
+                entries.append((data[pos:space].decode('ascii'),
+                                data[space + 1:nul].decode('utf-8', 'surrogateescape'),
+                                data[nul + 1:nul + 1 + width].hex()))
+                pos = nul + 1 + width
+            self._trees[oid] = entries
+        return self._trees[oid]
+
+    def markdown(self, tree: str) -> List[Tuple[str, str]]:
+        """(path relative to tree, blob id) for every markdown file below it"""
+        if tree not in self._markdown:
+            found = []
+            for mode, name, oid in self.tree(tree):
+                if mode == '40000':
+                    found.extend((f'{name}/{path}', blob) for path, blob in self.markdown(oid))
+                elif mode in ('100644', '100755') and name.endswith('.md'):
+                    found.append((name, oid))
+            self._markdown[tree] = found
+        return self._markdown[tree]
+
+    def commit_files(self, commit: str, prefixes: List[str]) -> List[Tuple[str, str]]:
+        """(path, blob id) for markdown at or below the given paths at commit
+
+        A prefix names a directory, or a single markdown file.
+        """
+        _, data = self.read(commit)
+        root = data.split(b'\n', 1)[0].split()[1].decode('ascii')
+        files = []
+        for prefix in prefixes:
+            *directories, last = prefix.strip('/').split('/')
+            tree = root
+            for part in directories:
+                tree = next((oid for mode, name, oid in self.tree(tree)
+                             if mode == '40000' and name == part), None)
+                if tree is None:
+                    break
+            if tree is None:
+                continue
+            for mode, name, oid in self.tree(tree):
+                if name != last:
+                    continue
+                if mode == '40000':
+                    files.extend((f'{prefix}/{path}', blob) for path, blob in self.markdown(oid))
+                elif mode in ('100644', '100755') and name.endswith('.md'):
+                    files.append((prefix, oid))
+        return files
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+        self.process.stdout.close()
+
+
+class HistoryStore:
+    """Scores over git history, in SQLite
+
+    commits and files record which blob each path had at each commit;
+    scores and check_scores hold one validation per distinct blob and
+    rule-set version, so a file version is validated once however many
+    commits carry it. Indexed by commit, path and check name.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS commits (
+            commit_id TEXT PRIMARY KEY, committed_at INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS files (
+            commit_id TEXT NOT NULL, path TEXT NOT NULL, blob TEXT NOT NULL,
+            PRIMARY KEY (commit_id, path)) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS files_by_path ON files (path, commit_id);
+        CREATE TABLE IF NOT EXISTS scores (
+            blob TEXT NOT NULL, version TEXT NOT NULL, total_score INTEGER,
+            max_score INTEGER, percentage REAL, grade TEXT, status TEXT,
+            PRIMARY KEY (blob, version)) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS check_scores (
+            blob TEXT NOT NULL, version TEXT NOT NULL, check_name TEXT NOT NULL,
+            score INTEGER, max_score INTEGER, passed INTEGER,
+            PRIMARY KEY (blob, version, check_name)) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS check_scores_by_name ON check_scores (check_name);
+    """
+
+    def __init__(self, path: Path):
+        # Imported here so runs without --history skip the import
+        import sqlite3
+        self.connection = sqlite3.connect(str(path))
+        self.connection.executescript(self.SCHEMA)
+
+    def scored_blobs(self, version: str) -> Set[str]:
+        return {row[0] for row in self.connection.execute(
+            'SELECT blob FROM scores WHERE version = ?', (version,))}
+
+    def add_commit(self, commit: str, committed_at: int, files: List[Tuple[str, str]]):
+        """Record a commit's files (uncommitted until commit())"""
+        self.connection.execute('INSERT OR REPLACE INTO commits VALUES (?, ?)',
+                                (commit, committed_at))
+        self.connection.executemany('INSERT OR REPLACE INTO files VALUES (?, ?, ?)',
+                                    [(commit, path, blob) for path, blob in files])
+
+    def add_scores(self, blob: str, version: str, validation: ChapterValidation):
+        """Record a blob's validation (uncommitted until commit())"""
+        self.connection.execute(
+            'INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (blob, version, validation.total_score, validation.max_score,
+             validation.percentage, validation.grade, validation.status))
+        self.connection.executemany(
+            'INSERT OR REPLACE INTO check_scores VALUES (?, ?, ?, ?, ?, ?)',
+            [(blob, version, r.check_name, r.score, r.max_score, int(r.passed))
+             for r in validation.results])
+
+    def commit(self):
+        self.connection.commit()
+
+    def trend(self, path: str, version: str,
+              check_name: Optional[str] = None) -> List[Tuple[str, int, float, str]]:
+        """(commit, committed_at, percentage or check score, grade) for path,
+        oldest first; commits whose version of path failed to validate are left out"""
+        if check_name is None:
+            query = """SELECT f.commit_id, c.committed_at, s.percentage, s.grade
+                       FROM files f JOIN commits c USING (commit_id)
+                       JOIN scores s ON s.blob = f.blob AND s.version = ?
+                       WHERE f.path = ? ORDER BY c.committed_at, f.commit_id"""
+            return self.connection.execute(query, (version, path)).fetchall()
+        query = """SELECT f.commit_id, c.committed_at, k.score, s.grade
+                   FROM files f JOIN commits c USING (commit_id)
+                   JOIN scores s ON s.blob = f.blob AND s.version = ?
+                   JOIN check_scores k ON k.blob = f.blob AND k.version = s.version
+                   WHERE f.path = ? AND k.check_name = ?
+                   ORDER BY c.committed_at, f.commit_id"""
+        return self.connection.execute(query, (version, path, check_name)).fetchall()
+
+    def close(self):
+        self.connection.close()
+
+
+def backfill_history(validator: ChapterValidator, store: HistoryStore, revisions: List[str],
+                     prefixes: Optional[List[str]] = None) -> Dict[str, int]:
+    """Record the scores of markdown under prefixes at every commit in revisions
+
+    Each distinct blob is validated once per rule-set version, so commits
+    already in the store only cost a walk of their changed trees. Returns
+    counts of commits, their file versions, blobs validated and blobs that
+    could not be decoded or are missing from the object store (as in a
+    partial clone).
+    """
+    root = repository_root()
+    prefixes = prefixes or CHANGED_SINCE_DIRS
+    version = validator.cache_version
+    scored = store.scored_blobs(version)
+    counts = {'commits': 0, 'files': 0, 'validated': 0, 'undecodable': 0, 'missing': 0}
+    # Transactions are synced to disk; one per batch of commits keeps that
+    # off the per-file cost while an interrupted run keeps most of its work
+    batch = 50
+
+    commits = []
+    for line in _git(root, 'rev-list', '--reverse', '--timestamp', *revisions, '--').split('\n'):
+        if line:
+            timestamp, commit = line.split()
+            commits.append((commit, int(timestamp)))
+
+    objects = GitObjects(root)
+    try:
+        for commit, committed_at in commits:
+            files = objects.commit_files(commit, prefixes)
+            paths = {}
+            for path, blob in files:
+                if blob not in scored:
+                    paths.setdefault(blob, path)
+            scored.update(paths)
+            for blob, _, data in objects.read_many(list(paths)):
+                if data is None:
+                    counts['missing'] += 1
+                    continue
+                try:
+                    content = data.decode('utf-8')
+                except UnicodeDecodeError:
+                    counts['undecodable'] += 1
+                    continue
+                store.add_scores(blob, version, validator.validate_text(content, paths[blob]))
+                counts['validated'] += 1
+            store.add_commit(commit, committed_at, files)
+            counts['commits'] += 1
+            counts['files'] += len(files)
+            if counts['commits'] % batch == 0:
+                store.commit()
+    finally:
+        store.commit()
+        objects.close()
+    return counts
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Validate chapter files against framework standards'
     )
     parser.add_argument(
         'files',
-        nargs='+',
+        nargs='*',
         type=Path,
-        help='Chapter markdown files to validate'
+        help='Chapter markdown files to validate (with --serve, validated at startup)'
     )
     parser.add_argument(
         '--verbose', '-v',
@@ -765,70 +4793,385 @@ def main():
     )
     parser.add_argument(
         '--format',
-        choices=['console', 'json', 'html'],
+        choices=['console', 'json', 'jsonl', 'html'],
         default='console',
-        help='Output format'
+        help='Output format (jsonl writes one record per chapter as it finishes; '
+             'html writes one sortable dashboard for all chapters)'
     )
     parser.add_argument(
         '--output', '-o',
         type=Path,
-        help='Output file (for json/html formats)'
+        help='Output file (for json/jsonl/html formats; jsonl and html default to stdout)'
     )
     parser.add_argument(
         '--summary',
         action='store_true',
         help='Show summary only (for multiple files)'
     )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Number of worker processes (default: CPU count)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore and do not update the result cache'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        default=default_cache_dir(),
+        help='Result cache directory (default: ~/.cache/chapter_validator)'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Validate in bounded memory, for very large manuscripts (bypasses the cache)'
+    )
+    parser.add_argument(
+        '--mmap',
+        action='store_true',
+        help='Scan memory-mapped file bytes instead of decoded text (same results)'
+    )
+    parser.add_argument(
+        '--links',
+        type=Path,
+        metavar='DOCS_DIR',
+        help='Resolve links and chapter mentions against an index of this MkDocs '
+             'docs directory and its mkdocs.yml (e.g. site/docs)'
+    )
+    parser.add_argument(
+        '--only',
+        action='append',
+        metavar='CHECK',
+        help='Run only this check (repeatable; e.g. g-vectors, mode-matrix)'
+    )
+    parser.add_argument(
+        '--skip',
+        action='append',
+        metavar='CHECK',
+        help='Do not run this check (repeatable)'
+    )
+    parser.add_argument(
+        '--early-exit',
+        action='store_true',
+        help='Stop checking a chapter once its grade can no longer change'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Record time, matches and bytes per check and file (bypasses the cache)'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Re-validate files, directories or quoted globs whenever they change'
+    )
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=0.1,
+        help='Polling interval in seconds for --watch (new files are picked up every 2 s)'
+    )
+    parser.add_argument(
+        '--history',
+        type=Path,
+        metavar='DB',
+        help='Record scores at every commit of --revision into this SQLite database '
+             '(files and directories, if given, replace site/docs and expanded-toc-chapters)'
+    )
+    parser.add_argument(
+        '--revision',
+        action='append',
+        metavar='REV',
+        help='Commits for --history, as git rev-list takes them (repeatable; default HEAD)'
+    )
+    parser.add_argument(
+        '--changed-since',
+        metavar='REF',
+        help='Validate only chapters changed since this git ref, and with --links the '
+             'pages referencing them (files, if given, narrow where to look)'
+    )
+    parser.add_argument(
+        '--corpus',
+        type=Path,
+        metavar='MKDOCS_YML',
+        help='Validate every page of this MkDocs site in nav order, grouped by chapter '
+             '(e.g. site/mkdocs.yml)'
+    )
+    parser.add_argument(
+        '--root',
+        type=Path,
+        metavar='DIR',
+        help='Validate every markdown file under this directory, grouped by chapter'
+    )
+    parser.add_argument(
+        '--include',
+        action='append',
+        metavar='PATTERN',
+        help='With --corpus or --root, only files whose relative path matches this '
+             'glob (repeatable; e.g. "chapter-*/index.md")'
+    )
+    parser.add_argument(
+        '--exclude',
+        action='append',
+        metavar='PATTERN',
+        help='With --corpus or --root, skip files and directories matching this glob '
+             '(repeatable)'
+    )
+    parser.add_argument(
+        '--serve',
+        type=Path,
+        metavar='SOCKET',
+        help='Run as a daemon answering JSON-lines requests on this Unix socket'
+    )
 
     args = parser.parse_args()
-
-    validator = ChapterValidator(verbose=args.verbose)
-    validations = []
-
-    for filepath in args.files:
-        if not filepath.exists():
-            print(f"Error: File not found: {filepath}", file=sys.stderr)
-            continue
-
-        validation = validator.validate_chapter(filepath)
-        validations.append(validation)
-
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    if args.corpus and args.root:
+        parser.error('--corpus and --root cannot be used together')
+    if (args.corpus or args.root) and args.files:
+        parser.error('files cannot be given with --corpus or --root, which find them')
+    if (args.include or args.exclude) and not (args.corpus or args.root):
+        parser.error('--include and --exclude need --corpus or --root')
+    if not (args.files or args.corpus or args.root
+            or args.serve or args.changed_since or args.history):
+        parser.error('the following arguments are required: files')
+    if args.serve and args.watch:
+        parser.error('--serve and --watch cannot be used together')
+
+    if args.history and args.links:
+        parser.error('--history validates past file contents and cannot resolve them with --links')
+    if args.links and args.stream:
+        parser.error('--links needs whole files in memory and cannot be used with --stream')
+    if args.profile and args.stream:
+        parser.error('--profile times the in-memory checks and cannot be used with --stream')
+
+    cache = None if args.no_cache else ResultCache(args.cache_dir)
+    link_index = None
+    if args.links:
+        if not args.links.is_dir():
+            parser.error(f'--links: {args.links} is not a directory')
+        store = None if args.no_cache else LinkIndex.store_for(args.links, args.cache_dir)
+        link_index = LinkIndex(args.links, store_path=store)
+
+    # Discovered files are known to exist, so they are not checked again
+    discovered = False
+    chapters = None
+    if args.corpus or args.root:
+        if args.corpus:
+            try:
+                corpus_root, nav = read_mkdocs_config(args.corpus)
+            except (OSError, UnicodeDecodeError) as e:
+                parser.error(f'--corpus: cannot read {args.corpus}: {e}')
+        else:
+            corpus_root, nav = args.root, []
+        if not corpus_root.is_dir():
+            parser.error(f"{'--corpus' if args.corpus else '--root'}: "
+                         f"{corpus_root} is not a directory")
+        pages = discover_corpus(corpus_root, nav, args.include, args.exclude)
+        args.files = [page.path for page in pages]
+        chapters = {str(page.path): page.chapter for page in pages}
+        discovered = True
+
+    if args.changed_since:
+        try:
+            # Dependents are pages whose links resolve differently, so only
+            # pages validated with --links can have any
+            changed, dependents = changed_chapters(args.changed_since, args.files, link_index)
+        except ValueError as e:
+            parser.error(f'--changed-since: {e}')
+        message = f"{len(changed)} chapters changed since {args.changed_since}"
+        if link_index is not None:
+            message += f", {len(dependents)} more depend on them"
+        print(message, file=sys.stderr)
+        args.files = changed + dependents
+        if chapters is not None:
+            # Keep book order among the changed pages
+            order = {path: i for i, path in enumerate(chapters)}
+            args.files.sort(key=lambda f: order.get(str(f), len(order)))
+        discovered = False
+        if not args.files and not args.serve:
+            sys.exit(0)
+    try:
+        validator = ChapterValidator(verbose=args.verbose, cache=cache,
+                                     incremental=args.watch or bool(args.serve),
+                                     stream=args.stream,
+                                     mapped=args.mmap, link_index=link_index,
+                                     profile=args.profile, only=args.only, skip=args.skip,
+                                     early_exit=args.early_exit)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.history:
+        try:
+            root = repository_root()
+            prefixes = [f.resolve().relative_to(root).as_posix() for f in args.files]
+            store = HistoryStore(args.history)
+            try:
+                counts = backfill_history(validator, store, args.revision or ['HEAD'],
+                                          prefixes)
+            finally:
+                store.close()
+        except ValueError as e:
+            parser.error(f'--history: {e}')
+        print(f"Recorded {counts['commits']} commits ({counts['files']} file versions); "
+              f"validated {counts['validated']} distinct file contents")
+        if counts['undecodable']:
+            print(f"Warning: {counts['undecodable']} file contents are not UTF-8 and were "
+                  f"skipped", file=sys.stderr)
+        if counts['missing']:
+            print(f"Warning: {counts['missing']} file contents are missing from the "
+                  f"repository and were skipped", file=sys.stderr)
+        print(f"History written to: {args.history}")
+        sys.exit(0)
+
+    if args.watch:
+        try:
+            watch_chapters(validator, args.files, args.interval)
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+
+    if args.serve:
+        server = ValidationServer(validator)
+        for filepath in args.files:
+            server.handle({'op': 'validate', 'path': str(filepath)})
+        try:
+            asyncio.run(server.serve(args.serve, ready=lambda: print(
+                f"Serving on {args.serve} (Ctrl-C to stop)", flush=True)))
+        except KeyboardInterrupt:
+            pass
+        except OSError as e:
+            print(f"Error: Cannot serve on {args.serve}: {e}", file=sys.stderr)
+            sys.exit(1)
+        if cache is not None:
+            cache.prune()
+        sys.exit(0)
+
+    # Validations are kept compactly; each object is dropped once stored.
+    # JSON Lines and HTML runs write each chapter as it arrives and keep
+    # only what the summary needs, so their memory does not grow with the
+    # file count.
+    validations = ResultStore()
+    streaming = args.format in ('jsonl', 'html')
+    keep = not streaming or args.summary
+    records = None
+    dashboard = None
+    report = sys.stdout
+    if streaming:
+        records = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+        if records is sys.stdout:
+            report = sys.stderr
+        if args.format == 'html':
+            dashboard = HtmlDashboard(records, [spec.name for spec in validator.checks])
+    validated = 0
+    min_percentage = None
+
+    # Results come back in argument order, so missing-file errors are
+    # reported at the same point in the output as a serial run; JSON Lines
+    # records carry their path and are written in completion order instead
+    existing = args.files if discovered else [f for f in args.files if f.exists()]
+    results = iter_validations(validator, existing, args.jobs,
+                               ordered=args.format != 'jsonl')
+
+    def emit(validation: ChapterValidation):
+        if dashboard is not None:
+            dashboard.add(validation)
+        elif records is not None:
+            records.write(json.dumps(validation.to_dict()) + '\n')
+            records.flush()
         if args.format == 'console' and not args.summary:
             print(format_console_output(validation, args.verbose))
 
+    # Formatting and writing run on their own thread, in order, behind a
+    # bounded queue; errors go through it too so they keep their place
+    output = OutputStage()
+    try:
+        for filepath in args.files:
+            if not discovered and not filepath.exists():
+                output.submit(print, f"Error: File not found: {filepath}", file=sys.stderr)
+                continue
+
+            validation = next(results)
+            validated += 1
+            if min_percentage is None or validation.percentage < min_percentage:
+                min_percentage = validation.percentage
+            if keep:
+                validations.append(validation)
+            output.submit(emit, validation)
+    finally:
+        output.close()
+
+    if dashboard is not None:
+        dashboard.close()
+    if records is not None and records is not sys.stdout:
+        records.close()
+
     # Summary for multiple files
     if args.summary and len(validations) > 1:
-        print(f"\n{'='*70}")
-        print(f"Summary ({len(validations)} chapters)")
-        print(f"{'='*70}")
-        for v in validations:
-            status_symbol = '✓' if 'PASS' in v.status else '✗'
-            print(f"{status_symbol} {Path(v.chapter_path).name:.<40} "
-                  f"{v.percentage:.1f}% ({v.grade})")
-
-        avg_score = sum(v.percentage for v in validations) / len(validations)
-        print(f"\nAverage Score: {avg_score:.1f}%")
+        # JSON Lines records are stored as they complete; the summary keeps
+        # argument order, as every other format does
+        order = list(range(len(validations)))
+        if args.format == 'jsonl':
+            position = {str(f): i for i, f in enumerate(existing)}
+            order.sort(key=lambda i: position[validations.chapter_path(i)])
+        print(f"\n{'='*70}", file=report)
+        if chapters is None:
+            print(f"Summary ({len(validations)} chapters)", file=report)
+        else:
+            groups = chapter_scores(validations, chapters, order)
+            numbered = sum(1 for chapter, _, _ in groups if chapter is not None)
+            print(f"Summary ({len(validations)} pages in {numbered} "
+                  f"chapter{'s' if numbered != 1 else ''})", file=report)
+        print(f"{'='*70}", file=report)
+        if chapters is None:
+            for i in order:
+                status_symbol = '✓' if 'PASS' in validations.status(i) else '✗'
+                print(f"{status_symbol} {Path(validations.chapter_path(i)).name:.<40} "
+                      f"{validations.percentages[i]:.1f}% ({validations.grade(i)})", file=report)
+        else:
+            # Pages under their chapter, in book order, with the chapter's aggregate
+            for chapter, indices, percentage in groups:
+                title = f"Chapter {chapter}" if chapter is not None else "Other pages"
+                print(f"\n{title + ' ':.<42} {percentage:.1f}% "
+                      f"({len(indices)} page{'s' if len(indices) != 1 else ''})", file=report)
+                for i in indices:
+                    status_symbol = '✓' if 'PASS' in validations.status(i) else '✗'
+                    name = Path(os.path.relpath(validations.chapter_path(i),
+                                                corpus_root)).as_posix()
+                    print(f"  {status_symbol} {name:.<38} "
+                          f"{validations.percentages[i]:.1f}% ({validations.grade(i)})",
+                          file=report)
+
+        avg_score = sum(validations.percentages[i] for i in order) / len(validations)
+        print(f"\nAverage Score: {avg_score:.1f}%", file=report)
+
+    if args.profile and args.format == 'console':
+        print(format_profile(validations))
+
+    if cache is not None:
+        cache.prune()
 
     # Output to file
     if args.output:
         if args.format == 'json':
-            output_data = [v.to_dict() for v in validations]
-            args.output.write_text(json.dumps(output_data, indent=2))
+            with open(args.output, 'w') as stream:
+                write_json_array(stream, validations)
             print(f"\nJSON report written to: {args.output}")
 
         elif args.format == 'html':
-            # Combine multiple chapters into one report
-            html_parts = []
-            for v in validations:
-                html_parts.append(format_html_output(v))
-
-            args.output.write_text('\n<hr>\n'.join(html_parts))
             print(f"\nHTML report written to: {args.output}")
 
+        elif streaming:
+            print(f"\nJSON Lines report written to: {args.output}")
+
     # Exit code based on results
-    if validations:
-        min_percentage = min(v.percentage for v in validations)
-        sys.exit(0 if min_percentage >= 70 else 1)
+    if validated:
+        sys.exit(0 if min_percentage >= validator.PASS_PERCENTAGE else 1)
     else:
         sys.exit(1)
 
@@ -0,0 +1,86 @@
+"""
+MkDocs hooks that validate chapters during `mkdocs build`
+
+Each page is validated from the markdown MkDocs has already loaded, and
+results are reused from the chapter_validator result cache while a
+page's content is unchanged. At the end of the build a summary is
+logged, an aggregated report is written if configured, and the build
+fails if a page is graded below min_grade.
+
+Enabled in mkdocs.yml with
+
+    hooks:
+      - hooks/chapter_validation.py
+
+and configured under extra (every key is optional):
+
+    extra:
+      chapter_validation:
+        min_grade: D                      # fail the build below this grade
+        report: validation-report.html    # beside mkdocs.yml; .json and .jsonl too
+        links: false                      # resolve links against docs_dir (reads it)
+        cache: true                       # reuse results between builds
+        only: [g-vectors, mode-matrix]    # or skip: [...], as on the command line
+"""
+
+import sys
+import logging
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from mkdocs.exceptions import PluginError  # noqa: E402
+
+from chapter_validator import (BuildValidation, ChapterValidator, LinkIndex,  # noqa: E402
+                               ResultCache, default_cache_dir)
+
+log = logging.getLogger('mkdocs.hooks.chapter_validation')
+
+# Kept across the rebuilds of `mkdocs serve` while the options stay the same
+_build = None
+_options = None
+
+
+def on_config(config):
+    global _build, _options
+    options = dict(config['extra'].get('chapter_validation') or {})
+    if _build is None or options != _options:
+        cache_dir = default_cache_dir()
+        cache = ResultCache(cache_dir) if options.get('cache', True) else None
+        link_index = None
+        if options.get('links'):
+            docs_dir = Path(config['docs_dir'])
+            store = LinkIndex.store_for(docs_dir, cache_dir) if cache is not None else None
+            link_index = LinkIndex(docs_dir, store_path=store)
+        report = options.get('report')
+        if report:
+            report = Path(config.config_file_path).parent / report
+        try:
+            validator = ChapterValidator(cache=cache, link_index=link_index,
+                                         only=options.get('only'), skip=options.get('skip'))
+            _build = BuildValidation(validator, options.get('min_grade'), report)
+        except ValueError as e:
+            raise PluginError(f'chapter_validation: {e}')
+        _options = options
+    elif _build.validator.link_index is not None:
+        _build.validator.link_index.update()
+    _build.start()
+    return config
+
+
+def on_page_markdown(markdown, page, config, files):
+    _build.page_markdown(markdown, page)
+    return markdown
+
+
+def on_post_build(config):
+    failures = _build.finish()
+    log.info(_build.summary())
+    if _build.report is not None:
+        log.info(f'Chapter validation report written to {_build.report}')
+    if _build.validator.cache is not None:
+        _build.validator.cache.prune()
+    if failures:
+        for failure in failures:
+            log.error(f'Below grade {_build.min_grade}: {failure}')
+        raise PluginError(f'{len(failures)} pages are graded below {_build.min_grade}')
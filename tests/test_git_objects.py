@@ -0,0 +1,67 @@
+"""
+GitObjects keeps its cat-file pipe in step when objects are missing, and
+finds the markdown at or below the paths given to --history
+
+Run with: python -m unittest discover tests
+"""
+
+import sys
+import shutil
+import unittest
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from chapter_validator import GitObjects  # noqa: E402
+
+
+@unittest.skipUnless(shutil.which('git') and (ROOT / '.git').exists(), 'needs a git checkout')
+class ReadManyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.head = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, check=True,
+                                   capture_output=True, text=True).stdout.strip()
+        self.missing = '0' * len(self.head)
+        self.objects = GitObjects(ROOT)
+        self.addCleanup(self.objects.close)
+
+    def test_missing_object_is_marked(self):
+        replies = list(self.objects.read_many([self.missing, self.head]))
+        self.assertEqual(replies[0], (self.missing, None, None))
+        self.assertEqual(replies[1][:2], (self.head, 'commit'))
+
+    def test_pipe_stays_in_step(self):
+        with self.assertRaises(KeyError):
+            self.objects.read(self.missing)
+        # Stopping after the first reply must not leave the rest in the pipe
+        next(self.objects.read_many([self.head, self.missing, self.head]))
+        kind, data = self.objects.read(self.head)
+        self.assertEqual(kind, 'commit')
+        self.assertTrue(data.startswith(b'tree '))
+
+
+@unittest.skipUnless(shutil.which('git') and (ROOT / '.git').exists(), 'needs a git checkout')
+class CommitFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.objects = GitObjects(ROOT)
+        self.addCleanup(self.objects.close)
+
+    def test_directories_and_files(self):
+        directory = dict(self.objects.commit_files('HEAD', ['site/docs/chapter-01']))
+        self.assertIn('site/docs/chapter-01/index.md', directory)
+        files = self.objects.commit_files('HEAD', ['site/docs/chapter-01/index.md',
+                                                   'site/docs/about.md'])
+        self.assertEqual(files, [('site/docs/chapter-01/index.md',
+                                  directory['site/docs/chapter-01/index.md']),
+                                 ('site/docs/about.md', files[1][1])])
+
+    def test_missing_paths_and_other_files_are_skipped(self):
+        self.assertEqual(self.objects.commit_files('HEAD', ['site/nothing.md', 'site/mkdocs.yml',
+                                                            'nothing/index.md']), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
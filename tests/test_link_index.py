@@ -0,0 +1,67 @@
+"""
+LinkIndex anchors and reference resolution against the text being validated
+
+Run with: python -m unittest discover tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chapter_validator import ChapterValidator, LinkIndex  # noqa: E402
+
+PAGE = '# Page\n\n```python\n# not a heading\n```\n\n## Setup\n\nSee [x](#setup).\n'
+
+
+def suggestions(validation):
+    result = next(r for r in validation.results if r.check_name == 'Reference Resolution')
+    return result.suggestions
+
+
+class ExtractTest(unittest.TestCase):
+
+    def test_hash_lines_in_fenced_code_are_not_anchors(self):
+        page = LinkIndex.extract('page.md', PAGE)
+        anchors = {heading[2] for heading in page.headings}
+        self.assertIn('setup', anchors)
+        self.assertNotIn('not-a-heading', anchors)
+
+
+class ResolutionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        root = Path(self.directory.name)
+        docs = root / 'docs'
+        docs.mkdir()
+        (root / 'mkdocs.yml').write_text('nav:\n  - page.md\n  - other.md\n')
+        (docs / 'page.md').write_text(PAGE)
+        (docs / 'other.md').write_text('# Other\n\nBack to [page](page.md#setup).\n')
+        self.page = str(docs / 'page.md')
+        self.validator = ChapterValidator(link_index=LinkIndex(docs))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_indexed_page_resolves(self):
+        validation = self.validator.validate_text(PAGE, chapter_path=self.page)
+        self.assertEqual(suggestions(validation), [])
+
+    def test_links_come_from_the_validated_text(self):
+        edited = PAGE + '\nAlso [y](missing.md) and [z](#gone).\n'
+        messages = suggestions(self.validator.validate_text(edited, chapter_path=self.page))
+        self.assertEqual(len(messages), 2)
+        self.assertIn("'missing.md'", messages[0])
+        self.assertIn("'#gone'", messages[1])
+
+    def test_own_anchors_come_from_the_validated_text(self):
+        edited = PAGE.replace('## Setup', '## Install').replace('#setup', '#install')
+        validation = self.validator.validate_text(edited, chapter_path=self.page)
+        self.assertEqual(suggestions(validation), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
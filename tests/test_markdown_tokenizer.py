@@ -0,0 +1,83 @@
+"""
+MarkdownTokenizer classifies indented code and tables without a leading |
+
+Run with: python -m unittest discover tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chapter_validator import ChapterValidator, MarkdownTokenizer, tokenize_markdown  # noqa: E402
+
+
+def kinds(text):
+    """(kind, text) of each region, checked to agree between str and bytes"""
+    regions = tokenize_markdown(text).regions
+    assert regions == tokenize_markdown(text.encode('utf-8')).regions
+    return [(kind, text[start:end]) for kind, start, end in regions]
+
+
+class IndentedCodeTest(unittest.TestCase):
+
+    def test_after_blank_line(self):
+        self.assertEqual(kinds('Para\n\n    x || y\n\n    z\n\nAfter\n'), [
+            ('prose', 'Para\n\n'), ('code', '    x || y\n\n    z\n'), ('prose', '\nAfter\n')])
+
+    def test_at_start(self):
+        self.assertEqual(kinds('    x || y\n'), [('code', '    x || y\n')])
+
+    def test_paragraph_continuation_is_prose(self):
+        self.assertEqual(kinds('Para\n    x || y\n'), [('prose', 'Para\n    x || y\n')])
+
+    def test_list_content_is_prose(self):
+        for text in ('- item\n\n    x || y\n', '1. item\nlazy\n\n    x || y\n',
+                     '- item\n\n    one\n\n    x || y\n'):
+            self.assertEqual([kind for kind, _ in kinds(text)], ['prose'], text)
+
+    def test_after_list_ends(self):
+        self.assertEqual(kinds('- item\n\nPara\n\n    x || y\n')[-1], ('code', '    x || y\n'))
+
+    def test_admonition_body_is_admonition(self):
+        self.assertEqual([kind for kind, _ in kinds('!!! note\n    a\n\n    x || y\n')],
+                         ['admonition'])
+
+    def test_carries_over_pieces(self):
+        tokenizer = MarkdownTokenizer()
+        tokenizer.feed('Para\n\n    x\n')
+        self.assertEqual(tokenizer.feed('    y || z\nout\n').regions[0], ('code', 0, 11))
+
+
+class TableTest(unittest.TestCase):
+
+    def test_delimiter_row_without_pipes_at_the_edges(self):
+        self.assertEqual(kinds('a | b\n--- | :---:\nc | `d`\n\nprose\n'), [
+            ('table', 'a | b\n--- | :---:\nc | `d`\n'), ('prose', '\nprose\n')])
+
+    def test_leading_pipe_head(self):
+        self.assertEqual(kinds('| a | b |\n---|---\nc | d\n'),
+                         [('table', '| a | b |\n---|---\nc | d\n')])
+
+    def test_rule_and_list_are_not_tables(self):
+        self.assertEqual([kind for kind, _ in kinds('text\n---\n- a\n- b\n')], ['prose'])
+
+    def test_delimiter_needs_a_head_row(self):
+        self.assertEqual([kind for kind, _ in kinds('\n--- | ---\n')], ['prose'])
+
+
+class RegionRestrictedCheckTest(unittest.TestCase):
+
+    def test_operators_in_indented_code_do_not_count(self):
+        validator = ChapterValidator(only=['composition-operators'])
+        sample = 'Order || Uniqueness ↑ Freshness ⤓ Bounded ▷ Convergence\n'
+        fenced = validator.validate_text(f'# Chapter\n\n```\n{sample}```\n')
+        indented = validator.validate_text(f'# Chapter\n\n    {sample}')
+        prose = validator.validate_text(f'# Chapter\n\n{sample}')
+        self.assertEqual(indented.total_score, fenced.total_score)
+        self.assertLess(indented.total_score, prose.total_score)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+The MkDocs hooks in site/hooks/chapter_validation.py, driven with stub
+pages and config the way `mkdocs build` calls them
+
+mkdocs itself is not needed: when it is not installed, a stand-in for
+mkdocs.exceptions is registered before the hooks are loaded.
+
+Run with: python -m unittest discover tests
+"""
+
+import sys
+import types
+import tempfile
+import unittest
+import importlib.util
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HOOKS = ROOT / 'site' / 'hooks' / 'chapter_validation.py'
+CHAPTER = ROOT / 'site' / 'docs' / 'chapter-01' / 'index.md'
+
+try:
+    from mkdocs.exceptions import PluginError
+except ImportError:
+    class PluginError(Exception):
+        pass
+    mkdocs = types.ModuleType('mkdocs')
+    mkdocs.exceptions = types.ModuleType('mkdocs.exceptions')
+    mkdocs.exceptions.PluginError = PluginError
+    sys.modules.setdefault('mkdocs', mkdocs)
+    sys.modules.setdefault('mkdocs.exceptions', mkdocs.exceptions)
+
+
+def load_hooks():
+    """A fresh copy of the hooks module, so no build state carries over"""
+    spec = importlib.util.spec_from_file_location('chapter_validation_hooks', HOOKS)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class Config(dict):
+    """Stands in for mkdocs.config.defaults.MkDocsConfig"""
+
+    def __init__(self, root: Path, options: dict):
+        super().__init__(extra={'chapter_validation': options}, docs_dir=str(root / 'docs'))
+        self.config_file_path = str(root / 'mkdocs.yml')
+
+
+def page(src_path: str):
+    """Stands in for mkdocs.structure.pages.Page"""
+    return types.SimpleNamespace(file=types.SimpleNamespace(src_path=src_path))
+
+
+class HooksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        self.hooks = load_hooks()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def build(self, options, pages):
+        config = Config(self.root, dict(options, cache=False))
+        self.hooks.on_config(config)
+        for src_path, markdown in pages:
+            self.assertEqual(self.hooks.on_page_markdown(markdown, page(src_path), config, None),
+                             markdown)
+        self.hooks.on_post_build(config)
+        return self.hooks._build.validations
+
+    def test_collects_page_results_and_report(self):
+        chapter = CHAPTER.read_text(encoding='utf-8')
+        validations = self.build({'report': 'report.jsonl'},
+                                 [('chapter-01/index.md', chapter), ('about.md', '# About\n')])
+        self.assertEqual([validations.chapter_path(i) for i in range(len(validations))],
+                         ['chapter-01/index.md', 'about.md'])
+        self.assertEqual(len((self.root / 'report.jsonl').read_text().splitlines()), 2)
+
+    def test_page_below_min_grade_fails_the_build(self):
+        chapter = CHAPTER.read_text(encoding='utf-8')
+        self.build({'min_grade': 'D'}, [('chapter-01/index.md', chapter)])
+        with self.assertRaises(PluginError), \
+                self.assertLogs('mkdocs.hooks.chapter_validation', 'ERROR') as logs:
+            self.build({'min_grade': 'D'},
+                       [('chapter-01/index.md', chapter), ('about.md', '# About\n')])
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn('about.md', logs.output[0])
+
+    def test_bad_option_is_a_plugin_error(self):
+        with self.assertRaises(PluginError):
+            self.hooks.on_config(Config(self.root, {'min_grade': 'E', 'cache': False}))
+
+
+if __name__ == '__main__':
+    unittest.main()
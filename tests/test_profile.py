@@ -0,0 +1,31 @@
+"""
+format_profile summarises per-check timings
+
+Run with: python -m unittest discover tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chapter_validator import ChapterValidator, format_profile  # noqa: E402
+
+
+class FormatProfileTest(unittest.TestCase):
+
+    def test_names_the_slowest_check(self):
+        validation = ChapterValidator(profile=True).validate_text('# A\n')
+        self.assertIn('(slowest check: ', format_profile([validation]))
+
+    def test_every_check_skipped(self):
+        skip = [spec.key for spec in ChapterValidator.CHECKS]
+        validation = ChapterValidator(profile=True, skip=skip).validate_text('# A\n')
+        report = format_profile([validation])
+        self.assertIn('<text>', report)
+        self.assertNotIn('slowest check', report)
+
+
+if __name__ == '__main__':
+    unittest.main()
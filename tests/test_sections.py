@@ -0,0 +1,42 @@
+"""
+parse_sections builds the heading tree from MarkdownTokenizer regions
+
+Run with: python -m unittest discover tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chapter_validator import parse_sections, tokenize_markdown  # noqa: E402
+
+
+def outline(content, **kwargs):
+    return [(s.level, s.title, s.line) for s in parse_sections(content, **kwargs)[1:]]
+
+
+class ParseSectionsTest(unittest.TestCase):
+
+    def test_heading_after_fence_with_info_string(self):
+        content = '# Top\n\n```python\n# comment\n```\n\n## Real heading\n'
+        self.assertEqual(outline(content), [(1, 'Top', 1), (2, 'Real heading', 7)])
+
+    def test_hash_lines_in_code_are_not_headings(self):
+        content = '# Top\n\n~~~yaml\n# a\n~~~\n\n    # b\n\n## End\n'
+        self.assertEqual(outline(content), [(1, 'Top', 1), (2, 'End', 9)])
+
+    def test_heading_with_inline_code_and_closing_hashes(self):
+        self.assertEqual(outline('# A `x` b ##\ntext\n#not\n## B\n'),
+                         [(1, 'A `x` b', 1), (2, 'B', 4)])
+
+    def test_tree_and_offsets(self):
+        content = 'intro\n# A\n## B\n# C\n'
+        sections = parse_sections(content, regions=tokenize_markdown(content))
+        self.assertEqual([(s.start, s.end, s.parent) for s in sections],
+                         [(0, 6, None), (6, 10, 0), (10, 15, 1), (15, 19, 0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+watch_chapters stats known files every poll and expands targets again
+only every rescan seconds
+
+Run with: python -m unittest discover tests
+"""
+
+import io
+import sys
+import tempfile
+import unittest
+import contextlib
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import chapter_validator  # noqa: E402
+from chapter_validator import ChapterValidator, watch_chapters  # noqa: E402
+
+
+class WatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        (self.root / 'a.md').write_text('# A\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def watch(self, rescan):
+        """Validated paths over two polls, editing a.md and adding b.md in between"""
+        polls = iter([lambda: ((self.root / 'a.md').write_text('# A\n\nmore\n'),
+                               (self.root / 'b.md').write_text('# B\n'))])
+
+        def sleep(_):
+            for edit in polls:
+                return edit()
+            raise KeyboardInterrupt
+
+        output = io.StringIO()
+        expand = mock.Mock(wraps=chapter_validator.expand_watch_targets)
+        with mock.patch.object(chapter_validator.time, 'sleep', sleep), \
+                mock.patch.object(chapter_validator, 'expand_watch_targets', expand), \
+                contextlib.redirect_stdout(output), self.assertRaises(KeyboardInterrupt):
+            watch_chapters(ChapterValidator(), [self.root], rescan=rescan)
+        # One status line per validation, each followed by indented check changes
+        validated = [line.split()[2] for line in output.getvalue().splitlines()[1:]
+                     if not line.startswith(' ')]
+        return [Path(path).name for path in validated], expand.call_count
+
+    def test_known_files_are_polled_without_expanding_again(self):
+        self.assertEqual(self.watch(rescan=float('inf')), (['a.md', 'a.md'], 1))
+
+    def test_new_files_are_found_on_rescan(self):
+        self.assertEqual(self.watch(rescan=0), (['a.md', 'a.md', 'b.md'], 3))
+
+
+if __name__ == '__main__':
+    unittest.main()